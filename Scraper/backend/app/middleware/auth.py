@@ -5,12 +5,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from ..utils.security import decode_access_token
-from ..models.database import db
+from ..repositories import users as users_repo
 
 security = HTTPBearer()
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user"""
     token = credentials.credentials
     
@@ -30,7 +30,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.get_user_by_id(int(user_id))
+    user = await users_repo.get_by_id(int(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,7 +43,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 def require_role(required_role: str):
     """Decorator to require specific role"""
-    def role_checker(current_user: dict = Depends(get_current_user)):
+    async def role_checker(current_user: dict = Depends(get_current_user)):
         if current_user['role'] != required_role and current_user['role'] != 'ADMIN':
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -55,7 +55,7 @@ def require_role(required_role: str):
 
 def require_roles(allowed_roles: list):
     """Decorator to require one of multiple roles"""
-    def role_checker(current_user: dict = Depends(get_current_user)):
+    async def role_checker(current_user: dict = Depends(get_current_user)):
         if current_user['role'] not in allowed_roles and current_user['role'] != 'ADMIN':
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -3,16 +3,42 @@ Extended database module for the backend API
 Extends the existing SQLite database with new tables for the API
 """
 import sqlite3
-from datetime import datetime
+from functools import lru_cache
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import json
 import sys
 from typing import Optional, List, Dict, Any
 from ..config import settings
+from ..services.subscription_index import SubscriptionIndex
+from ..services.resolution_index import CompanyResolutionIndex
+from ..services.entity_resolution import EntityResolutionService
+from ..services.gazetteer import EntityGazetteer
+from ..services.resolution_cache import ResolutionCache
+from ..services.product_rules import CompiledProductRules, ProductRuleEngine
+from ..services.scoring_engine import ScoringEngine
+from ..services.lead_lifecycle import LeadLifecycle
+from ..services.lead_search import LeadSearch
+from ..services.location_extractor import location_extractor
+from ..services.territory_router import TerritoryRouter
+from .migrations import migrate
 
 # Import the base database class to initialize base schema
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 from utils.database import Database as BaseDatabase
+from utils.tender_parser import TenderParser
+
+
+@lru_cache(maxsize=8)
+def _parse_now(now_iso: str) -> datetime:
+    return datetime.fromisoformat(now_iso)
+
+
+def _lead_score(static_score, scraped_at, now_iso):
+    """SQL lead_score(static_score, scraped_at, now): live score of a stored lead"""
+    if static_score is None or scraped_at is None:
+        return None
+    return ScoringEngine.live_score(static_score, scraped_at, _parse_now(now_iso))
 
 
 class DatabaseExtended(BaseDatabase):
@@ -21,209 +47,16 @@ class DatabaseExtended(BaseDatabase):
     def __init__(self, db_path: str = None):
         # Use provided path or settings default
         path = db_path or settings.DATABASE_PATH
-        # Initialize parent (BaseDatabase)
+        # Initialize parent (BaseDatabase), which brings the schema up to date
         super().__init__(path)
-        
-        self.db_path = path
-        # Add extended schema
-        self.init_extended_schema()
     
-
+    def configure_connection(self, conn):
+        """Register the lead_score SQL function on each new connection"""
+        conn.create_function('lead_score', 3, _lead_score, deterministic=True)
     
-    def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
-    
-    def init_extended_schema(self):
-        """Initialize extended schema for API features"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        
-        # Users table
-        c.execute('''CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            name TEXT NOT NULL,
-            role TEXT NOT NULL,
-            territory TEXT,
-            territory_id INTEGER,
-            alert_preferences TEXT,
-            email_enabled BOOLEAN DEFAULT 1,
-            push_enabled BOOLEAN DEFAULT 0,
-            min_confidence REAL DEFAULT 0.7,
-            products TEXT,
-            territories TEXT,
-            active BOOLEAN DEFAULT 1,
-            last_login TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (territory_id) REFERENCES territories (id)
-        )''')
-        
-        # Lead actions table
-        c.execute('''CREATE TABLE IF NOT EXISTS lead_actions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            action_type TEXT NOT NULL,
-            notes TEXT,
-            next_follow_up TEXT,
-            estimated_deal_value REAL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )''')
-        
-        # Lead notes table
-        c.execute('''CREATE TABLE IF NOT EXISTS lead_notes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            note TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )''')
-        
-        # Lead documents table
-        c.execute('''CREATE TABLE IF NOT EXISTS lead_documents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            filename TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            file_size INTEGER,
-            uploaded_at TEXT NOT NULL,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )''')
-        
-        # Products table
-        c.execute('''CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            code TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            base_confidence_rules TEXT,
-            primary_keywords TEXT,
-            secondary_keywords TEXT,
-            negative_keywords TEXT,
-            scoring_factors TEXT,
-            disqualifiers TEXT,
-            updated_at TEXT NOT NULL,
-            updated_by INTEGER,
-            FOREIGN KEY (updated_by) REFERENCES users (id)
-        )''')
-        
-        # Territories table
-        c.execute('''CREATE TABLE IF NOT EXISTS territories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            region TEXT NOT NULL,
-            depot TEXT,
-            coverage_areas TEXT,
-            depot_lat REAL,
-            depot_lng REAL,
-            assigned_officers TEXT,
-            active BOOLEAN DEFAULT 1,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        )''')
-        
-        # Feedback table
-        c.execute('''CREATE TABLE IF NOT EXISTS feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            feedback_type TEXT NOT NULL,
-            rating INTEGER NOT NULL,
-            comment TEXT,
-            reason TEXT,
-            correct_product TEXT,
-            correct_industry TEXT,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )''')
-        
-        # Audit log table
-        c.execute('''CREATE TABLE IF NOT EXISTS audit_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            action TEXT NOT NULL,
-            resource TEXT NOT NULL,
-            resource_id TEXT,
-            changes TEXT,
-            ip_address TEXT,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )''')
-        
-        # Extend leads table with new columns (add if not exists)
-        try:
-            c.execute('ALTER TABLE leads ADD COLUMN status TEXT DEFAULT "REVIEW_REQUIRED"')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        try:
-            c.execute('ALTER TABLE leads ADD COLUMN assigned_to TEXT')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE leads ADD COLUMN territory TEXT')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE leads ADD COLUMN scoring TEXT')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE leads ADD COLUMN estimated_value REAL')
-        except sqlite3.OperationalError:
-            pass
-        
-        # Extend companies table
-        try:
-            c.execute('ALTER TABLE companies ADD COLUMN lat REAL')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE companies ADD COLUMN lng REAL')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE companies ADD COLUMN existing_customer BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE companies ADD COLUMN hpcl_customer_id TEXT')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            c.execute('ALTER TABLE companies ADD COLUMN history TEXT')
-        except sqlite3.OperationalError:
-            pass
-        
-        # Create indexes
-        c.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_lead_actions_lead_id ON lead_actions(lead_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_lead_notes_lead_id ON lead_notes(lead_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_products_code ON products(code)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_territories_name ON territories(name)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_feedback_lead_id ON feedback(lead_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_leads_status ON leads(status)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_leads_assigned_to ON leads(assigned_to)')
-        
-        conn.commit()
-        conn.close()
+    def init_db(self):
+        """Apply pending schema migrations (one PRAGMA read when current)"""
+        migrate(self)
     
     # User operations
     def create_user(self, email: str, password_hash: str, name: str, role: str, territory: str = None) -> int:
@@ -238,6 +71,7 @@ class DatabaseExtended(BaseDatabase):
                   (email, password_hash, name, role, territory, now, now))
         
         user_id = c.lastrowid
+        self.bump_cache_version('alert_subscriptions', conn)
         conn.commit()
         conn.close()
         return user_id
@@ -282,58 +116,504 @@ class DatabaseExtended(BaseDatabase):
         conn.close()
 
     def get_notification_users(self, lead_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Get users who should be notified for a specific lead"""
+        """
+        Get users who should be notified for a specific lead.
+
+        lead_data: {'products': [...], 'territory': str or None, 'confidence': float}
+        Matching runs against the in-memory SubscriptionIndex, which is rebuilt
+        only when alert preferences change (see bump_cache_version).
+        """
+        index = self.get_subscription_index()
+        return index.match(
+            products=lead_data.get('products'),
+            territory=lead_data.get('territory'),
+            confidence=lead_data.get('confidence', 1.0)
+        )
+
+    def get_subscription_index(self):
+        """Return the alert subscription index, rebuilding it if preferences changed"""
+        version = self.get_cache_version('alert_subscriptions')
+        cached = getattr(self, '_subscriptions', None)
+        if cached and cached[0] == version:
+            return cached[1]
+
         conn = self.get_connection()
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
-        
-        # Logic: Get users with push_enabled=1
-        # In a real app, filtering by territory/industry would happen here
-        c.execute("""
-            SELECT name, email, alert_preferences
-            FROM users 
+        c.execute('''
+            SELECT id, name, email, alert_preferences, email_enabled, push_enabled,
+                   min_confidence, products, territories
+            FROM users
             WHERE active = 1
-        """)
-        
-        users = []
-        rows = c.fetchall()
-        
-        # For hackathon/demo, we might check .env for a fallback admin phone
-        # because the 'users' table might not have phone numbers (schema check needed)
+        ''')
+        rows = [dict(row) for row in c.fetchall()]
+        conn.close()
+
+        index = SubscriptionIndex(rows)
+        self._subscriptions = (version, index)
+        return index
+
+    def get_territory_router(self) -> TerritoryRouter:
+        """Return the territory routing index, rebuilding it if territories changed"""
+        version = self.get_cache_version('territories')
+        cached = getattr(self, '_territory_router', None)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        rows = [dict(row) for row in conn.execute('''
+            SELECT id, name, coverage_areas, depot_lat, depot_lng
+            FROM territories
+            WHERE active = 1
+            ORDER BY id
+        ''').fetchall()]
+        conn.close()
+
+        router = TerritoryRouter(rows)
+        self._territory_router = (version, router)
+        return router
+
+    def route_location(self, location: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Territory route for a located lead (LocationExtractor.extract result), or None"""
+        if not location or location.get('lat') is None:
+            return None
+        return self.get_territory_router().route(location['lat'], location['lng'], location['location'])
+
+    # Entity resolution index
+    def get_company_index(self) -> CompanyResolutionIndex:
+        """
+        Resident company-name index. The first call loads every company; later
+        calls only index rows inserted since (by this or any other process).
+        The index is rebuilt when companies are merged or deleted.
+        """
+        version = self.get_cache_version('companies')
+        cached = getattr(self, '_company_index', None)
+        if cached is None or cached[0] != version:
+            cached = self._company_index = (version, CompanyResolutionIndex())
+        index = cached[1]
+        index.refresh(self)
+        return index
+
+    def get_resolution_cache(self) -> ResolutionCache:
+        """Raw name -> company_id cache consulted before entity resolution"""
+        cache = getattr(self, '_resolution_cache', None)
+        if cache is None:
+            cache = self._resolution_cache = ResolutionCache(self)
+        return cache
+
+    # Product rules
+    def get_product_rules(self, force: bool = False) -> CompiledProductRules:
+        """
+        Current compiled product rules (also made the process default).
+        Picks up edits from any process within a few seconds; pass
+        force=True to check the version right away.
+        """
+        engine = getattr(self, '_product_rule_engine', None)
+        if engine is None:
+            engine = self._product_rule_engine = ProductRuleEngine(self)
+        return engine.current(force)
+
+    def insert_company(self, name, industry=None, location=None, website=None, normalized_name=None):
+        """Insert or get company, keyed by the entity-resolution normalized name (geocoding its location)"""
+        normalized_name = normalized_name or EntityResolutionService.normalize_name(name) or None
+        company_id = super().insert_company(name, industry, location, website, normalized_name=normalized_name)
+        place = location_extractor().geocode(location) if location else None
+        if place:
+            conn = self.get_connection()
+            conn.execute('UPDATE companies SET lat = ?, lng = ? WHERE id = ? AND lat IS NULL',
+                         (place['lat'], place['lng'], company_id))
+            conn.commit()
+            conn.close()
+        return company_id
+
+    # Company aliases
+    def add_company_alias(self, company_id: int, alias: str, alias_type: str = 'ALIAS',
+                          case_sensitive: bool = None) -> bool:
+        """
+        Map an acronym or alternate spelling to a company.
+        Returns False if the alias is already taken.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('''INSERT OR IGNORE INTO company_aliases
+                     (company_id, alias, alias_key, alias_type, case_sensitive, created_at)
+                     VALUES (?, ?, ?, ?, ?, ?)''',
+                  (company_id, alias.strip(), EntityGazetteer.alias_key(alias), alias_type,
+                   case_sensitive, datetime.now().isoformat()))
+        added = c.rowcount > 0
+        if added:
+            # Names cached before the alias existed may have resolved elsewhere
+            c.execute('DELETE FROM company_resolution_cache')
+            self.bump_cache_version('company_aliases', conn)
+        conn.commit()
+        conn.close()
+        return added
+
+    def get_gazetteer(self) -> EntityGazetteer:
+        """Alias automaton, rebuilt when aliases change or companies are merged"""
+        version = (self.get_cache_version('company_aliases'), self.get_cache_version('companies'))
+        cached = getattr(self, '_gazetteer', None)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+        c.execute('''
+            SELECT a.alias, a.company_id, a.case_sensitive, c.name AS canonical_name
+            FROM company_aliases a
+            JOIN companies c ON c.id = a.company_id
+        ''')
+        rows = [dict(row) for row in c.fetchall()]
+        conn.close()
+
+        gazetteer = EntityGazetteer(rows)
+        self._gazetteer = (version, gazetteer)
+        return gazetteer
+
+    # Cache invalidation
+    def get_cache_version(self, name: str) -> int:
+        """Current version of a cross-process cache (0 if never bumped)"""
+        conn = self.get_connection()
+        row = conn.execute('SELECT version FROM cache_versions WHERE name = ?', (name,)).fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def bump_cache_version(self, name: str, conn: sqlite3.Connection = None):
+        """
+        Invalidate a cache in every process using this database.
+        Pass `conn` to bump inside the caller's transaction.
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = self.get_connection()
+
+        conn.execute('''INSERT INTO cache_versions (name, version, updated_at) VALUES (?, 1, ?)
+                        ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at''',
+                     (name, datetime.now().isoformat()))
+
+        if own_conn:
+            conn.commit()
+            conn.close()
+
+    # Lead ingest
+    TENDER_COLUMNS = ('tender_reference', 'tender_organization', 'tender_value_inr',
+                      'tender_closing_at', 'tender_opening_at', 'tender_published_at')
+
+    @staticmethod
+    def tender_values(signal_type: str, signal_text: str, tender: Dict[str, Any] = None) -> tuple:
+        """
+        Values for TENDER_COLUMNS: from `tender` (TenderParser.normalize of the
+        listing cells) when the scraper has them, else parsed from the text.
+        Non-tender leads get NULLs.
+        """
+        if tender is None:
+            if (signal_type or '').lower() != 'tender':
+                return (None,) * len(TenderParser.FIELDS)
+            tender = TenderParser.parse(signal_text or '')
+        return tuple(tender.get(field) for field in TenderParser.FIELDS)
+
+    GEO_COLUMNS = ('geo_location', 'geo_state', 'geo_lat', 'geo_lng')
+
+    @staticmethod
+    def location_values(signal_text: str, location: Dict[str, Any] = None) -> tuple:
+        """
+        Values for GEO_COLUMNS: from `location` (LocationExtractor.extract)
+        when the caller already has it, else extracted from the text
+        """
+        if location is None:
+            location = location_extractor().extract(signal_text or '')
+        if not location:
+            return (None,) * 4
+        return (location['location'], location['state'], location['lat'], location['lng'])
+
+    def _route_values(self, geo: tuple, route: Dict[str, Any] = None) -> tuple:
+        """(territory, territory_distance_km) for a lead at `geo` (GEO_COLUMNS values)"""
+        if route is None and geo[2] is not None:
+            route = self.get_territory_router().route(geo[2], geo[3], geo[0])
+        if not route or not route.get('territory'):
+            return (None, None)
+        return (route['territory'], route['distance_km'])
+
+    @staticmethod
+    def _locate_company(c: sqlite3.Cursor, company_id: int, geo: tuple):
+        """A company with no location yet takes its first located lead's"""
+        if geo[0] is not None:
+            c.execute('''UPDATE companies SET location = ?, lat = ?, lng = ?
+                         WHERE id = ? AND location IS NULL AND lat IS NULL''',
+                      (geo[0], geo[2], geo[3], company_id))
+
+    @staticmethod
+    def _product_values(products: List[Any] = None) -> List[tuple]:
+        """(code, confidence) per product; products are codes or inferred products (with confidence)"""
+        values = []
+        for product in products or []:
+            if isinstance(product, dict):
+                values.append((product['code'].upper(), product.get('confidence')))
+            else:
+                values.append((product.upper(), None))
+        return values
+
+    @staticmethod
+    def _insert_products(c: sqlite3.Cursor, lead_id: int, values: List[tuple]):
+        c.executemany('INSERT OR IGNORE INTO lead_products (lead_id, product_code, confidence) VALUES (?, ?, ?)',
+                      [(lead_id, code, confidence) for code, confidence in values])
+
+    def insert_lead(self, company_id, signal_text, signal_type, source_name,
+                    source_url, products=None, confidence=0.0, tender: Dict[str, Any] = None,
+                    location: Dict[str, Any] = None, route: Dict[str, Any] = None):
+        """
+        Insert a new lead (tender leads with their parsed tender fields, all
+        with their location and the territory it routes to). `products` are
+        codes or inferred products; both fill lead_products.
+        """
+        product_values = self._product_values(products)
+        geo = self.location_values(signal_text, location)
+        routed = self._route_values(geo, route)
+        conn = self.get_connection()
+        c = conn.cursor()
         
+        c.execute(f'''INSERT INTO leads
+                      (company_id, signal_text, signal_type, source_name,
+                       source_url, products_mentioned, confidence, scraped_at,
+                       {', '.join(self.TENDER_COLUMNS)}, {', '.join(self.GEO_COLUMNS)},
+                       territory, territory_distance_km)
+                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                  (company_id, signal_text, signal_type, source_name, source_url,
+                   json.dumps([code for code, _ in product_values]) if product_values else None,
+                   confidence, datetime.now().isoformat(),
+                   *self.tender_values(signal_type, signal_text, tender), *geo, *routed))
+        
+        lead_id = c.lastrowid
+        self._insert_products(c, lead_id, product_values)
+        self._locate_company(c, company_id, geo)
+        conn.commit()
+        conn.close()
+        return lead_id
+
+    # Notification outbox operations
+    def insert_scored_lead(self, company_id: int, signal_text: str, signal_type: str,
+                           source_name: str, source_url: str, products: List[Any],
+                           score_data: Dict[str, Any], alert: Dict[str, Any] = None,
+                           recipients: List[Dict[str, Any]] = None, tender: Dict[str, Any] = None,
+                           location: Dict[str, Any] = None, route: Dict[str, Any] = None) -> int:
+        """
+        Insert a scored lead together with its outbox notifications.
+
+        The lead row, its scoring breakdown and one outbox row per recipient are
+        committed in a single transaction, so an alert is queued if and only if
+        the lead exists. Delivery happens later in the notification dispatcher.
+        Pass the `route` the lead was scored with (see route_location);
+        otherwise the lead is routed here. `products` are codes or inferred
+        products (whose confidence is kept in lead_products).
+        """
+        product_values = self._product_values(products)
+        geo = self.location_values(signal_text, location)
+        routed = self._route_values(geo, route)
+        conn = self.get_connection()
+        c = conn.cursor()
+        now = datetime.now().isoformat()
+
+        try:
+            c.execute(f'''INSERT INTO leads
+                          (company_id, signal_text, signal_type, source_name,
+                           source_url, products_mentioned, confidence, scraped_at, scoring, static_score,
+                           {', '.join(self.TENDER_COLUMNS)}, {', '.join(self.GEO_COLUMNS)},
+                           territory, territory_distance_km)
+                          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                      (company_id, signal_text, signal_type, source_name, source_url,
+                       json.dumps([code for code, _ in product_values]) if product_values else None,
+                       score_data['final_score'], now, json.dumps(score_data),
+                       score_data.get('static_score'), *self.tender_values(signal_type, signal_text, tender),
+                       *geo, *routed))
+            lead_id = c.lastrowid
+            self._insert_products(c, lead_id, product_values)
+            self._locate_company(c, company_id, geo)
+
+            for recipient in recipients or []:
+                channel = recipient['channel']
+                address = recipient['address']
+                payload = dict(alert or {}, lead_id=lead_id)
+                c.execute('''INSERT OR IGNORE INTO notification_outbox
+                             (lead_id, channel, recipient, payload, idempotency_key,
+                              status, next_attempt_at, created_at)
+                             VALUES (?, ?, ?, ?, ?, 'PENDING', ?, ?)''',
+                          (lead_id, channel, address, json.dumps(payload),
+                           f"lead:{lead_id}:{channel}:{address}", now, now))
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return lead_id
+
+    def peek_outbox_due(self, limit: int = 500, channels: List[str] = None,
+                        with_parked: bool = False) -> List[Dict[str, Any]]:
+        """
+        List due outbox rows without claiming them.
+
+        Rows in SENDING whose lease expired (e.g. the worker died mid-send)
+        count as due again. With `with_parked`, rows still parked for a digest
+        window (see defer_outbox_rows) are listed too for every recipient and
+        channel that has due rows, so new alerts join the digest already waiting.
+        """
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+
+        now = datetime.now().isoformat()
+        channel_sql = ''
+        params = [now]
+        if channels is not None:
+            channel_sql = f"AND channel IN ({', '.join('?' for _ in channels)})"
+            params.extend(channels)
+        params.append(limit)
+
+        c.execute(f'''SELECT * FROM notification_outbox
+                      WHERE status IN ('PENDING', 'SENDING') AND next_attempt_at <= ?
+                      {channel_sql}
+                      ORDER BY next_attempt_at, id
+                      LIMIT ?''', params)
+        rows = [dict(row) for row in c.fetchall()]
+
+        pairs = sorted({(row['channel'], row['recipient']) for row in rows})
+        if with_parked and pairs:
+            c.execute('''SELECT * FROM notification_outbox
+                         WHERE status = 'PENDING' AND next_attempt_at > ? AND attempts = 0
+                         AND (channel, recipient) IN (SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                                                  FROM json_each(?))
+                         ORDER BY id''', (now, json.dumps(pairs)))
+            rows.extend(dict(row) for row in c.fetchall())
+        conn.close()
+        return rows
+
+    def claim_outbox_rows(self, outbox_ids: List[int], lease_seconds: int = 120) -> List[Dict[str, Any]]:
+        """
+        Atomically claim the given outbox rows for delivery.
+
+        Only rows that are still due, or parked for a digest and never tried,
+        are claimed (another worker may have taken some); claimed rows move to
+        SENDING with a lease.
+        """
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+        now = datetime.now()
+        placeholders = ', '.join('?' for _ in outbox_ids)
+
+        try:
+            c.execute('BEGIN IMMEDIATE')
+            c.execute(f'''SELECT * FROM notification_outbox
+                          WHERE id IN ({placeholders})
+                          AND status IN ('PENDING', 'SENDING')
+                          AND (next_attempt_at <= ? OR (status = 'PENDING' AND attempts = 0))''',
+                      [*outbox_ids, now.isoformat()])
+            rows = [dict(row) for row in c.fetchall()]
+
+            lease_until = (now + timedelta(seconds=lease_seconds)).isoformat()
+            c.executemany('''UPDATE notification_outbox
+                             SET status = 'SENDING', attempts = attempts + 1, next_attempt_at = ?
+                             WHERE id = ?''',
+                          [(lease_until, row['id']) for row in rows])
+            conn.commit()
+        finally:
+            conn.close()
+
         for row in rows:
-            user = dict(row)
-            # Parse preferences to find phone number if stored there, or use a default
-            # The schema I viewed earlier didn't have a specific 'phone' column in 'users'
-            # checking schema... it has 'alert_preferences'
-            
-            # Temporary: Return a mock user or check if schema has phone
-            # Schema has: email, territory, alert_preferences. No direct phone column.
-            # I will assume phone is in alert_preferences JSON or I should add it.
-            # Or simpler: For the MVP, I'll just use the env var phone number for ALL users 
-            # if push_enabled is true (which I added to schema).
-            
-            # Let's rely on NotificationService's internal fallbacks or passed arguments.
-            # But wait, NotificationService takes `user_phone`.
-            # I should probably add `phone` to users table or just extract from preferences.
-            
-            try:
-                prefs = json.loads(user.get('alert_preferences', '{}'))
-                if prefs.get('whatsapp_enabled'):
-                    user['phone'] = prefs.get('phone')
-                    users.append(user)
-            except:
-                pass
-                
+            row['attempts'] += 1
+        return rows
+
+    def mark_outbox_sent(self, outbox_ids: List[int], batch_key: str = None):
+        """Mark outbox rows as delivered (rows sent as one digest share a batch_key)"""
+        conn = self.get_connection()
+        c = conn.cursor()
+
+        now = datetime.now().isoformat()
+        c.executemany('''UPDATE notification_outbox
+                         SET status = 'SENT', sent_at = ?, last_error = NULL, batch_key = ?
+                         WHERE id = ?''',
+                      [(now, batch_key, outbox_id) for outbox_id in outbox_ids])
+
+        conn.commit()
         conn.close()
-        
-        # Fallback: If no users found (likely in this new setup), return a dummy "Admin" 
-        # that targets the env var phone number implicitly handled by the caller? 
-        # No, passed explicitly.
-        
-        return users
-    
+
+    def defer_outbox_rows(self, outbox_ids: List[int], until: str):
+        """Push pending outbox rows' next attempt to `until` (digest rows waiting for their window)"""
+        conn = self.get_connection()
+        c = conn.cursor()
+
+        c.executemany('''UPDATE notification_outbox
+                         SET next_attempt_at = ?
+                         WHERE id = ? AND status = 'PENDING' AND next_attempt_at < ?''',
+                      [(until, outbox_id, until) for outbox_id in outbox_ids])
+
+        conn.commit()
+        conn.close()
+
+    def mark_outbox_failed(self, outbox_id: int, error: str, next_attempt_at: Optional[str]):
+        """Schedule a retry, or move the row to the dead-letter state when next_attempt_at is None"""
+        conn = self.get_connection()
+        c = conn.cursor()
+
+        if next_attempt_at is None:
+            c.execute('''UPDATE notification_outbox
+                         SET status = 'DEAD', last_error = ?
+                         WHERE id = ?''', (error, outbox_id))
+        else:
+            c.execute('''UPDATE notification_outbox
+                         SET status = 'PENDING', last_error = ?, next_attempt_at = ?
+                         WHERE id = ?''', (error, next_attempt_at, outbox_id))
+
+        conn.commit()
+        conn.close()
+
+    def get_outbox_metrics(self, window_hours: int = 24) -> Dict[str, Any]:
+        """Backlog depth and delivery latency of the notification outbox"""
+        conn = self.get_connection()
+        c = conn.cursor()
+
+        by_status = dict(c.execute('''
+            SELECT status, COUNT(*) FROM notification_outbox GROUP BY status
+        ''').fetchall())
+
+        oldest_pending = c.execute('''
+            SELECT MIN(created_at) FROM notification_outbox WHERE status IN ('PENDING', 'SENDING')
+        ''').fetchone()[0]
+
+        since = (datetime.now() - timedelta(hours=window_hours)).isoformat()
+        messages_sent, leads_notified = c.execute('''
+            SELECT COUNT(DISTINCT COALESCE(batch_key, 'row:' || id)), COUNT(*)
+            FROM notification_outbox
+            WHERE status = 'SENT' AND sent_at >= ?
+        ''', (since,)).fetchone()
+
+        latencies = [row[0] for row in c.execute('''
+            SELECT (julianday(sent_at) - julianday(created_at)) * 86400.0
+            FROM notification_outbox
+            WHERE status = 'SENT' AND sent_at >= ?
+            ORDER BY 1
+        ''', (since,)).fetchall()]
+
+        conn.close()
+
+        now = datetime.now()
+        return {
+            'backlog': by_status.get('PENDING', 0) + by_status.get('SENDING', 0),
+            'byStatus': by_status,
+            'oldestPendingAgeSeconds': (now - datetime.fromisoformat(oldest_pending)).total_seconds() if oldest_pending else 0.0,
+            'deliveredLastWindow': len(latencies),
+            'messagesSent': messages_sent,
+            'leadsNotified': leads_notified,
+            'avgLatencySeconds': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'p95LatencySeconds': round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+            'windowHours': window_hours
+        }
+
     # Lead operations
+    # Past this many leads, a product's date-ordered page walks the date index instead of sorting them
+    PRODUCT_SORT_MAX_LEADS = 1000
+
     def get_leads_paginated(self, page: int = 1, limit: int = 50, 
                            filter_status: str = None, 
                            search: str = None,
@@ -341,8 +621,19 @@ class DatabaseExtended(BaseDatabase):
                            product_code: str = None,
                            location: str = None,
                            sort_by: str = 'confidence',
-                           sort_order: str = 'desc') -> Dict[str, Any]:
-        """Get paginated leads with filters"""
+                           sort_order: str = 'desc',
+                           closing_from: str = None,
+                           closing_to: str = None,
+                           min_value_inr: float = None,
+                           max_value_inr: float = None,
+                           include_expired: bool = False) -> Dict[str, Any]:
+        """
+        Get paginated leads with filters.
+        Confidence filtering and sorting use the live score (live_score in each row).
+        Expired leads are left out unless `include_expired` or filtered for by status.
+        `search` is a full-text search (see LeadSearch); its matches can be sorted
+        by 'relevance' and carry a highlighted `snippet`.
+        """
         conn = self.get_connection()
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
@@ -350,27 +641,67 @@ class DatabaseExtended(BaseDatabase):
         # Build query
         where_clauses = []
         params = []
+        now = datetime.now().isoformat()
+        live_score_sql = 'lead_score(l.static_score, l.scraped_at, ?)'
         
         if filter_status and filter_status != 'ALL':
             where_clauses.append('l.status = ?')
             params.append(filter_status)
         
-        if search:
-            where_clauses.append('(c.name LIKE ? OR l.signal_text LIKE ?)')
-            search_term = f'%{search}%'
-            params.extend([search_term, search_term])
+        # The working set; this term also lets the partial hot-set indexes be used
+        if not include_expired and filter_status != LeadLifecycle.EXPIRED:
+            where_clauses.append("l.status != 'EXPIRED'")
+        
+        # Full-text search: counting starts from the leads_fts matches. Text with
+        # no words in it ("***") finds nothing rather than dropping the filter.
+        search = search.strip() if search else None
+        match = LeadSearch.match_query(search) if search else None
+        search_clause = None
+        if search and not match:
+            where_clauses.append('0')
+        elif match:
+            search_clause = len(where_clauses)
+            where_clauses.append('l.id IN (SELECT rowid FROM leads_fts WHERE leads_fts MATCH ?)')
+            params.append(match)
         
         if min_confidence is not None:
-            where_clauses.append('l.confidence >= ?')
-            params.append(min_confidence)
+            # Freshness adds at most its weight, so the indexed static part rules out most rows
+            where_clauses.append(f'l.static_score >= ? AND {live_score_sql} >= ?')
+            params.extend([min_confidence - ScoringEngine.WEIGHTS['freshness'] - 0.005, now, min_confidence])
         
+        product_clause = None
         if product_code:
-            where_clauses.append('l.products_mentioned LIKE ?')
-            params.append(f'%{product_code}%')
+            # Counting (and sorting by score) starts from the product's leads in
+            # idx_lead_products_code; see below for pages in date order
+            product_clause = len(where_clauses)
+            where_clauses.append('l.id IN (SELECT lead_id FROM lead_products WHERE product_code = ?)')
+            params.append(product_code.upper())
         
         if location:
-            where_clauses.append('c.location LIKE ?')
-            params.append(f'%{location}%')
+            where_clauses.append('(l.geo_location LIKE ? OR c.location LIKE ?)')
+            params.extend([f'%{location}%', f'%{location}%'])
+        
+        # Tender fields are typed columns: range conditions use the tender indexes.
+        # A date-only bound covers that whole day.
+        if closing_from:
+            where_clauses.append('l.tender_closing_at >= ?')
+            params.append(closing_from)
+        
+        if closing_to:
+            if 'T' in closing_to:
+                where_clauses.append('l.tender_closing_at <= ?')
+                params.append(closing_to)
+            else:
+                where_clauses.append('l.tender_closing_at < ?')
+                params.append((date.fromisoformat(closing_to) + timedelta(days=1)).isoformat())
+        
+        if min_value_inr is not None:
+            where_clauses.append('l.tender_value_inr >= ?')
+            params.append(min_value_inr)
+        
+        if max_value_inr is not None:
+            where_clauses.append('l.tender_value_inr <= ?')
+            params.append(max_value_inr)
         
         where_sql = ' AND '.join(where_clauses) if where_clauses else '1=1'
         
@@ -386,32 +717,58 @@ class DatabaseExtended(BaseDatabase):
         
         # Get paginated results
         offset = (page - 1) * limit
+        if sort_by == 'relevance' and not match:
+            sort_by = 'confidence'
         order_column = {
-            'confidence': 'l.confidence',
+            'confidence': 'live_score',
             'timestamp': 'l.scraped_at',
             'company': 'c.name',
             'status': 'l.status',
             'signal_type': 'l.signal_type',
-            'source': 'l.source_name'
-        }.get(sort_by, 'l.confidence')
+            'source': 'l.source_name',
+            'closing': 'l.tender_closing_at',
+            'value': 'l.tender_value_inr',
+            'relevance': 'leads_fts.rank'
+        }.get(sort_by, 'live_score')
         
         order_dir = 'DESC' if sort_order.lower() == 'desc' else 'ASC'
+        if sort_by == 'relevance':
+            # bm25 ranks are lower for better matches; "desc" means best first
+            order_dir = 'ASC' if order_dir == 'DESC' else 'DESC'
+        
+        if product_clause is not None and sort_by == 'timestamp' and total > self.PRODUCT_SORT_MAX_LEADS:
+            # Walk the scraped_at index and stop at the page, checking each lead's
+            # products by primary key, rather than sorting every lead of the product
+            where_clauses[product_clause] = ('EXISTS (SELECT 1 FROM lead_products lp '
+                                             'WHERE lp.lead_id = l.id AND lp.product_code = ?)')
+            where_sql = ' AND '.join(where_clauses)
+        
+        search_columns = search_join = ''
+        if match:
+            # The page joins the matches themselves, for their rank and snippet
+            where_clauses[search_clause] = 'leads_fts MATCH ?'
+            where_sql = ' AND '.join(where_clauses)
+            search_columns = f', {LeadSearch.snippet_sql()} AS snippet'
+            search_join = 'JOIN leads_fts ON leads_fts.rowid = l.id'
         
         query = f'''
-            SELECT l.*, c.name as company_name, c.industry, c.location
+            SELECT l.*, c.name as company_name, c.industry, c.location,
+                   {live_score_sql} AS live_score{search_columns}
             FROM leads l
             JOIN companies c ON l.company_id = c.id
+            {search_join}
             WHERE {where_sql}
             ORDER BY {order_column} {order_dir}
             LIMIT ? OFFSET ?
         '''
-        params.extend([limit, offset])
-        
-        c.execute(query, params)
+        c.execute(query, [now, *params, limit, offset])
         rows = c.fetchall()
         conn.close()
         
         leads = [dict(row) for row in rows]
+        for lead in leads:
+            if 'snippet' in lead:
+                lead['snippet'] = LeadSearch.highlight(lead['snippet'])
         
         return {
             'leads': leads,
@@ -432,11 +789,12 @@ class DatabaseExtended(BaseDatabase):
         # Get lead with company info
         c.execute('''
             SELECT l.*, c.name as company_name, c.industry, c.location,
-                   c.lat, c.lng, c.existing_customer, c.hpcl_customer_id, c.history
+                   c.lat, c.lng, c.existing_customer, c.hpcl_customer_id, c.history,
+                   lead_score(l.static_score, l.scraped_at, ?) AS live_score
             FROM leads l
             JOIN companies c ON l.company_id = c.id
             WHERE l.id = ?
-        ''', (lead_id,))
+        ''', (datetime.now().isoformat(), lead_id))
         
         row = c.fetchone()
         if not row:
@@ -0,0 +1,501 @@
+"""
+Schema migrations
+The schema version is kept in SQLite's PRAGMA user_version. Opening the
+database costs one read of it; only a database behind LATEST_VERSION takes
+the write lock and applies the pending migrations, each exactly once.
+
+Migrations 1-13 are the schema changes made before versioning, in the
+order they were made. A database created along the way is at user_version
+0 with some of them in place, so they are idempotent (IF NOT EXISTS,
+column checks) and it adopts what it has. Migrations 14 and 15 are too:
+databases from before that numbering may already have them.
+
+To change the schema, append a migration; never edit one that has shipped.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+import sys
+from typing import Callable, List, Tuple
+
+from ..services.scoring_engine import ScoringEngine
+from ..services.lead_lifecycle import LeadLifecycle
+from ..services.location_extractor import location_extractor
+from ..services.name_normalizer import normalize_many
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+from utils.database import Database as BaseDatabase
+
+# Static score of a lead row: from its scoring breakdown, or, for leads stored
+# with a bare confidence, that confidence less a fresh lead's freshness
+_STATIC_SCORE_SQL = f"""CASE
+    WHEN json_valid({{row}}.scoring) AND json_extract({{row}}.scoring, '$.breakdown.intent') IS NOT NULL THEN
+        {ScoringEngine.WEIGHTS['intent']} * json_extract({{row}}.scoring, '$.breakdown.intent')
+        + {ScoringEngine.WEIGHTS['size']} * COALESCE(json_extract({{row}}.scoring, '$.breakdown.size'), 0)
+        + {ScoringEngine.WEIGHTS['geography']} * COALESCE(json_extract({{row}}.scoring, '$.breakdown.geography'), 0)
+    ELSE MAX(COALESCE({{row}}.confidence, 0) - {ScoringEngine.WEIGHTS['freshness']}, 0)
+END"""
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+
+def _add_column(c, table: str, column: str, column_type: str):
+    """ALTER TABLE ADD COLUMN, unless the column is already there"""
+    try:
+        c.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+
+
+def migration(version: int, description: str):
+    """Register a migration; versions must be consecutive"""
+    def register(fn):
+        assert version == len(MIGRATIONS) + 1, f"migration {version} out of order"
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+@migration(1, "baseline schema")
+def _baseline(c):
+    """
+    The schema as it stood before versioning. Idempotent, so databases
+    created by the old start-up path (user_version 0) adopt it in place.
+    """
+    BaseDatabase.create_schema(c)
+
+    # Users table
+    c.execute('''CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        name TEXT NOT NULL,
+        role TEXT NOT NULL,
+        territory TEXT,
+        territory_id INTEGER,
+        alert_preferences TEXT,
+        email_enabled BOOLEAN DEFAULT 1,
+        push_enabled BOOLEAN DEFAULT 0,
+        min_confidence REAL DEFAULT 0.7,
+        products TEXT,
+        territories TEXT,
+        active BOOLEAN DEFAULT 1,
+        last_login TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (territory_id) REFERENCES territories (id)
+    )''')
+
+    # Lead actions table
+    c.execute('''CREATE TABLE IF NOT EXISTS lead_actions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        lead_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        action_type TEXT NOT NULL,
+        notes TEXT,
+        next_follow_up TEXT,
+        estimated_deal_value REAL,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (lead_id) REFERENCES leads (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )''')
+
+    # Lead notes table
+    c.execute('''CREATE TABLE IF NOT EXISTS lead_notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        lead_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        note TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (lead_id) REFERENCES leads (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )''')
+
+    # Lead documents table
+    c.execute('''CREATE TABLE IF NOT EXISTS lead_documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        lead_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        file_size INTEGER,
+        uploaded_at TEXT NOT NULL,
+        FOREIGN KEY (lead_id) REFERENCES leads (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )''')
+
+    # Products table
+    c.execute('''CREATE TABLE IF NOT EXISTS products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        base_confidence_rules TEXT,
+        primary_keywords TEXT,
+        secondary_keywords TEXT,
+        negative_keywords TEXT,
+        scoring_factors TEXT,
+        disqualifiers TEXT,
+        updated_at TEXT NOT NULL,
+        updated_by INTEGER,
+        FOREIGN KEY (updated_by) REFERENCES users (id)
+    )''')
+
+    # Territories table
+    c.execute('''CREATE TABLE IF NOT EXISTS territories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        region TEXT NOT NULL,
+        depot TEXT,
+        coverage_areas TEXT,
+        depot_lat REAL,
+        depot_lng REAL,
+        assigned_officers TEXT,
+        active BOOLEAN DEFAULT 1,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )''')
+
+    # Feedback table
+    c.execute('''CREATE TABLE IF NOT EXISTS feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        lead_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        feedback_type TEXT NOT NULL,
+        rating INTEGER NOT NULL,
+        comment TEXT,
+        reason TEXT,
+        correct_product TEXT,
+        correct_industry TEXT,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (lead_id) REFERENCES leads (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )''')
+
+    # Audit log table
+    c.execute('''CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        action TEXT NOT NULL,
+        resource TEXT NOT NULL,
+        resource_id TEXT,
+        changes TEXT,
+        ip_address TEXT,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )''')
+
+    # Extend leads table with new columns (add if not exists)
+    for column, column_type in [('status', 'TEXT DEFAULT "REVIEW_REQUIRED"'), ('assigned_to', 'TEXT'),
+                                ('territory', 'TEXT'), ('scoring', 'TEXT'), ('estimated_value', 'REAL')]:
+        _add_column(c, 'leads', column, column_type)
+
+    # Extend companies table
+    for column, column_type in [('lat', 'REAL'), ('lng', 'REAL'), ('existing_customer', 'BOOLEAN DEFAULT 0'),
+                                ('hpcl_customer_id', 'TEXT'), ('history', 'TEXT')]:
+        _add_column(c, 'companies', column, column_type)
+
+    # Create indexes
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_lead_actions_lead_id ON lead_actions(lead_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_lead_notes_lead_id ON lead_notes(lead_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_products_code ON products(code)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_territories_name ON territories(name)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_feedback_lead_id ON feedback(lead_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_leads_status ON leads(status)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_leads_assigned_to ON leads(assigned_to)')
+
+
+@migration(2, "notification outbox")
+def _notification_outbox(c):
+    """Alerts written in the same transaction as the lead, drained by the notification dispatcher"""
+    c.execute('''CREATE TABLE IF NOT EXISTS notification_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        lead_id INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        recipient TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        idempotency_key TEXT UNIQUE NOT NULL,
+        status TEXT NOT NULL DEFAULT 'PENDING',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at TEXT NOT NULL,
+        last_error TEXT,
+        created_at TEXT NOT NULL,
+        sent_at TEXT,
+        FOREIGN KEY (lead_id) REFERENCES leads (id)
+    )''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status_next ON notification_outbox(status, next_attempt_at)')
+
+
+@migration(3, "outbox digest batch key")
+def _outbox_batch_key(c):
+    """Rows delivered together as one digest share a batch key"""
+    _add_column(c, 'notification_outbox', 'batch_key', 'TEXT')
+
+
+@migration(4, "cache_versions table")
+def _cache_versions(c):
+    """Version counters for in-memory caches shared across processes"""
+    c.execute('''CREATE TABLE IF NOT EXISTS cache_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        updated_at TEXT NOT NULL
+    )''')
+
+
+@migration(5, "company_merges table")
+def _company_merges(c):
+    """Audit trail of duplicate companies merged by dedup_companies.py"""
+    c.execute('''CREATE TABLE IF NOT EXISTS company_merges (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        merged_id INTEGER NOT NULL,
+        merged_name TEXT NOT NULL,
+        canonical_id INTEGER NOT NULL,
+        canonical_name TEXT NOT NULL,
+        score REAL,
+        leads_moved INTEGER NOT NULL DEFAULT 0,
+        merged_at TEXT NOT NULL
+    )''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_company_merges_merged_id ON company_merges(merged_id)')
+
+
+@migration(6, "company_aliases table")
+def _company_aliases(c):
+    """Acronyms and alternate spellings of known companies (see gazetteer.py)"""
+    c.execute('''CREATE TABLE IF NOT EXISTS company_aliases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER NOT NULL,
+        alias TEXT NOT NULL,
+        alias_key TEXT UNIQUE NOT NULL,
+        alias_type TEXT NOT NULL DEFAULT 'ALIAS',
+        case_sensitive BOOLEAN,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (company_id) REFERENCES companies (id)
+    )''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_company_aliases_company_id ON company_aliases(company_id)')
+
+
+@migration(7, "company_resolution_cache table")
+def _company_resolution_cache(c):
+    """Raw scraped name -> resolved company, shared by all scraper processes"""
+    c.execute('''CREATE TABLE IF NOT EXISTS company_resolution_cache (
+        raw_name TEXT PRIMARY KEY,
+        company_id INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (company_id) REFERENCES companies (id)
+    )''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_resolution_cache_company_id ON company_resolution_cache(company_id)')
+
+
+@migration(8, "leads.static_score")
+def _static_score(c):
+    """Time-independent part of the lead score; freshness is added at read time"""
+    _add_column(c, 'leads', 'static_score', 'REAL')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS leads_static_score AFTER INSERT ON leads
+                 WHEN NEW.static_score IS NULL
+                 BEGIN
+                     UPDATE leads SET static_score = {_STATIC_SCORE_SQL.format(row='NEW')} WHERE id = NEW.id;
+                 END''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_leads_static_score ON leads(static_score, scraped_at)')
+    # Leads stored before static_score existed
+    c.execute(f'UPDATE leads SET static_score = {_STATIC_SCORE_SQL.format(row="leads")} WHERE static_score IS NULL')
+
+
+@migration(9, "reprocess_checkpoints table")
+def _reprocess_checkpoints(c):
+    """Progress of reprocess_leads.py runs, for resuming"""
+    c.execute('''CREATE TABLE IF NOT EXISTS reprocess_checkpoints (
+        name TEXT PRIMARY KEY,
+        last_id INTEGER NOT NULL,
+        rows_done INTEGER NOT NULL,
+        rules_version INTEGER,
+        started_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        finished_at TEXT
+    )''')
+
+
+@migration(10, "typed tender columns")
+def _tender_columns(c):
+    """Typed tender fields, parsed once at ingest (see TenderParser)"""
+    for column, column_type in [('tender_reference', 'TEXT'), ('tender_organization', 'TEXT'),
+                                ('tender_value_inr', 'REAL'), ('tender_closing_at', 'TEXT'),
+                                ('tender_opening_at', 'TEXT'), ('tender_published_at', 'TEXT')]:
+        _add_column(c, 'leads', column, column_type)
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_leads_tender_closing ON leads(tender_closing_at, tender_value_inr)
+                 WHERE tender_closing_at IS NOT NULL''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_leads_tender_value ON leads(tender_value_inr)
+                 WHERE tender_value_inr IS NOT NULL''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_leads_tender_reference ON leads(tender_reference)
+                 WHERE tender_reference IS NOT NULL''')
+
+
+@migration(11, "lead expiry and live working-set indexes")
+def _lead_expiry(c):
+    """When a lead stops being actionable, and when it was expired (see LeadLifecycle)"""
+    for column in ('expires_at', 'expired_at'):
+        _add_column(c, 'leads', column, 'TEXT')
+    LeadLifecycle.install_trigger(c)
+
+    # Hot working set: partial on non-expired leads, so they stay small as history grows
+    c.execute('DROP INDEX IF EXISTS idx_leads_static_score')
+    c.execute("""CREATE INDEX IF NOT EXISTS idx_leads_live_static_score ON leads(static_score, scraped_at)
+                 WHERE status != 'EXPIRED'""")
+    c.execute("""CREATE INDEX IF NOT EXISTS idx_leads_live_scraped_at ON leads(scraped_at)
+                 WHERE status != 'EXPIRED'""")
+    c.execute("""CREATE INDEX IF NOT EXISTS idx_leads_live_expires_at ON leads(expires_at)
+                 WHERE status != 'EXPIRED'""")
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_leads_expiry_pending ON leads(id)
+                 WHERE expires_at IS NULL''')
+
+    # The hot-set indexes skip NULL statuses; those leads were always shown as REVIEW_REQUIRED
+    c.execute("UPDATE leads SET status = 'REVIEW_REQUIRED' WHERE status IS NULL")
+
+
+@migration(12, "lead geo columns")
+def _lead_geo(c):
+    """Where the signal is, from the offline place gazetteer (see LocationExtractor)"""
+    for column, column_type in [('geo_location', 'TEXT'), ('geo_state', 'TEXT'),
+                                ('geo_lat', 'REAL'), ('geo_lng', 'REAL')]:
+        _add_column(c, 'leads', column, column_type)
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_leads_geo_state ON leads(geo_state)
+                 WHERE geo_state IS NOT NULL''')
+
+    # Coordinates for companies whose location was stored as text only
+    extractor = location_extractor()
+    for company_id, location in c.execute('''SELECT id, location FROM companies
+                                             WHERE location IS NOT NULL AND lat IS NULL''').fetchall():
+        place = extractor.geocode(location)
+        if place:
+            c.execute('UPDATE companies SET lat = ?, lng = ? WHERE id = ?', (place['lat'], place['lng'], company_id))
+
+
+@migration(13, "territory auto-routing")
+def _territory_routing(c):
+    """Distance to the routed territory's depot (NULL when routed by hand)"""
+    _add_column(c, 'leads', 'territory_distance_km', 'REAL')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_leads_territory ON leads(territory) WHERE territory IS NOT NULL')
+    c.execute("""CREATE INDEX IF NOT EXISTS idx_leads_unrouted ON leads(id)
+                 WHERE territory IS NULL AND geo_lat IS NOT NULL AND status != 'EXPIRED'""")
+
+
+@migration(14, "lead_products table")
+def _lead_products(c):
+    """One row per product a lead mentions, so product filters and counts use an index"""
+    c.execute('''CREATE TABLE IF NOT EXISTS lead_products (
+        lead_id INTEGER NOT NULL,
+        product_code TEXT NOT NULL,
+        confidence REAL,
+        PRIMARY KEY (lead_id, product_code),
+        FOREIGN KEY (lead_id) REFERENCES leads (id)
+    ) WITHOUT ROWID''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_lead_products_code ON lead_products(product_code, lead_id)')
+    # Stored leads only kept the codes; reprocess_leads.py fills in confidences
+    c.execute("""INSERT OR IGNORE INTO lead_products (lead_id, product_code)
+                 SELECT l.id, upper(p.value) FROM leads l, json_each(l.products_mentioned) p
+                 WHERE json_valid(l.products_mentioned) AND p.type = 'text'""")
+
+
+# Full-text columns of a lead (rowid = lead id); the company name is copied in
+# so one query can match words from both
+_FTS_COLUMNS = 'signal_text, company_name, tender_reference, tender_organization'
+_FTS_VALUES = ("{row}.signal_text, (SELECT name FROM companies WHERE id = {row}.company_id), "
+               "{row}.tender_reference, {row}.tender_organization")
+
+
+@migration(15, "leads_fts full-text index")
+def _leads_fts(c):
+    """
+    FTS5 index over lead text, company name and tender fields, kept in sync
+    by triggers. It stores its own copy of the text: an external-content
+    index would have to be told the exact old company name on every change.
+    """
+    c.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5({_FTS_COLUMNS},
+                 prefix='2 3', tokenize='unicode61 remove_diacritics 2')""")
+    # bm25 weights per column: a hit in the company name or tender reference outranks one in the text
+    c.execute("INSERT INTO leads_fts (leads_fts, rank) VALUES ('rank', 'bm25(1.0, 5.0, 10.0, 2.0)')")
+    c.execute(f'''INSERT INTO leads_fts (rowid, {_FTS_COLUMNS})
+                 SELECT l.id, {_FTS_VALUES.format(row="l")} FROM leads l
+                 WHERE l.id NOT IN (SELECT rowid FROM leads_fts)''')
+
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads
+                 BEGIN
+                     INSERT INTO leads_fts (rowid, {_FTS_COLUMNS}) VALUES (NEW.id, {_FTS_VALUES.format(row="NEW")});
+                 END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS leads_fts_update
+                 AFTER UPDATE OF signal_text, company_id, tender_reference, tender_organization ON leads
+                 WHEN NEW.signal_text IS NOT OLD.signal_text OR NEW.company_id IS NOT OLD.company_id
+                      OR NEW.tender_reference IS NOT OLD.tender_reference
+                      OR NEW.tender_organization IS NOT OLD.tender_organization
+                 BEGIN
+                     DELETE FROM leads_fts WHERE rowid = OLD.id;
+                     INSERT INTO leads_fts (rowid, {_FTS_COLUMNS}) VALUES (NEW.id, {_FTS_VALUES.format(row="NEW")});
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads
+                 BEGIN
+                     DELETE FROM leads_fts WHERE rowid = OLD.id;
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS companies_fts_rename AFTER UPDATE OF name ON companies
+                 WHEN NEW.name IS NOT OLD.name
+                 BEGIN
+                     UPDATE leads_fts SET company_name = NEW.name
+                     WHERE rowid IN (SELECT id FROM leads WHERE company_id = NEW.id);
+                 END''')
+
+
+@migration(16, "re-normalize company names")
+def _renormalize_companies(c):
+    """
+    Companies stored before entity resolution wrote its own normalized names
+    kept `name.lower().strip()` ("tata power ltd"), which exact lookups of
+    the normalized name ("tata power") never find. Companies left with the
+    same normalized name are merged by dedup_companies.py.
+    """
+    rows = c.execute('SELECT id, name, normalized_name FROM companies').fetchall()
+    normalized = normalize_many([name or '' for _, name, _ in rows])
+    c.executemany('UPDATE companies SET normalized_name = ? WHERE id = ?',
+                  [(norm, company_id) for (company_id, _, old), norm in zip(rows, normalized)
+                   if norm and norm != old])
+
+
+LATEST_VERSION = len(MIGRATIONS)
+_lock = threading.Lock()
+
+
+def schema_version(conn) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db) -> List[int]:
+    """
+    Bring the database up to LATEST_VERSION; returns the versions applied.
+
+    Pending migrations run in one BEGIN IMMEDIATE transaction (DDL is
+    transactional in SQLite), and the version is re-read once the lock is
+    held, so of several workers starting together only the first applies
+    them and a failed migration leaves the previous version intact.
+    """
+    conn = db.get_connection()
+    try:
+        if schema_version(conn) >= LATEST_VERSION:
+            return []
+        with _lock:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                current = schema_version(conn)
+                c = conn.cursor()
+                applied = []
+                for version, description, fn in MIGRATIONS[current:]:
+                    fn(c)
+                    applied.append(version)
+                    print(f"🗃️  Applied migration {version}: {description}")
+                if applied:
+                    c.execute(f'PRAGMA user_version = {LATEST_VERSION}')
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return applied
+    finally:
+        conn.close()
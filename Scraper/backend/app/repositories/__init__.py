@@ -0,0 +1,6 @@
+"""
+Async repositories used by the API routers (see base.db_call)
+"""
+from . import alerts, dashboard, feedback, leads, products, sources, territories, users
+
+__all__ = ['alerts', 'dashboard', 'feedback', 'leads', 'products', 'sources', 'territories', 'users']
@@ -0,0 +1,39 @@
+"""
+Alert preference and notification outbox repository
+"""
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ..models.database import db
+from .base import db_call
+
+
+@db_call
+def get_preferences(user_id: int) -> Optional[Dict[str, Any]]:
+    """The user's alert preference columns, or None if there is no such user"""
+    conn = db.get_connection()
+    conn.row_factory = sqlite3.Row
+    row = conn.execute('''
+        SELECT email_enabled, push_enabled, min_confidence, products, territories
+        FROM users
+        WHERE id = ?
+    ''', (user_id,)).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+@db_call
+def update_preferences(user_id: int, values: Dict[str, Any]):
+    """Set preference columns (column -> value) and invalidate the alert subscription index"""
+    values = dict(values, updated_at=datetime.now().isoformat())
+    conn = db.get_connection()
+    conn.execute(f"UPDATE users SET {', '.join(f'{column} = ?' for column in values)} WHERE id = ?",
+                 [*values.values(), user_id])
+    db.bump_cache_version('alert_subscriptions', conn)
+    conn.commit()
+    conn.close()
+
+
+@db_call
+def get_outbox_metrics() -> Dict[str, Any]:
+    return db.get_outbox_metrics()
@@ -0,0 +1,44 @@
+"""
+Async database access for the API
+Repository functions are plain blocking sqlite3 code; @db_call runs them on
+a dedicated thread pool so a slow query no longer stalls the event loop.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads per lane (each thread keeps its own pooled connections), and how
+# many calls may be running or queued on them before callers wait their turn.
+# Heavy aggregate queries (dashboards, analytics, bulk jobs) get their own
+# small 'reports' lane so interactive calls never queue behind them.
+DB_THREADS = int(os.getenv("DB_THREADS", "8"))
+DB_REPORT_THREADS = int(os.getenv("DB_REPORT_THREADS", "2"))
+DB_QUEUE_SIZE = int(os.getenv("DB_QUEUE_SIZE", "64"))
+
+_executors = {
+    'default': ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix='db'),
+    'reports': ThreadPoolExecutor(max_workers=DB_REPORT_THREADS, thread_name_prefix='db-reports'),
+}
+_slots = {lane: asyncio.Semaphore(DB_QUEUE_SIZE) for lane in _executors}
+
+
+async def run_db(fn, *args, lane: str = 'default', **kwargs):
+    """Run a blocking database function on a DB thread pool lane and await its result"""
+    async with _slots[lane]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executors[lane], functools.partial(fn, *args, **kwargs))
+
+
+def db_call(fn=None, *, lane: str = 'default'):
+    """
+    Make a blocking repository function awaitable (see run_db); use
+    @db_call(lane='reports') for heavy queries. `.sync` is the original.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await run_db(fn, *args, lane=lane, **kwargs)
+        wrapper.sync = fn
+        return wrapper
+    return decorate(fn) if fn else decorate
@@ -0,0 +1,117 @@
+"""
+Dashboard and analytics repository
+"""
+from typing import Any, Dict, List
+from ..models.database import db
+from .base import db_call
+
+
+@db_call(lane='reports')
+def get_stats(start_date: str, end_date: str, now: str, trend_days: List[str]) -> Dict[str, Any]:
+    """
+    Lead counts for the executive view, for leads scraped between two dates.
+    Confidence buckets use the live score (as of `now`) of unexpired leads.
+    """
+    conn = db.get_connection()
+    c = conn.cursor()
+    period = (start_date, end_date)
+
+    stats = {
+        'total_leads': c.execute(
+            "SELECT COUNT(*) FROM leads WHERE DATE(scraped_at) BETWEEN ? AND ?", period
+        ).fetchone()[0],
+        'auto_assigned': c.execute(
+            "SELECT COUNT(*) FROM leads WHERE status = 'AUTO_ASSIGNED' AND DATE(scraped_at) BETWEEN ? AND ?", period
+        ).fetchone()[0],
+        'estimated_value': c.execute(
+            "SELECT COALESCE(SUM(estimated_value), 0) FROM leads WHERE DATE(scraped_at) BETWEEN ? AND ?", period
+        ).fetchone()[0],
+    }
+
+    # Leads per product (a lead mentioning two products counts for both): the
+    # top ten, and leads with no product apart so the cut can't drop them
+    by_product = c.execute('''
+        SELECT COALESCE(lp.product_code, 'Unknown') as product, COUNT(*) as count
+        FROM leads l
+        LEFT JOIN lead_products lp ON lp.lead_id = l.id
+        WHERE DATE(l.scraped_at) BETWEEN ? AND ?
+        GROUP BY product
+        ORDER BY count DESC
+    ''', period).fetchall()
+    stats['by_product'] = [row for row in by_product if row[0] != 'Unknown'][:10]
+    stats['no_product'] = next((row[1] for row in by_product if row[0] == 'Unknown'), 0)
+
+    stats['by_status'] = c.execute('''
+        SELECT status, COUNT(*) as count
+        FROM leads
+        WHERE DATE(scraped_at) BETWEEN ? AND ?
+        GROUP BY status
+    ''', period).fetchall()
+
+    stats['high'] = c.execute(
+        "SELECT COUNT(*) FROM leads WHERE status != 'EXPIRED' AND lead_score(static_score, scraped_at, ?) >= 0.9 AND DATE(scraped_at) BETWEEN ? AND ?",
+        (now, *period)
+    ).fetchone()[0]
+    stats['medium'] = c.execute(
+        "SELECT COUNT(*) FROM leads WHERE status != 'EXPIRED' AND lead_score(static_score, scraped_at, ?) >= 0.5 "
+        "AND lead_score(static_score, scraped_at, ?) < 0.9 AND DATE(scraped_at) BETWEEN ? AND ?",
+        (now, now, *period)
+    ).fetchone()[0]
+    stats['low'] = c.execute(
+        "SELECT COUNT(*) FROM leads WHERE status != 'EXPIRED' AND lead_score(static_score, scraped_at, ?) < 0.5 AND DATE(scraped_at) BETWEEN ? AND ?",
+        (now, *period)
+    ).fetchone()[0]
+
+    stats['leads_per_day'] = [
+        c.execute("SELECT COUNT(*) FROM leads WHERE DATE(scraped_at) = ?", (day,)).fetchone()[0]
+        for day in trend_days
+    ]
+
+    stats['total_actioned'] = c.execute(
+        "SELECT COUNT(DISTINCT lead_id) FROM lead_actions WHERE created_at >= ?",
+        (start_date,)
+    ).fetchone()[0]
+
+    conn.close()
+    return stats
+
+
+@db_call(lane='reports')
+def get_performance() -> Dict[str, Any]:
+    """Scrape success, lead outcome and source coverage counts"""
+    conn = db.get_connection()
+    c = conn.cursor()
+
+    performance = {
+        'total_scrapes': c.execute("SELECT COUNT(*) FROM scrape_log").fetchone()[0],
+        'successful_scrapes': c.execute(
+            "SELECT COUNT(*) FROM scrape_log WHERE status = 'success'"
+        ).fetchone()[0],
+        'total_actions': c.execute("SELECT COUNT(*) FROM lead_actions").fetchone()[0],
+        'accepted': c.execute(
+            "SELECT COUNT(*) FROM lead_actions WHERE action_type = 'ACCEPT'"
+        ).fetchone()[0],
+        'rejected': c.execute(
+            "SELECT COUNT(*) FROM lead_actions WHERE action_type = 'REJECT'"
+        ).fetchone()[0],
+        'converted': c.execute(
+            "SELECT COUNT(*) FROM lead_actions WHERE action_type = 'CONVERT'"
+        ).fetchone()[0],
+        'total_leads': c.execute("SELECT COUNT(*) FROM leads").fetchone()[0],
+        'active_sources': c.execute(
+            "SELECT COUNT(DISTINCT source_name) FROM scrape_log WHERE scraped_at >= date('now', '-1 day')"
+        ).fetchone()[0],
+        'total_sources': c.execute(
+            "SELECT COUNT(DISTINCT domain) FROM source_registry"
+        ).fetchone()[0],
+    }
+
+    locations = c.execute('''
+        SELECT DISTINCT location FROM companies 
+        WHERE location IS NOT NULL 
+        LIMIT 10
+    ''').fetchall()
+    performance['locations'] = [loc[0] for loc in locations if loc[0]]
+
+    conn.close()
+    return performance
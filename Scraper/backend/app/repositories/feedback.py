@@ -0,0 +1,46 @@
+"""
+Feedback repository
+"""
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ..models.database import db
+from .base import db_call
+
+
+@db_call
+def submit(lead_id: int, user_id: int, feedback_type: str, rating: int, comment: str = None) -> Optional[int]:
+    """Store feedback on a lead; returns its id, or None if the lead doesn't exist"""
+    conn = db.get_connection()
+    c = conn.cursor()
+    try:
+        c.execute('SELECT id FROM leads WHERE id = ?', (lead_id,))
+        if not c.fetchone():
+            return None
+
+        c.execute('''
+            INSERT INTO feedback (lead_id, user_id, feedback_type, rating, comment, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (lead_id, user_id, feedback_type, rating, comment, datetime.now().isoformat()))
+        feedback_id = c.lastrowid
+        conn.commit()
+        return feedback_id
+    finally:
+        conn.close()
+
+
+@db_call(lane='reports')
+def get_analytics() -> Optional[Dict[str, Any]]:
+    """Feedback count and average ratings, overall and per feedback type"""
+    conn = db.get_connection()
+    conn.row_factory = sqlite3.Row
+    row = conn.execute('''
+        SELECT COUNT(*) as total,
+               AVG(rating) as avg_rating,
+               AVG(CASE WHEN feedback_type = 'QUALITY' THEN rating END) as quality,
+               AVG(CASE WHEN feedback_type = 'RELEVANCE' THEN rating END) as relevance,
+               AVG(CASE WHEN feedback_type = 'ACCURACY' THEN rating END) as accuracy
+        FROM feedback
+    ''').fetchone()
+    conn.close()
+    return dict(row) if row else None
@@ -0,0 +1,43 @@
+"""
+Lead repository
+"""
+from typing import Any, Dict, Optional
+from ..models.database import db
+from .base import db_call
+
+
+@db_call
+def get_paginated(**filters) -> Dict[str, Any]:
+    """See DatabaseExtended.get_leads_paginated"""
+    return db.get_leads_paginated(**filters)
+
+
+@db_call
+def get_by_id(lead_id: int) -> Optional[Dict[str, Any]]:
+    """The lead with its company, actions, notes and documents"""
+    return db.get_lead_by_id(lead_id)
+
+
+@db_call
+def exists(lead_id: int) -> bool:
+    conn = db.get_connection()
+    row = conn.execute('SELECT 1 FROM leads WHERE id = ?', (lead_id,)).fetchone()
+    conn.close()
+    return row is not None
+
+
+@db_call
+def add_action(lead_id: int, user_id: int, action_type: str, notes: str = None,
+               next_follow_up: str = None, estimated_deal_value: float = None) -> Optional[str]:
+    """Record an action; returns the lead's status afterwards"""
+    db.add_lead_action(lead_id=lead_id, user_id=user_id, action_type=action_type, notes=notes,
+                       next_follow_up=next_follow_up, estimated_deal_value=estimated_deal_value)
+    conn = db.get_connection()
+    row = conn.execute('SELECT status FROM leads WHERE id = ?', (lead_id,)).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+@db_call
+def add_note(lead_id: int, user_id: int, note: str) -> int:
+    return db.add_lead_note(lead_id=lead_id, user_id=user_id, note=note)
@@ -0,0 +1,48 @@
+"""
+Product rule repository
+"""
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..models.database import db
+from .base import db_call
+
+
+@db_call
+def list_products() -> List[Dict[str, Any]]:
+    conn = db.get_connection()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('''
+        SELECT code, name, category, base_confidence_rules,
+               primary_keywords, secondary_keywords, negative_keywords, disqualifiers
+        FROM products
+        ORDER BY category, name
+    ''').fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+@db_call
+def update_rules(product_code: str, values: Dict[str, Any], user_id: int) -> Optional[int]:
+    """
+    Set rule columns (column -> value) of a product and invalidate compiled
+    rules everywhere; returns the new rules version, or None if there is no
+    such product
+    """
+    conn = db.get_connection()
+    c = conn.cursor()
+    try:
+        c.execute('SELECT id FROM products WHERE code = ?', (product_code,))
+        if not c.fetchone():
+            return None
+
+        values = dict(values, updated_at=datetime.now().isoformat(), updated_by=user_id)
+        c.execute(f"UPDATE products SET {', '.join(f'{column} = ?' for column in values)} WHERE code = ?",
+                  [*values.values(), product_code])
+        # Scraper and API processes recompile the rules on their next version check
+        db.bump_cache_version('product_rules', conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return db.get_product_rules(force=True).version
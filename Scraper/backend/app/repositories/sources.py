@@ -0,0 +1,57 @@
+"""
+Source registry repository
+"""
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..models.database import db
+from .base import db_call
+
+
+@db_call
+def list_sources() -> List[Dict[str, Any]]:
+    """Registered sources with their most recent scrape"""
+    conn = db.get_connection()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('''
+        SELECT sr.id, sr.domain, sr.category, sr.trust_score, sr.last_checked,
+               sl.source_name, sl.source_type, sl.items_found, sl.scraped_at
+        FROM source_registry sr
+        LEFT JOIN (
+            SELECT source_name, source_type, items_found, scraped_at,
+                   ROW_NUMBER() OVER (PARTITION BY source_name ORDER BY scraped_at DESC) as rn
+            FROM scrape_log
+        ) sl ON sr.domain LIKE '%' || sl.source_name || '%' AND sl.rn = 1
+        ORDER BY sr.trust_score DESC, sr.domain
+    ''').fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+@db_call
+def create(domain: str, category: str, trust_score: float) -> Optional[int]:
+    """Register a source; returns its id, or None if the domain is already registered"""
+    conn = db.get_connection()
+    c = conn.cursor()
+    try:
+        c.execute('SELECT id FROM source_registry WHERE domain = ?', (domain,))
+        if c.fetchone():
+            return None
+
+        c.execute('''
+            INSERT INTO source_registry (domain, category, trust_score, robots_compliant, last_checked)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (domain, category, trust_score, True, datetime.now().isoformat()))
+        source_id = c.lastrowid
+        conn.commit()
+        return source_id
+    finally:
+        conn.close()
+
+
+@db_call
+def get_domain(source_id: int) -> Optional[str]:
+    conn = db.get_connection()
+    row = conn.execute('SELECT domain FROM source_registry WHERE id = ?', (source_id,)).fetchone()
+    conn.close()
+    return row[0] if row else None
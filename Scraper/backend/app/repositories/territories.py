@@ -0,0 +1,71 @@
+"""
+Territory repository
+"""
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..models.database import db
+from ..services.territory_router import TerritoryRoutingJob
+from .base import db_call
+
+
+@db_call(lane='reports')
+def list_with_stats() -> List[Dict[str, Any]]:
+    """Territories with their active lead and assigned officer counts"""
+    conn = db.get_connection()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('''
+        SELECT t.id, t.name, t.region, t.depot, t.coverage_areas,
+               COUNT(DISTINCT CASE WHEN l.status IN ('NEW', 'ACCEPTED') THEN l.id END) as active_leads,
+               COUNT(DISTINCT u.id) as assigned_officers
+        FROM territories t
+        LEFT JOIN leads l ON l.territory = t.name
+        LEFT JOIN users u ON u.territory_id = t.id
+        GROUP BY t.id
+        ORDER BY t.region, t.name
+    ''').fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+@db_call
+def get_name(territory_id: int) -> Optional[str]:
+    conn = db.get_connection()
+    row = conn.execute('SELECT name FROM territories WHERE id = ?', (territory_id,)).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+@db_call
+def route_lead(lead_id: int, territory_name: str, user_id: int, reason: str) -> bool:
+    """
+    Route a lead by hand and log the action; False if the lead doesn't
+    exist. No distance is stored, so auto-routing leaves the lead alone.
+    """
+    conn = db.get_connection()
+    c = conn.cursor()
+    try:
+        c.execute('SELECT id FROM leads WHERE id = ?', (lead_id,))
+        if not c.fetchone():
+            return False
+
+        now = datetime.now().isoformat()
+        c.execute('''
+            UPDATE leads
+            SET territory = ?, territory_distance_km = NULL
+            WHERE id = ?
+        ''', (territory_name, lead_id))
+        c.execute('''
+            INSERT INTO lead_actions (lead_id, user_id, action_type, notes, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (lead_id, user_id, 'ROUTE', reason, now))
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+@db_call(lane='reports')
+def route_unassigned(reroute: bool = False) -> Dict[str, Any]:
+    """See TerritoryRoutingJob.run"""
+    return TerritoryRoutingJob.run(db, reroute=reroute)
@@ -0,0 +1,21 @@
+"""
+User repository
+"""
+from typing import Any, Dict, Optional
+from ..models.database import db
+from .base import db_call
+
+
+@db_call
+def get_by_id(user_id: int) -> Optional[Dict[str, Any]]:
+    return db.get_user_by_id(user_id)
+
+
+@db_call
+def get_by_email(email: str) -> Optional[Dict[str, Any]]:
+    return db.get_user_by_email(email)
+
+
+@db_call
+def update_last_login(user_id: int):
+    db.update_user_last_login(user_id)
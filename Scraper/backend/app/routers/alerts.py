@@ -3,10 +3,9 @@ Alert and notification router
 """
 from fastapi import APIRouter, HTTPException, status, Depends
 import json
-from datetime import datetime
 from ..schemas.alert_schemas import AlertPreferencesResponse, AlertPreferencesUpdate
-from ..models.database import db
-from ..middleware.auth import get_current_user
+from ..repositories import alerts as alerts_repo
+from ..middleware.auth import get_current_user, require_roles
 
 router = APIRouter(prefix="/api/alerts", tags=["Alerts"])
 
@@ -20,19 +19,8 @@ async def get_alert_preferences(
     
     Requires authentication
     """
-    conn = db.get_connection()
-    conn.row_factory = None
-    c = conn.cursor()
-    
     # Try to get existing preferences
-    c.execute('''
-        SELECT email_enabled, push_enabled, min_confidence, products, territories
-        FROM users
-        WHERE id = ?
-    ''', (current_user['id'],))
-    
-    row = c.fetchone()
-    conn.close()
+    row = await alerts_repo.get_preferences(current_user['id'])
     
     if not row:
         raise HTTPException(
@@ -41,20 +29,20 @@ async def get_alert_preferences(
         )
     
     try:
-        products = json.loads(row[3]) if row[3] else []
+        products = json.loads(row['products']) if row['products'] else []
     except:
         products = []
     
     try:
-        territories = json.loads(row[4]) if row[4] else []
+        territories = json.loads(row['territories']) if row['territories'] else []
     except:
         territories = []
     
     return AlertPreferencesResponse(
         userId=current_user['id'],
-        emailEnabled=row[0] if row[0] is not None else True,
-        pushEnabled=row[1] if row[1] is not None else False,
-        minConfidence=row[2] if row[2] is not None else 0.7,
+        emailEnabled=row['email_enabled'] if row['email_enabled'] is not None else True,
+        pushEnabled=row['push_enabled'] if row['push_enabled'] is not None else False,
+        minConfidence=row['min_confidence'] if row['min_confidence'] is not None else 0.7,
         products=products,
         territories=territories
     )
@@ -70,56 +58,52 @@ async def update_alert_preferences(
     
     Requires authentication
     """
-    conn = db.get_connection()
-    c = conn.cursor()
-    
-    # Build update query
-    updates = []
-    params = []
+    # Build update (column -> value)
+    updates = {}
     
     if preferences.emailEnabled is not None:
-        updates.append('email_enabled = ?')
-        params.append(1 if preferences.emailEnabled else 0)
+        updates['email_enabled'] = 1 if preferences.emailEnabled else 0
     
     if preferences.pushEnabled is not None:
-        updates.append('push_enabled = ?')
-        params.append(1 if preferences.pushEnabled else 0)
+        updates['push_enabled'] = 1 if preferences.pushEnabled else 0
     
     if preferences.minConfidence is not None:
         if preferences.minConfidence < 0 or preferences.minConfidence > 1:
-            conn.close()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="minConfidence must be between 0 and 1"
             )
-        updates.append('min_confidence = ?')
-        params.append(preferences.minConfidence)
+        updates['min_confidence'] = preferences.minConfidence
     
     if preferences.products is not None:
-        updates.append('products = ?')
-        params.append(json.dumps(preferences.products))
+        updates['products'] = json.dumps(preferences.products)
     
     if preferences.territories is not None:
-        updates.append('territories = ?')
-        params.append(json.dumps(preferences.territories))
+        updates['territories'] = json.dumps(preferences.territories)
     
     if not updates:
-        conn.close()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No updates provided"
         )
     
-    # Execute update
-    params.append(current_user['id'])
-    query = f"UPDATE users SET {', '.join(updates)} WHERE id = ?"
-    c.execute(query, params)
-    
-    conn.commit()
-    conn.close()
+    # Execute update and invalidate the alert subscription index
+    await alerts_repo.update_preferences(current_user['id'], updates)
     
     return {
         "success": True,
         "userId": current_user['id'],
         "message": "Alert preferences updated successfully"
     }
+
+
+@router.get("/outbox/metrics")
+async def get_outbox_metrics(
+    current_user: dict = Depends(require_roles(['ADMIN', 'MANAGER']))
+):
+    """
+    Notification outbox backlog depth and delivery latency
+    
+    Requires ADMIN or MANAGER role
+    """
+    return await alerts_repo.get_outbox_metrics()
@@ -3,7 +3,7 @@ Authentication router
 """
 from fastapi import APIRouter, HTTPException, status, Depends
 from ..schemas.auth_schemas import LoginRequest, LoginResponse, UserResponse
-from ..models.database import db
+from ..repositories import users as users_repo
 from ..utils.security import verify_password, create_access_token
 from ..middleware.auth import get_current_user
 
@@ -18,7 +18,7 @@ async def login(credentials: LoginRequest):
     Returns JWT token and user profile
     """
     # Get user by email
-    user = db.get_user_by_email(credentials.email)
+    user = await users_repo.get_by_email(credentials.email)
     
     if not user:
         raise HTTPException(
@@ -41,7 +41,7 @@ async def login(credentials: LoginRequest):
         )
     
     # Update last login
-    db.update_user_last_login(user['id'])
+    await users_repo.update_last_login(user['id'])
     
     # Create access token
     access_token = create_access_token(data={"sub": str(user['id'])})
@@ -9,7 +9,7 @@ from ..schemas.dashboard_schemas import (
     DashboardSummary, DashboardTrends,
     SignalProcessingMetrics, LeadQualityMetrics, CoverageMetrics
 )
-from ..models.database import db
+from ..repositories import dashboard as dashboard_repo
 from ..middleware.auth import get_current_user
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
@@ -27,10 +27,6 @@ async def get_dashboard_stats(
     
     Requires authentication
     """
-    conn = db.get_connection()
-    conn.row_factory = None
-    c = conn.cursor()
-    
     # Calculate date range
     end_date = datetime.now()
     if dateRange == 'all':
@@ -45,117 +41,50 @@ async def get_dashboard_stats(
         start_date = datetime.fromisoformat(startDate) if startDate else end_date - timedelta(days=7)
         end_date = datetime.fromisoformat(endDate) if endDate else datetime.now()
     
-    start_date_str = start_date.date().isoformat()
-    end_date_str = end_date.date().isoformat()
-    
-    # Get summary statistics
-    total_leads = c.execute(
-        "SELECT COUNT(*) FROM leads WHERE DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
-    
-    high_confidence = c.execute(
-        "SELECT COUNT(*) FROM leads WHERE confidence >= 0.9 AND DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
-    
-    auto_assigned = c.execute(
-        "SELECT COUNT(*) FROM leads WHERE status = 'AUTO_ASSIGNED' AND DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
+    # Get trends (leads per day for the last 7 days)
+    # Always show last 7 days trend regardless of filter, or adapt? 
+    # Usually trends chart is fixed window unless specified. 
+    # I'll keep it as last 7 days for now as the UI expects it.
+    trend_days = [(end_date - timedelta(days=6-i)).date().isoformat() for i in range(7)]
     
-    estimated_value = c.execute(
-        "SELECT COALESCE(SUM(estimated_value), 0) FROM leads WHERE DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
+    stats = await dashboard_repo.get_stats(
+        start_date=start_date.date().isoformat(),
+        end_date=end_date.date().isoformat(),
+        now=datetime.now().isoformat(),
+        trend_days=trend_days
+    )
+    total_leads = stats['total_leads']
     
     # Get leads by category (product)
-    by_category_rows = c.execute('''
-        SELECT products_mentioned, COUNT(*) as count
-        FROM leads
-        WHERE DATE(scraped_at) BETWEEN ? AND ?
-        GROUP BY products_mentioned
-        ORDER BY count DESC
-        LIMIT 10
-    ''', (start_date_str, end_date_str)).fetchall()
-    
-    by_category = {}
-    for row in by_category_rows:
-        product = row[0] if row[0] else "Unknown"
-        try:
-            import json
-            products = json.loads(product)
-            key = products[0] if products else "Unknown"
-        except:
-            key = "Unknown"
-        by_category[key] = row[1]
+    by_category = {row[0]: row[1] for row in stats['by_product']}
+    if stats['no_product']:
+        by_category['Unknown'] = stats['no_product']
     
     # Get leads by status
-    by_status_rows = c.execute('''
-        SELECT status, COUNT(*) as count
-        FROM leads
-        WHERE DATE(scraped_at) BETWEEN ? AND ?
-        GROUP BY status
-    ''', (start_date_str, end_date_str)).fetchall()
-    
-    by_status = {row[0] if row[0] else 'REVIEW_REQUIRED': row[1] for row in by_status_rows}
+    by_status = {row[0] if row[0] else 'REVIEW_REQUIRED': row[1] for row in stats['by_status']}
     
     # Get leads by confidence
-    high = c.execute(
-        "SELECT COUNT(*) FROM leads WHERE confidence >= 0.9 AND DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
-    
-    medium = c.execute(
-        "SELECT COUNT(*) FROM leads WHERE confidence >= 0.5 AND confidence < 0.9 AND DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
-    
-    low = c.execute(
-        "SELECT COUNT(*) FROM leads WHERE confidence < 0.5 AND DATE(scraped_at) BETWEEN ? AND ?",
-        (start_date_str, end_date_str)
-    ).fetchone()[0]
-    
     by_confidence = {
-        "High": high,
-        "Medium": medium,
-        "Low": low
+        "High": stats['high'],
+        "Medium": stats['medium'],
+        "Low": stats['low']
     }
     
-    # Get trends (leads per day for the last 7 days)
-    # Always show last 7 days trend regardless of filter, or adapt? 
-    # Usually trends chart is fixed window unless specified. 
-    # I'll keep it as last 7 days for now as the UI expects it.
-    leads_per_day = []
-    for i in range(7):
-        day = (end_date - timedelta(days=6-i)).date().isoformat()
-        count = c.execute(
-            "SELECT COUNT(*) FROM leads WHERE DATE(scraped_at) = ?",
-            (day,)
-        ).fetchone()[0]
-        leads_per_day.append(count)
-    
     # Calculate conversion rate
-    total_actioned = c.execute(
-        "SELECT COUNT(DISTINCT lead_id) FROM lead_actions WHERE created_at >= ?",
-        (start_date_str,)
-    ).fetchone()[0]
-    conversion_rate = total_actioned / total_leads if total_leads > 0 else 0
-    
-    conn.close()
+    conversion_rate = stats['total_actioned'] / total_leads if total_leads > 0 else 0
     
     return DashboardStatsResponse(
         summary=DashboardSummary(
             totalLeads=total_leads,
-            highConfidence=high_confidence,
-            autoAssigned=auto_assigned,
-            estimatedValue=estimated_value
+            highConfidence=stats['high'],
+            autoAssigned=stats['auto_assigned'],
+            estimatedValue=stats['estimated_value']
         ),
         byCategory=by_category,
         byStatus=by_status,
         byConfidence=by_confidence,
         trends=DashboardTrends(
-            leadsPerDay=leads_per_day,
+            leadsPerDay=stats['leads_per_day'],
             conversionRate=conversion_rate,
             avgTimeToContact=2.5  # TODO: Calculate from data
         )
@@ -171,55 +100,18 @@ async def get_dashboard_performance(
     
     Requires authentication
     """
-    conn = db.get_connection()
-    c = conn.cursor()
+    metrics = await dashboard_repo.get_performance()
     
     # Get signal processing metrics
-    total_scrapes = c.execute(
-        "SELECT COUNT(*) FROM scrape_log"
-    ).fetchone()[0]
-    
-    successful_scrapes = c.execute(
-        "SELECT COUNT(*) FROM scrape_log WHERE status = 'success'"
-    ).fetchone()[0]
-    
-    success_rate = successful_scrapes / total_scrapes if total_scrapes > 0 else 0
+    total_scrapes = metrics['total_scrapes']
+    success_rate = metrics['successful_scrapes'] / total_scrapes if total_scrapes > 0 else 0
     
     # Get lead quality metrics
-    total_actions = c.execute("SELECT COUNT(*) FROM lead_actions").fetchone()[0]
-    accepted = c.execute(
-        "SELECT COUNT(*) FROM lead_actions WHERE action_type = 'ACCEPT'"
-    ).fetchone()[0]
-    rejected = c.execute(
-        "SELECT COUNT(*) FROM lead_actions WHERE action_type = 'REJECT'"
-    ).fetchone()[0]
-    converted = c.execute(
-        "SELECT COUNT(*) FROM lead_actions WHERE action_type = 'CONVERT'"
-    ).fetchone()[0]
-    
-    total_leads = c.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+    accepted = metrics['accepted']
+    total_leads = metrics['total_leads']
     acceptance_rate = accepted / total_leads if total_leads > 0 else 0
-    rejection_rate = rejected / total_leads if total_leads > 0 else 0
-    conversion_rate = converted / accepted if accepted > 0 else 0
-    
-    # Get coverage metrics
-    active_sources = c.execute(
-        "SELECT COUNT(DISTINCT source_name) FROM scrape_log WHERE scraped_at >= date('now', '-1 day')"
-    ).fetchone()[0]
-    
-    total_sources = c.execute(
-        "SELECT COUNT(DISTINCT domain) FROM source_registry"
-    ).fetchone()[0]
-    
-    # Get geographic coverage
-    locations = c.execute('''
-        SELECT DISTINCT location FROM companies 
-        WHERE location IS NOT NULL 
-        LIMIT 10
-    ''').fetchall()
-    geographic_coverage = [loc[0] for loc in locations if loc[0]]
-    
-    conn.close()
+    rejection_rate = metrics['rejected'] / total_leads if total_leads > 0 else 0
+    conversion_rate = metrics['converted'] / accepted if accepted > 0 else 0
     
     return DashboardPerformanceResponse(
         signalProcessing=SignalProcessingMetrics(
@@ -233,8 +125,8 @@ async def get_dashboard_performance(
             conversionRate=conversion_rate
         ),
         coverage=CoverageMetrics(
-            sourcesActive=active_sources,
-            sourcesTotal=total_sources or 10,
-            geographicCoverage=geographic_coverage
+            sourcesActive=metrics['active_sources'],
+            sourcesTotal=metrics['total_sources'] or 10,
+            geographicCoverage=metrics['locations']
         )
     )
@@ -2,9 +2,8 @@
 Feedback and learning router
 """
 from fastapi import APIRouter, HTTPException, status, Depends
-from datetime import datetime
 from ..schemas.feedback_schemas import FeedbackRequest, FeedbackAnalytics
-from ..models.database import db
+from ..repositories import feedback as feedback_repo
 from ..middleware.auth import get_current_user, require_roles
 
 router = APIRouter(prefix="/api/feedback", tags=["Feedback"])
@@ -35,36 +34,21 @@ async def submit_feedback(
             detail=f"Feedback type must be one of: {', '.join(valid_types)}"
         )
     
-    conn = db.get_connection()
-    c = conn.cursor()
+    # Insert feedback (None if the lead doesn't exist)
+    feedback_id = await feedback_repo.submit(
+        lead_id=feedback.leadId,
+        user_id=current_user['id'],
+        feedback_type=feedback.feedbackType,
+        rating=feedback.rating,
+        comment=feedback.comment
+    )
     
-    # Check if lead exists
-    c.execute('SELECT id FROM leads WHERE id = ?', (feedback.leadId,))
-    if not c.fetchone():
-        conn.close()
+    if feedback_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Lead {feedback.leadId} not found"
         )
     
-    # Insert feedback
-    now = datetime.now().isoformat()
-    c.execute('''
-        INSERT INTO feedback (lead_id, user_id, feedback_type, rating, comment, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        feedback.leadId,
-        current_user['id'],
-        feedback.feedbackType,
-        feedback.rating,
-        feedback.comment,
-        now
-    ))
-    
-    feedback_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    
     return {
         "success": True,
         "feedbackId": feedback_id,
@@ -81,24 +65,10 @@ async def get_feedback_analytics(
     
     Requires ADMIN or MANAGER role
     """
-    conn = db.get_connection()
-    conn.row_factory = None
-    c = conn.cursor()
-    
     # Get overall stats
-    c.execute('''
-        SELECT COUNT(*) as total,
-               AVG(rating) as avg_rating,
-               AVG(CASE WHEN feedback_type = 'QUALITY' THEN rating END) as quality,
-               AVG(CASE WHEN feedback_type = 'RELEVANCE' THEN rating END) as relevance,
-               AVG(CASE WHEN feedback_type = 'ACCURACY' THEN rating END) as accuracy
-        FROM feedback
-    ''')
-    
-    row = c.fetchone()
+    row = await feedback_repo.get_analytics()
     
     if not row:
-        conn.close()
         return FeedbackAnalytics(
             totalFeedback=0,
             averageRating=0.0,
@@ -108,11 +78,11 @@ async def get_feedback_analytics(
             improvementAreas=[]
         )
     
-    total = row[0] or 0
-    avg_rating = row[1] or 0.0
-    quality = row[2] or 0.0
-    relevance = row[3] or 0.0
-    accuracy = row[4] or 0.0
+    total = row['total'] or 0
+    avg_rating = row['avg_rating'] or 0.0
+    quality = row['quality'] or 0.0
+    relevance = row['relevance'] or 0.0
+    accuracy = row['accuracy'] or 0.0
     
     # Determine improvement areas (scores below 4.0)
     improvement_areas = []
@@ -123,8 +93,6 @@ async def get_feedback_analytics(
     if accuracy < 4.0:
         improvement_areas.append("Confidence scoring")
     
-    conn.close()
-    
     return FeedbackAnalytics(
         totalFeedback=total,
         averageRating=round(avg_rating, 2),
@@ -3,12 +3,14 @@ Lead management router
 """
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from typing import Optional
+from datetime import date
 import json
 from ..schemas.lead_schemas import (
     LeadListResponse, LeadDetailResponse, LeadActionRequest,
     LeadNoteRequest, LeadListItem, PaginationInfo, CompanyInfo
 )
-from ..models.database import db
+from ..repositories import leads as leads_repo
+from ..services.scoring_engine import ScoringEngine
 from ..middleware.auth import get_current_user
 
 router = APIRouter(prefix="/api/leads", tags=["Leads"])
@@ -19,13 +21,18 @@ async def get_leads(
     page: Optional[int] = Query(None, ge=1),
     skip: Optional[int] = Query(None, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    filter: Optional[str] = Query(None, description="Status filter: ALL, AUTO_ASSIGNED, QUALIFIED, REVIEW_REQUIRED"),
-    search: Optional[str] = Query(None, description="Search by company name or product"),
+    filter: Optional[str] = Query(None, description="Status filter: ALL, AUTO_ASSIGNED, QUALIFIED, REVIEW_REQUIRED, EXPIRED"),
+    search: Optional[str] = Query(None, description="Full-text search over signal text, company name and tender fields (words match as prefixes)"),
     minConfidence: Optional[float] = Query(None, ge=0, le=1),
     productCode: Optional[str] = None,
     location: Optional[str] = None,
-    sortBy: str = Query('confidence', description="Sort field: confidence, timestamp, company"),
+    sortBy: Optional[str] = Query(None, description="Sort field: relevance (default with search), confidence (default), timestamp, company, closing, value"),
     sortOrder: str = Query('desc', description="Sort order: asc, desc"),
+    closingFrom: Optional[date] = Query(None, description="Tenders closing on or after this date"),
+    closingTo: Optional[date] = Query(None, description="Tenders closing on or before this date"),
+    minValue: Optional[float] = Query(None, ge=0, description="Minimum tender value (INR)"),
+    maxValue: Optional[float] = Query(None, ge=0, description="Maximum tender value (INR)"),
+    includeExpired: bool = Query(False, description="Include leads past their closing date / TTL"),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -33,6 +40,7 @@ async def get_leads(
     
     Supports both page-based (page) and offset-based (skip) pagination.
     If skip is provided, it takes precedence over page.
+    Expired leads are hidden unless includeExpired=true or filter=EXPIRED.
     
     Requires authentication
     """
@@ -44,7 +52,7 @@ async def get_leads(
     else:
         calculated_page = 1
     
-    result = db.get_leads_paginated(
+    result = await leads_repo.get_paginated(
         page=calculated_page,
         limit=limit,
         filter_status=filter if filter != 'ALL' else None,
@@ -52,8 +60,13 @@ async def get_leads(
         min_confidence=minConfidence,
         product_code=productCode,
         location=location,
-        sort_by=sortBy,
-        sort_order=sortOrder
+        sort_by=sortBy or ('relevance' if search else 'confidence'),
+        sort_order=sortOrder,
+        closing_from=closingFrom.isoformat() if closingFrom else None,
+        closing_to=closingTo.isoformat() if closingTo else None,
+        min_value_inr=minValue,
+        max_value_inr=maxValue,
+        include_expired=includeExpired
     )
     
     # Transform to response format
@@ -72,15 +85,19 @@ async def get_leads(
             timestamp=lead['scraped_at'],
             company=lead['company_name'],
             industry=lead.get('industry'),
-            location=lead.get('location'),
+            location=lead.get('geo_location') or lead.get('location'),
             primaryProduct=products_mentioned[0] if products_mentioned and len(products_mentioned) > 0 else None,
-            confidence=lead['confidence'],
+            confidence=lead['live_score'],
             reasonCodes=[],  # TODO: Parse from scoring field
             status=lead.get('status', 'REVIEW_REQUIRED'),
             source=lead['source_name'],
             assignedTo=lead.get('assigned_to'),
             createdAt=lead['scraped_at'],
-            updatedAt=lead['scraped_at']
+            updatedAt=lead['scraped_at'],
+            tenderReference=lead.get('tender_reference'),
+            tenderValueInr=lead.get('tender_value_inr'),
+            closingAt=lead.get('tender_closing_at'),
+            snippet=lead.get('snippet')
         ))
     
     return LeadListResponse(
@@ -100,7 +117,7 @@ async def get_lead_detail(
     
     Requires authentication
     """
-    lead = db.get_lead_by_id(lead_id)
+    lead = await leads_repo.get_by_id(lead_id)
     
     if not lead:
         raise HTTPException(
@@ -123,6 +140,12 @@ async def get_lead_detail(
         except:
             pass
     
+    # Stored freshness is as of the scrape; report it as of now
+    if scoring:
+        scoring['final_score'] = lead['live_score']
+        if isinstance(scoring.get('breakdown'), dict):
+            scoring['breakdown']['freshness'] = ScoringEngine.calculate_freshness(lead['scraped_at'])
+    
     history = {}
     if lead.get('history'):
         try:
@@ -148,7 +171,19 @@ async def get_lead_detail(
         'sourceUrl': lead.get('source_url'),
         'detectedAt': lead['scraped_at'],
         'rawText': lead.get('signal_text', '')[:500] + '...' if lead.get('signal_text') else '',
-        'extractedEntities': {}  # TODO: Add entity extraction
+        'extractedEntities': {
+            key: value for key, value in {
+                'tenderReference': lead.get('tender_reference'),
+                'organization': lead.get('tender_organization'),
+                'tenderValueInr': lead.get('tender_value_inr'),
+                'closingAt': lead.get('tender_closing_at'),
+                'openingAt': lead.get('tender_opening_at'),
+                'publishedAt': lead.get('tender_published_at'),
+                'location': lead.get('geo_location'),
+                'state': lead.get('geo_state'),
+                'coordinates': {'lat': lead['geo_lat'], 'lng': lead['geo_lng']} if lead.get('geo_lat') is not None else None,
+            }.items() if value is not None
+        }
     }
     
     # Build products list
@@ -157,7 +192,7 @@ async def get_lead_detail(
         products.append({
             'code': product,
             'name': product,  # TODO: Map to product names
-            'confidence': lead['confidence'],
+            'confidence': lead['live_score'],
             'reasoning': 'Product mentioned in signal'
         })
     
@@ -166,7 +201,8 @@ async def get_lead_detail(
         'status': lead.get('status', 'REVIEW_REQUIRED'),
         'assignedTo': lead.get('assigned_to'),
         'assignedAt': None,  # TODO: Track assignment timestamp
-        'territory': lead.get('territory')
+        'territory': lead.get('territory'),
+        'depotDistanceKm': lead.get('territory_distance_km')
     }
     
     return LeadDetailResponse(
@@ -175,7 +211,7 @@ async def get_lead_detail(
         signal=signal,
         products=products,
         scoring=scoring or {
-            'finalScore': lead['confidence'],
+            'finalScore': lead['live_score'],
             'breakdown': {}
         },
         assignment=assignment,
@@ -197,15 +233,14 @@ async def add_lead_action(
     Requires authentication
     """
     # Verify lead exists
-    lead = db.get_lead_by_id(lead_id)
-    if not lead:
+    if not await leads_repo.exists(lead_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lead not found"
         )
     
-    # Add action
-    action_id = db.add_lead_action(
+    # Add action (returns the updated status)
+    updated_status = await leads_repo.add_action(
         lead_id=lead_id,
         user_id=current_user['id'],
         action_type=action.action,
@@ -214,13 +249,10 @@ async def add_lead_action(
         estimated_deal_value=action.estimatedDealValue
     )
     
-    # Get updated status
-    updated_lead = db.get_lead_by_id(lead_id)
-    
     return {
         "success": True,
         "leadId": lead_id,
-        "updatedStatus": updated_lead.get('status'),
+        "updatedStatus": updated_status,
         "message": f"Lead {action.action.lower()}ed successfully"
     }
 
@@ -237,15 +269,14 @@ async def add_lead_note(
     Requires authentication
     """
     # Verify lead exists
-    lead = db.get_lead_by_id(lead_id)
-    if not lead:
+    if not await leads_repo.exists(lead_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lead not found"
         )
     
     # Add note
-    note_id = db.add_lead_note(
+    note_id = await leads_repo.add_note(
         lead_id=lead_id,
         user_id=current_user['id'],
         note=note_request.note
@@ -270,8 +301,7 @@ async def upload_lead_document(
     Requires authentication
     """
     # Verify lead exists
-    lead = db.get_lead_by_id(lead_id)
-    if not lead:
+    if not await leads_repo.exists(lead_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lead not found"
@@ -4,7 +4,7 @@ Product intelligence router
 from fastapi import APIRouter, HTTPException, status, Depends
 import json
 from ..schemas.product_schemas import ProductResponse, ProductRuleUpdate
-from ..models.database import db
+from ..repositories import products as products_repo
 from ..middleware.auth import get_current_user, require_roles
 
 router = APIRouter(prefix="/api/products", tags=["Products"])
@@ -19,34 +19,23 @@ async def get_products(
     
     Requires authentication
     """
-    conn = db.get_connection()
-    conn.row_factory = None
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT code, name, category, base_confidence_rules,
-               primary_keywords, secondary_keywords, negative_keywords
-        FROM products
-        ORDER BY category, name
-    ''')
-    
-    rows = c.fetchall()
-    conn.close()
+    rows = await products_repo.list_products()
     
     products = []
     for row in rows:
         try:
             products.append(ProductResponse(
-                code=row[0],
-                name=row[1],
-                category=row[2],
-                baseConfidenceRules=json.loads(row[3]) if row[3] else {},
-                primaryKeywords=json.loads(row[4]) if row[4] else [],
-                secondaryKeywords=json.loads(row[5]) if row[5] else [],
-                negativeKeywords=json.loads(row[6]) if row[6] else []
+                code=row['code'],
+                name=row['name'],
+                category=row['category'],
+                baseConfidenceRules=json.loads(row['base_confidence_rules']) if row['base_confidence_rules'] else {},
+                primaryKeywords=json.loads(row['primary_keywords']) if row['primary_keywords'] else [],
+                secondaryKeywords=json.loads(row['secondary_keywords']) if row['secondary_keywords'] else [],
+                negativeKeywords=json.loads(row['negative_keywords']) if row['negative_keywords'] else [],
+                disqualifiers=json.loads(row['disqualifiers']) if row['disqualifiers'] else {}
             ))
         except Exception as e:
-            print(f"Error parsing product {row[0]}: {e}")
+            print(f"Error parsing product {row['code']}: {e}")
             continue
     
     return products
@@ -63,62 +52,42 @@ async def update_product_rules(
     
     Requires ADMIN role
     """
-    conn = db.get_connection()
-    c = conn.cursor()
-    
-    # Check if product exists
-    c.execute('SELECT id FROM products WHERE code = ?', (product_code,))
-    if not c.fetchone():
-        conn.close()
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product {product_code} not found"
-        )
-    
-    # Build update query
-    updates = []
-    params = []
+    # Build update (column -> value)
+    updates = {}
     
     if rules.baseConfidenceRules is not None:
-        updates.append('base_confidence_rules = ?')
-        params.append(json.dumps(rules.baseConfidenceRules))
+        updates['base_confidence_rules'] = json.dumps(rules.baseConfidenceRules)
     
     if rules.primaryKeywords is not None:
-        updates.append('primary_keywords = ?')
-        params.append(json.dumps(rules.primaryKeywords))
+        updates['primary_keywords'] = json.dumps(rules.primaryKeywords)
     
     if rules.secondaryKeywords is not None:
-        updates.append('secondary_keywords = ?')
-        params.append(json.dumps(rules.secondaryKeywords))
+        updates['secondary_keywords'] = json.dumps(rules.secondaryKeywords)
     
     if rules.negativeKeywords is not None:
-        updates.append('negative_keywords = ?')
-        params.append(json.dumps(rules.negativeKeywords))
+        updates['negative_keywords'] = json.dumps(rules.negativeKeywords)
+    
+    if rules.disqualifiers is not None:
+        updates['disqualifiers'] = json.dumps(rules.disqualifiers)
     
     if not updates:
-        conn.close()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No updates provided"
         )
     
-    # Add metadata
-    from datetime import datetime
-    updates.append('updated_at = ?')
-    params.append(datetime.now().isoformat())
-    updates.append('updated_by = ?')
-    params.append(current_user['id'])
+    # Execute update (None if the product doesn't exist)
+    rules_version = await products_repo.update_rules(product_code, updates, current_user['id'])
     
-    # Execute update
-    params.append(product_code)
-    query = f"UPDATE products SET {', '.join(updates)} WHERE code = ?"
-    c.execute(query, params)
-    
-    conn.commit()
-    conn.close()
+    if rules_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product {product_code} not found"
+        )
     
     return {
         "success": True,
         "productCode": product_code,
+        "rulesVersion": rules_version,
         "message": "Product rules updated successfully"
     }
@@ -62,6 +62,10 @@ class LeadListItem(BaseModel):
     assignedTo: Optional[str] = None
     createdAt: str
     updatedAt: str
+    tenderReference: Optional[str] = None
+    tenderValueInr: Optional[float] = None
+    closingAt: Optional[str] = None
+    snippet: Optional[str] = None  # Search matches: best-matching text, matches in <mark> tags
 
 
 class PaginationInfo(BaseModel):
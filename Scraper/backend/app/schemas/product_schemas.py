@@ -10,10 +10,11 @@ class ProductResponse(BaseModel):
     code: str
     name: str
     category: str
-    baseConfidenceRules: Dict[str, float]
+    baseConfidenceRules: Dict[str, float]  # Reference confidence per scenario; not used by inference
     primaryKeywords: List[str]
     secondaryKeywords: List[str]
     negativeKeywords: List[str]
+    disqualifiers: Dict[str, float] = {}
     
     class Config:
         json_schema_extra = {
@@ -27,22 +28,26 @@ class ProductResponse(BaseModel):
                 },
                 "primaryKeywords": ["high speed diesel", "HSD", "diesel"],
                 "secondaryKeywords": ["genset", "power backup"],
-                "negativeKeywords": ["retail", "petrol pump"]
+                "negativeKeywords": ["retail", "petrol pump"],
+                "disqualifiers": {}
             }
         }
 
 
 class ProductRuleUpdate(BaseModel):
     """Update product inference rules"""
-    baseConfidenceRules: Optional[Dict[str, float]] = None
+    baseConfidenceRules: Optional[Dict[str, float]] = None  # Reference only; inference doesn't read it
     primaryKeywords: Optional[List[str]] = None
     secondaryKeywords: Optional[List[str]] = None
     negativeKeywords: Optional[List[str]] = None
+    disqualifiers: Optional[Dict[str, float]] = None  # phrase -> penalty, e.g. {"coal fired": -0.3}
     
     class Config:
         json_schema_extra = {
             "example": {
                 "primaryKeywords": ["HSD", "diesel", "high speed diesel"],
-                "secondaryKeywords": ["generator", "DG set"]
+                "secondaryKeywords": ["generator", "DG set"],
+                "negativeKeywords": ["retail", "petrol pump"],
+                "disqualifiers": {"coal fired": -0.3}
             }
         }
@@ -0,0 +1,294 @@
+"""
+Company Deduplication
+Offline job that finds duplicate companies and merges them into one record.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Optional
+
+from .entity_resolution import EntityResolutionService
+from .resolution_index import CompanyResolutionIndex
+from .similarity import name_similarity
+
+
+class UnionFind:
+    """Disjoint sets over company ids (path halving + union by size)"""
+
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+        self.size: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        if x not in parent:
+            parent[x] = x
+            self.size[x] = 1
+            return x
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+
+    def groups(self) -> List[List[int]]:
+        """Sets with more than one member"""
+        groups: Dict[int, List[int]] = {}
+        for x in self.parent:
+            groups.setdefault(self.find(x), []).append(x)
+        return [sorted(members) for members in groups.values() if len(members) > 1]
+
+
+# Worker state, set once per process by _init_worker
+_worker_index: Optional[CompanyResolutionIndex] = None
+_worker_threshold = 0.0
+
+
+def _init_worker(index: CompanyResolutionIndex, threshold: float):
+    global _worker_index, _worker_threshold
+    _worker_index, _worker_threshold = index, threshold
+
+
+def _normalize_chunk(names: List[str]) -> List[str]:
+    return EntityResolutionService.normalize_many(names)
+
+
+def _match_chunk(ids: List[int]) -> List[Tuple[int, int, float]]:
+    """Duplicate pairs (low id, high id, score) for one chunk of companies"""
+    index, threshold = _worker_index, _worker_threshold
+    pairs = []
+    for company_id in ids:
+        name = index.names[company_id]
+        for other_id in index.candidates(name):
+            # Each pair is scored once, from its lower id
+            if other_id <= company_id:
+                continue
+            score = name_similarity(name, index.names[other_id])
+            if score >= threshold:
+                pairs.append((company_id, other_id, score))
+    return pairs
+
+
+class CompanyDeduplicator:
+    """
+    Finds and merges duplicate companies.
+
+    1. Re-normalize every company name with EntityResolutionService (rows
+       written by Database.insert_company were only lowercased).
+    2. Block candidates with the resolution index and score them with
+       name_similarity across worker processes.
+    3. Union-find the matched pairs into clusters. The canonical company of a
+       cluster is the one with the most leads (oldest on ties); only members
+       that match the canonical name themselves are merged into it, the rest
+       are clustered again the same way (A~B and B~C doesn't merge A and C
+       unless A~C).
+    4. Repoint leads.company_id, aliases and cached resolutions, and delete
+       merged companies in chunked transactions, recording every merge in
+       `company_merges`.
+    5. Repoint leads that scrapers attached to merged ids from a stale
+       in-process resolution cache after an earlier run.
+    """
+
+    CHUNK_SIZE = 2000
+
+    def __init__(self, db, threshold: float = None, workers: int = None):
+        self.db = db
+        self.threshold = EntityResolutionService.MATCH_THRESHOLD if threshold is None else threshold
+        self.workers = workers or os.cpu_count() or 1
+
+    def _pool(self):
+        """Fork-based worker pool (the index is inherited, not pickled) where available"""
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        return ctx.Pool(self.workers, initializer=_init_worker, initargs=(self._index, self.threshold))
+
+    def _chunks(self, items: List) -> List[List]:
+        return [items[i:i + self.CHUNK_SIZE] for i in range(0, len(items), self.CHUNK_SIZE)]
+
+    def load(self) -> List[Dict[str, Any]]:
+        conn = self.db.get_connection()
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+        c.execute('''
+            SELECT c.id, c.name, c.normalized_name, COUNT(l.id) AS lead_count
+            FROM companies c
+            LEFT JOIN leads l ON l.company_id = c.id
+            GROUP BY c.id
+            ORDER BY c.id
+        ''')
+        rows = [dict(row) for row in c.fetchall()]
+        conn.close()
+        return rows
+
+    def plan(self) -> Dict[str, Any]:
+        """Work out normalization updates and merges without changing anything"""
+        companies = self.load()
+        names = [row['name'] or '' for row in companies]
+
+        if self.workers > 1 and len(companies) > self.CHUNK_SIZE:
+            with multiprocessing.Pool(self.workers) as pool:
+                normalized = [n for chunk in pool.map(_normalize_chunk, self._chunks(names)) for n in chunk]
+        else:
+            normalized = _normalize_chunk(names)
+
+        renormalized = []
+        for row, norm in zip(companies, normalized):
+            if norm and norm != row['normalized_name']:
+                renormalized.append((norm, row['id']))
+            row['normalized_name'] = norm or row['normalized_name']
+
+        self._index = CompanyResolutionIndex((row['id'], row['normalized_name']) for row in companies)
+        uf = UnionFind()
+
+        # Identical normalized names are duplicates outright
+        by_name: Dict[str, int] = {}
+        for row in companies:
+            norm = row['normalized_name']
+            if not norm:
+                continue
+            if norm in by_name:
+                uf.union(by_name[norm], row['id'])
+            else:
+                by_name[norm] = row['id']
+
+        # Fuzzy pairs, one representative per distinct name
+        ids = sorted(by_name.values())
+        if self.workers > 1 and len(ids) > self.CHUNK_SIZE:
+            with self._pool() as pool:
+                chunks = pool.map(_match_chunk, self._chunks(ids))
+        else:
+            _init_worker(self._index, self.threshold)
+            chunks = [_match_chunk(ids)]
+
+        for pairs in chunks:
+            for a, b, _ in pairs:
+                uf.union(a, b)
+
+        by_id = {row['id']: row for row in companies}
+        merges = []
+        clusters = 0
+        for members in uf.groups():
+            for canonical, matched in self._split(members, by_id):
+                clusters += 1
+                for member, score in matched:
+                    merges.append({
+                        'merged_id': member,
+                        'merged_name': by_id[member]['name'],
+                        'canonical_id': canonical,
+                        'canonical_name': by_id[canonical]['name'],
+                        'score': round(score, 4),
+                        'leads_moved': by_id[member]['lead_count']
+                    })
+
+        return {
+            'companies': len(companies),
+            'renormalized': renormalized,
+            'clusters': clusters,
+            'merges': merges
+        }
+
+    def _split(self, members: List[int], by_id: Dict[int, Dict[str, Any]]) -> List[Tuple[int, List[Tuple[int, float]]]]:
+        """
+        Split a union-find cluster into (canonical, [(member, score)]) groups
+        in which every member matches the canonical name, taking canonicals
+        in order of lead count.
+        """
+        remaining = sorted(members, key=lambda cid: (-by_id[cid]['lead_count'], cid))
+        groups = []
+        while len(remaining) > 1:
+            canonical, rest = remaining[0], remaining[1:]
+            name = by_id[canonical]['normalized_name']
+            matched, remaining = [], []
+            for member in rest:
+                score = name_similarity(name, by_id[member]['normalized_name'])
+                if score >= self.threshold:
+                    matched.append((member, score))
+                else:
+                    remaining.append(member)
+            if matched:
+                groups.append((canonical, matched))
+        return groups
+
+    def apply(self, plan: Dict[str, Any], run_id: str = None) -> str:
+        """Write a plan to the database in chunked transactions; returns the run id"""
+        run_id = run_id or datetime.now().strftime('%Y%m%d%H%M%S') + '-' + uuid.uuid4().hex[:6]
+        now = datetime.now().isoformat()
+        conn = self.db.get_connection()
+        c = conn.cursor()
+
+        try:
+            for chunk in self._chunks(plan['renormalized']):
+                c.execute('BEGIN IMMEDIATE')
+                c.executemany('UPDATE companies SET normalized_name = ? WHERE id = ?', chunk)
+                conn.commit()
+
+            c.execute('CREATE TEMP TABLE IF NOT EXISTS merge_map (merged_id INTEGER PRIMARY KEY, canonical_id INTEGER)')
+            for chunk in self._chunks(plan['merges']):
+                c.execute('BEGIN IMMEDIATE')
+                c.execute('DELETE FROM merge_map')
+                c.executemany('INSERT INTO merge_map (merged_id, canonical_id) VALUES (?, ?)',
+                              [(m['merged_id'], m['canonical_id']) for m in chunk])
+
+                # Repoint leads and aliases in one statement each per chunk
+                c.execute('''UPDATE leads
+                             SET company_id = (SELECT canonical_id FROM merge_map WHERE merged_id = leads.company_id)
+                             WHERE company_id IN (SELECT merged_id FROM merge_map)''')
+
+                c.execute('''UPDATE company_aliases
+                             SET company_id = (SELECT canonical_id FROM merge_map WHERE merged_id = company_aliases.company_id)
+                             WHERE company_id IN (SELECT merged_id FROM merge_map)''')
+
+                c.execute('''UPDATE company_resolution_cache
+                             SET company_id = (SELECT canonical_id FROM merge_map WHERE merged_id = company_resolution_cache.company_id)
+                             WHERE company_id IN (SELECT merged_id FROM merge_map)''')
+
+                # Keep details only the merged record had
+                c.execute('''UPDATE companies
+                             SET industry = COALESCE(industry, (SELECT MAX(m.industry) FROM companies m
+                                     JOIN merge_map mm ON mm.merged_id = m.id WHERE mm.canonical_id = companies.id)),
+                                 location = COALESCE(location, (SELECT MAX(m.location) FROM companies m
+                                     JOIN merge_map mm ON mm.merged_id = m.id WHERE mm.canonical_id = companies.id)),
+                                 website = COALESCE(website, (SELECT MAX(m.website) FROM companies m
+                                     JOIN merge_map mm ON mm.merged_id = m.id WHERE mm.canonical_id = companies.id))
+                             WHERE id IN (SELECT canonical_id FROM merge_map)''')
+
+                c.executemany('''INSERT INTO company_merges
+                                 (run_id, merged_id, merged_name, canonical_id, canonical_name, score, leads_moved, merged_at)
+                                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                              [(run_id, m['merged_id'], m['merged_name'], m['canonical_id'], m['canonical_name'],
+                                m['score'], m['leads_moved'], now) for m in chunk])
+                c.execute('DELETE FROM companies WHERE id IN (SELECT merged_id FROM merge_map)')
+                conn.commit()
+
+            # Follow merge chains (a -> b, later b -> c) one hop per pass
+            for _ in range(10):
+                c.execute('BEGIN IMMEDIATE')
+                c.execute('''UPDATE leads
+                             SET company_id = (SELECT canonical_id FROM company_merges m
+                                               WHERE m.merged_id = leads.company_id ORDER BY m.id DESC LIMIT 1)
+                             WHERE company_id IN (SELECT merged_id FROM company_merges)
+                               AND company_id NOT IN (SELECT id FROM companies)''')
+                repointed = c.rowcount
+                conn.commit()
+                if not repointed:
+                    break
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        # Resolution indexes in other processes still hold the merged ids
+        self.db.bump_cache_version('companies')
+        return run_id
@@ -0,0 +1,186 @@
+"""
+Email Channel
+SMTP delivery for lead alerts over a small pool of persistent connections.
+"""
+
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from functools import lru_cache
+from string import Template
+from typing import Dict, Any, List, Tuple, Optional
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` logged-in SMTP connections open and hands them out one
+    at a time, so a batch of alerts costs one login instead of one per message.
+    """
+
+    # Probe idle connections with NOOP before reuse; servers drop idle sessions
+    IDLE_CHECK_SECONDS = 30
+
+    def __init__(self, host: str, port: int, user: str = None, password: str = None,
+                 use_tls: bool = True, size: int = 2, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self.logins = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            conn.starttls()
+        if self.user:
+            conn.login(self.user, self.password)
+        self.logins += 1
+        return conn
+
+    def _checkout(self) -> smtplib.SMTP:
+        with self._lock:
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                if time.monotonic() - last_used < self.IDLE_CHECK_SECONDS:
+                    return conn
+                try:
+                    if conn.noop()[0] == 250:
+                        return conn
+                except smtplib.SMTPException:
+                    pass
+                except OSError:
+                    pass
+                self._discard(conn)
+        return self._connect()
+
+    @staticmethod
+    def _discard(conn: smtplib.SMTP):
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; one left in an unknown state by an error is dropped instead of returned"""
+        with self._slots:
+            conn = self._checkout()
+            try:
+                yield conn
+            except BaseException:
+                self._discard(conn)
+                raise
+            else:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+
+
+class EmailChannel:
+    """
+    Renders lead alerts/digests and sends them in batches over the pool.
+    """
+
+    SUBJECT = Template("New lead: $company_name ($confidence)")
+    DIGEST_SUBJECT = Template("$count new leads for you")
+    LEAD_LINE = Template("• $company_name — confidence $confidence, $signal_type (lead #$lead_id)")
+    BODY = Template(
+        "Hello,\n\n"
+        "HP-Pulse has new lead intelligence for you:\n\n"
+        "$lines\n\n"
+        "Review them in the Lead Intelligence dashboard.\n"
+    )
+
+    def __init__(self, pool: SMTPConnectionPool, sender: str):
+        self.pool = pool
+        self.sender = sender
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _render_line(lead_id, company_name, confidence, signal_type) -> str:
+        # Cached so a lead fanned out to many officers is rendered once
+        return EmailChannel.LEAD_LINE.substitute(
+            lead_id=lead_id, company_name=company_name,
+            confidence=confidence, signal_type=signal_type
+        )
+
+    def render(self, leads: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """Render (subject, body) for one alert or a digest of several"""
+        lines = [
+            self._render_line(
+                lead.get('lead_id'),
+                lead.get('company_name', 'Unknown Company'),
+                str(lead.get('confidence', 0.0)),
+                lead.get('signal_type', 'General')
+            )
+            for lead in leads
+        ]
+        if len(leads) == 1:
+            subject = self.SUBJECT.substitute(
+                company_name=leads[0].get('company_name', 'Unknown Company'),
+                confidence=leads[0].get('confidence', 0.0)
+            )
+        else:
+            subject = self.DIGEST_SUBJECT.substitute(count=len(leads))
+        return subject, self.BODY.substitute(lines='\n'.join(lines))
+
+    def build_message(self, recipient: str, leads: List[Dict[str, Any]]) -> EmailMessage:
+        subject, body = self.render(leads)
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = recipient
+        message['Subject'] = subject
+        message.set_content(body)
+        return message
+
+    def send_batch(self, deliveries: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Optional[str]]:
+        """
+        Send one message per (recipient, leads) pair over a single pooled
+        connection. Returns an error string per delivery (None = sent).
+
+        A message the server rejects fails on its own; if the connection
+        breaks, the unsent messages are retried once on a fresh one.
+        """
+        errors: List[Optional[str]] = [None] * len(deliveries)
+        pending = list(range(len(deliveries)))
+        connection_error = None
+
+        # One reconnect if the server drops the session mid-batch
+        for _ in range(2):
+            if not pending:
+                break
+            try:
+                with self.pool.connection() as conn:
+                    while pending:
+                        i = pending[0]
+                        recipient, leads = deliveries[i]
+                        try:
+                            conn.send_message(self.build_message(recipient, leads))
+                            errors[i] = None
+                        except smtplib.SMTPRecipientsRefused as e:
+                            errors[i] = f"recipient refused: {e.recipients}"
+                        except smtplib.SMTPResponseException as e:
+                            if e.smtp_code == 421:
+                                raise  # Service closing the channel: the rest go on a new connection
+                            errors[i] = str(e)
+                        pending.pop(0)
+            except (smtplib.SMTPException, OSError) as e:
+                connection_error = str(e)
+
+        for i in pending:
+            errors[i] = connection_error
+        return errors
+
+    def close(self):
+        self.pool.close()
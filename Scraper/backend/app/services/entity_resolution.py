@@ -3,26 +3,25 @@ Entity Resolution Service
 Handles company name normalization, fuzzy matching, and deduplication.
 """
 
-import re
-from typing import Optional, Tuple, List
+import os
+from typing import Optional, Tuple, List, Dict, Any
+
+from .name_normalizer import LEGAL_SUFFIXES, normalize_name, normalize_many
+from .similarity import name_similarity
 
 class EntityResolutionService:
     """
     Service for resolving company entities and deduplication.
     """
     
-    # Common legal suffixes to remove for normalization
-    LEGAL_SUFFIXES = [
-        r'\bPvt\.? Ltd\.?', r'\bPrivate Limited\b',
-        r'\bLtd\.?\b', r'\bLimited\b',
-        r'\bCorp\.?\b', r'\bCorporation\b',
-        r'\bInc\.?\b', r'\bIncorporated\b',
-        r'\bLLC\b', r'\bLLP\b',
-        r'\bCo\.?\b', r'\bCompany\b',
-        r'\bInds\.?\b', r'\bIndustries\b',
-        r'\bEnt\.?\b', r'\bEnterprises\b',
-        r'\bGroup\b', r'\bHoldings\b'
-    ]
+    # Common legal suffixes removed by normalization (see name_normalizer.py)
+    LEGAL_SUFFIXES = LEGAL_SUFFIXES
+    
+    # Minimum name_similarity for a fuzzy match to count as the same company
+    MATCH_THRESHOLD = float(os.getenv("ENTITY_MATCH_THRESHOLD", "0.88"))
+    # Blocked candidates scored per name, and the score that ends the search early
+    CANDIDATE_LIMIT = 10
+    SURE_MATCH = 0.97
     
     @classmethod
     def normalize_name(cls, name: str) -> str:
@@ -33,75 +32,120 @@ class EntityResolutionService:
         3. Remove special characters
         4. Trim whitespace
         """
-        if not name:
-            return ""
-            
-        normalized = name.lower()
-        
-        # Remove suffixes
-        for suffix in cls.LEGAL_SUFFIXES:
-            normalized = re.sub(suffix, '', normalized, flags=re.IGNORECASE)
-            
-        # Remove special chars and extra whitespace
-        normalized = re.sub(r'[^a-z0-9\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return normalize_name(name)
+
+    @classmethod
+    def normalize_many(cls, names: List[str]) -> List[str]:
+        """Normalize a batch of names (memoized, repeats done once)"""
+        return normalize_many(names)
 
     @classmethod
     def resolve_company(cls, db_instance, name: str, industry: Optional[str] = None, 
                        location: Optional[str] = None) -> int:
         """
         Find existing company or create new one.
+        Names seen before (by any scraper process) come straight from the
+        resolution cache; the rest go through the database's resident
+        CompanyResolutionIndex rather than scanning the companies table.
         Returns company_id.
         """
+        cache = db_instance.get_resolution_cache()
+        company_id = cache.get(name)
+        if company_id is not None:
+            return company_id
+        
+        company_id = cls._resolve_uncached(db_instance, name, industry, location)
+        cache.put(name, company_id)
+        return company_id
+
+    @classmethod
+    def _resolve_uncached(cls, db_instance, name: str, industry: Optional[str],
+                          location: Optional[str]) -> int:
         normalized_name = cls.normalize_name(name)
         
-        # 1. Try exact match on normalized name
-        conn = db_instance.get_connection()
-        c = conn.cursor()
+        # 0. Known acronym/alias (company_aliases) maps straight to its canonical company
+        gazetteer = db_instance.get_gazetteer()
+        company_id = gazetteer.lookup(name) or gazetteer.lookup(normalized_name)
+        if company_id is not None:
+            return company_id
         
-        c.execute("SELECT id, name FROM companies WHERE normalized_name = ?", (normalized_name,))
-        result = c.fetchone()
+        index = db_instance.get_company_index()
         
-        if result:
-            conn.close()
-            return result[0]
+        # 1. Try exact match on normalized name
+        company_id = index.lookup_exact(normalized_name)
+        if company_id is not None:
+            return company_id
             
-        # 2. Try fuzzy match (simple implementation for now: name contains or contained by)
-        c.execute("SELECT id, name, normalized_name FROM companies")
-        all_companies = c.fetchall()
-        
-        for comp_id, comp_name, comp_norm in all_companies:
-            if not comp_norm:
-                continue
-                
-            # Check if one is substring of other (with length check)
-            if (normalized_name in comp_norm and len(normalized_name) > 4) or \
-               (comp_norm in normalized_name and len(comp_norm) > 4):
-                
-                conn.close()
-                return comp_id
-        
-        conn.close()
+        # 2. Try fuzzy match against blocked candidates
+        company_id, _ = cls.find_match(index, normalized_name)
+        if company_id is not None:
+            return company_id
         
         # 3. If no match, create new company
         print(f"   ✨ New Entity: {name} (Norm: {normalized_name})")
-        return db_instance.insert_company(name, industry, location)
+        return db_instance.insert_company(name, industry, location, normalized_name=normalized_name)
+
+    @classmethod
+    def find_match(cls, index, normalized_name: str,
+                   threshold: float = None) -> Tuple[Optional[int], float]:
+        """
+        Best fuzzy match for a normalized name among the index's blocked
+        candidates. Returns (company_id, score), or (None, best score) when no
+        candidate reaches the threshold.
+        """
+        threshold = cls.MATCH_THRESHOLD if threshold is None else threshold
+        if not normalized_name:
+            return None, 0.0
+        
+        best_id, best_score = None, 0.0
+        for company_id in index.candidates(normalized_name, limit=cls.CANDIDATE_LIMIT):
+            score = name_similarity(normalized_name, index.names[company_id])
+            if score > best_score:
+                best_id, best_score = company_id, score
+                if score >= cls.SURE_MATCH:
+                    break  # Candidates come best-blocked first; this one won't be beaten meaningfully
+        
+        if best_score >= threshold:
+            return best_id, best_score
+        return None, best_score
+
+    @classmethod
+    def match_many(cls, db_instance, names: List[str],
+                   threshold: float = None) -> List[Dict[str, Any]]:
+        """
+        Resolve a batch of names against existing companies without creating
+        any. Each name is normalized and matched once, however often it repeats.
+        Returns [{'name', 'normalized_name', 'company_id', 'score'}] in input order.
+        """
+        index = db_instance.get_company_index()
+        resolved = {}
+        results = []
+        
+        for name, normalized_name in zip(names, cls.normalize_many(names)):
+            if normalized_name not in resolved:
+                company_id = index.lookup_exact(normalized_name)
+                if company_id is not None:
+                    resolved[normalized_name] = (company_id, 1.0)
+                else:
+                    resolved[normalized_name] = cls.find_match(index, normalized_name, threshold)
+            
+            company_id, score = resolved[normalized_name]
+            results.append({
+                'name': name,
+                'normalized_name': normalized_name,
+                'company_id': company_id,
+                'score': round(score, 4)
+            })
+        
+        return results
 
     @staticmethod
     def calculate_similarity(s1: str, s2: str) -> float:
         """
-        Calculate simple similarity ratio (0-1)
-        Note: Python's difflib could be used here for better results
+        Calculate similarity ratio (0-1) between two company names
+        (token similarity blended with Jaro-Winkler, see similarity.py)
         """
         if not s1 or not s2:
             return 0.0
             
-        s1 = s1.lower()
-        s2 = s2.lower()
-        
-        if s1 == s2:
-            return 1.0
-            
-        return 0.0 # Placeholder for more complex logic
+        return name_similarity(s1.lower(), s2.lower())
@@ -0,0 +1,252 @@
+"""
+Entity Gazetteer
+Finds known company names, acronyms and aliases in text in a single pass
+(Aho-Corasick) and maps each mention to its canonical company.
+"""
+
+import re
+from typing import Dict, Any, List, Tuple, Iterable, Optional
+
+try:
+    import ahocorasick as _pyahocorasick
+except ImportError:  # Optional C automaton for very large gazetteers
+    _pyahocorasick = None
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over lowercase keys.
+
+    Uses pyahocorasick when installed; otherwise a pure-Python automaton whose
+    transitions live in one flat dict keyed by state << 21 | codepoint, which
+    is far smaller than one dict (or tuple key) per trie node.
+    """
+
+    def __init__(self):
+        self._values: List[Any] = []
+        self._keys: List[str] = []
+        if _pyahocorasick is not None:
+            self._native = _pyahocorasick.Automaton()
+        else:
+            self._native = None
+            self._goto: Dict[int, int] = {}
+            self._fail: List[int] = [0]
+            self._out: List[Optional[int]] = [None]   # pattern ending exactly here
+            self._out_link: List[int] = [0]           # nearest suffix state with an output
+
+    def add(self, key: str, value: Any):
+        """Add a (lowercase) key; call build() once all keys are added"""
+        pattern_id = len(self._values)
+        self._values.append(value)
+        self._keys.append(key)
+
+        if self._native is not None:
+            self._native.add_word(key, (len(key), value))
+            return
+
+        state = 0
+        for ch in key:
+            nxt = self._goto.get(state << 21 | ord(ch))
+            if nxt is None:
+                nxt = len(self._fail)
+                self._goto[state << 21 | ord(ch)] = nxt
+                self._fail.append(0)
+                self._out.append(None)
+                self._out_link.append(0)
+            state = nxt
+        self._out[state] = pattern_id
+
+    def build(self):
+        if self._native is not None:
+            if self._values:
+                self._native.make_automaton()
+            return
+
+        # Children per state, to walk the trie breadth-first
+        children: Dict[int, List[Tuple[int, int]]] = {}
+        for edge, nxt in self._goto.items():
+            children.setdefault(edge >> 21, []).append((edge & 0x1FFFFF, nxt))
+
+        queue = [nxt for _, nxt in children.get(0, [])]
+        for state in queue:
+            for ch, nxt in children.get(state, []):
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and (f << 21 | ch) not in self._goto:
+                    f = self._fail[f]
+                fail = self._goto.get(f << 21 | ch, 0)
+                self._fail[nxt] = fail if fail != nxt else 0
+                self._out_link[nxt] = fail if self._out[fail] is not None else self._out_link[fail]
+
+    def iter(self, text: str) -> Iterable[Tuple[int, int, Any]]:
+        """Yield (start, end, value) for every key occurrence; `end` is exclusive"""
+        keys, values = self._keys, self._values
+
+        if self._native is not None:
+            if not values:
+                return
+            for end, (length, value) in self._native.iter(text):
+                yield end + 1 - length, end + 1, value
+            return
+
+        goto, fail, out, out_link = self._goto, self._fail, self._out, self._out_link
+        state = 0
+        for i, ch in enumerate(map(ord, text)):
+            while state and (state << 21 | ch) not in goto:
+                state = fail[state]
+            state = goto.get(state << 21 | ch, 0)
+
+            s = state if out[state] is not None else out_link[state]
+            while s:
+                pattern_id = out[s]
+                yield i + 1 - len(keys[pattern_id]), i + 1, values[pattern_id]
+                s = out_link[s]
+
+    def find_all(self, text: str) -> List[Tuple[int, Any]]:
+        """(start, value) for every key occurrence, as a list; cheaper than iter() per hit"""
+        if self._native is not None:
+            if not self._values:
+                return []
+            return [(end + 1 - length, value) for end, (length, value) in self._native.iter(text)]
+        return [(start, value) for start, _, value in self.iter(text)]
+
+    def __len__(self):
+        return len(self._values)
+
+
+class EntityGazetteer:
+    """
+    Maps alias mentions in free text to canonical company ids.
+
+    Aliases are matched case-insensitively on word boundaries, except short
+    all-caps acronyms (HUL, ITC, NRL...), which must appear in capitals so
+    ordinary words don't trigger them. Overlapping mentions resolve to the
+    leftmost-longest one ("Indian Oil Corporation" beats "Indian Oil").
+    """
+
+    ACRONYM_MAX_LENGTH = 5
+
+    def __init__(self, aliases: Iterable[Dict[str, Any]] = ()):
+        self.automaton = AhoCorasick()
+        self.exact: Dict[str, tuple] = {}
+        for row in aliases:
+            self.add(row['alias'], row['company_id'], row.get('canonical_name'), row.get('case_sensitive'))
+        self.automaton.build()
+
+    @staticmethod
+    def alias_key(alias: str) -> str:
+        """Lookup key for an alias: lowercase, single-spaced"""
+        return re.sub(r'\s+', ' ', alias).strip().lower()
+
+    @classmethod
+    def is_acronym(cls, alias: str) -> bool:
+        alias = alias.strip()
+        return alias.isupper() and ' ' not in alias and len(alias) <= cls.ACRONYM_MAX_LENGTH
+
+    def add(self, alias: str, company_id: int, canonical_name: str = None, case_sensitive: bool = None):
+        if case_sensitive is None:
+            case_sensitive = self.is_acronym(alias)
+        key = self.alias_key(alias)
+        if key:
+            value = (company_id, alias.strip(), canonical_name, bool(case_sensitive))
+            self.automaton.add(key, value)
+            self.exact.setdefault(key, value)
+
+    def lookup(self, name: str) -> Optional[int]:
+        """
+        Canonical id when the whole of `name` is a known alias ("IOCL",
+        "Hindustan Petroleum"). Case never matters here: a field holding only
+        "hpcl" is unambiguous, unlike "itc" inside running text.
+        """
+        if not name:
+            return None
+        entry = self.exact.get(self.alias_key(name))
+        return entry[0] if entry else None
+
+    def find(self, text: str) -> List[Dict[str, Any]]:
+        """All company mentions in `text`, in order of appearance"""
+        if not text or not len(self.automaton):
+            return []
+
+        original = re.sub(r'\s+', ' ', text)
+        lowered = original.lower()
+        if len(lowered) != len(original):
+            # A few non-ASCII characters change length when lowercased
+            lowered = ''.join(ch.lower()[:1] or ch for ch in original)
+
+        matches = []
+        n = len(original)
+        for start, end, (company_id, alias, canonical_name, case_sensitive) in self.automaton.iter(lowered):
+            # Word boundaries on both sides
+            if start > 0 and original[start - 1].isalnum():
+                continue
+            if end < n and original[end].isalnum():
+                continue
+            if case_sensitive and original[start:end] != alias:
+                continue
+            matches.append((start, end, company_id, alias, canonical_name))
+
+        # Leftmost-longest, non-overlapping
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        mentions = []
+        last_end = -1
+        for start, end, company_id, alias, canonical_name in matches:
+            if start < last_end:
+                continue
+            mentions.append({
+                'company_id': company_id,
+                'canonical_name': canonical_name,
+                'alias': alias,
+                'text': original[start:end],
+                'start': start,
+                'end': end
+            })
+            last_end = end
+        return mentions
+
+    def resolve(self, text: str) -> Optional[int]:
+        """Canonical id of the first known company mentioned in `text`"""
+        mentions = self.find(text)
+        return mentions[0]['company_id'] if mentions else None
+
+    def __len__(self):
+        return len(self.automaton)
+
+
+# Canonical names and their acronyms / alternate spellings, seeded into
+# company_aliases by backend/scripts/seed_data.py
+DEFAULT_ALIASES = {
+    'Indian Oil Corporation Limited': ['IOCL', 'IOC', 'Indian Oil', 'IndianOil', 'Indian Oil Corporation'],
+    'Hindustan Petroleum Corporation Limited': ['HPCL', 'Hindustan Petroleum', 'Hindustan Petroleum Corp'],
+    'Bharat Petroleum Corporation Limited': ['BPCL', 'Bharat Petroleum', 'Bharat Petroleum Corp'],
+    'Oil and Natural Gas Corporation': ['ONGC', 'Oil & Natural Gas Corporation', 'Oil and Natural Gas Corp'],
+    'GAIL (India) Limited': ['GAIL', 'Gas Authority of India', 'GAIL India'],
+    'Oil India Limited': ['Oil India'],
+    'Mangalore Refinery and Petrochemicals Limited': ['MRPL', 'Mangalore Refinery'],
+    'Chennai Petroleum Corporation Limited': ['CPCL', 'Chennai Petroleum'],
+    'Numaligarh Refinery Limited': ['NRL', 'Numaligarh Refinery'],
+    'Petronet LNG Limited': ['Petronet', 'Petronet LNG'],
+    'Reliance Industries Limited': ['RIL', 'Reliance Industries'],
+    'Larsen & Toubro Limited': ['L&T', 'Larsen & Toubro', 'Larsen and Toubro', 'LnT'],
+    'Tata Consultancy Services Limited': ['TCS', 'Tata Consultancy Services'],
+    'Tata Steel Limited': ['Tata Steel'],
+    'Tata Power Company Limited': ['Tata Power'],
+    'Adani Enterprises Limited': ['Adani Enterprises'],
+    'Vedanta Limited': ['Vedanta'],
+    'Essar Oil Limited': ['Essar Oil', 'Nayara Energy'],
+    'Jindal Steel & Power Limited': ['JSPL', 'Jindal Steel', 'Jindal Steel and Power'],
+    'JSW Steel Limited': ['JSW Steel'],
+    'Mahindra & Mahindra Limited': ['M&M', 'Mahindra & Mahindra', 'Mahindra and Mahindra'],
+    'Tech Mahindra Limited': ['Tech Mahindra'],
+    'Wipro Limited': ['Wipro'],
+    'Infosys Limited': ['Infosys'],
+    'HCL Technologies Limited': ['HCL', 'HCL Technologies', 'HCLTech'],
+    'ITC Limited': ['ITC'],
+    'Hindustan Unilever Limited': ['HUL', 'Hindustan Unilever'],
+    'Nestle India Limited': ['Nestle India', 'Nestle'],
+    'Britannia Industries Limited': ['Britannia', 'Britannia Industries'],
+    'Dabur India Limited': ['Dabur', 'Dabur India'],
+    'UltraTech Cement Limited': ['UltraTech', 'UltraTech Cement'],
+    'Ambuja Cements Limited': ['Ambuja', 'Ambuja Cements'],
+    'ICRA Limited': ['ICRA'],
+}
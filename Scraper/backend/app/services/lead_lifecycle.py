@@ -0,0 +1,172 @@
+"""
+Lead Lifecycle
+Expires leads that can no longer be acted on: tenders past their closing
+date, and other signals once they are older than their type's TTL. Expired
+leads drop out of the working set (list queries, dashboard buckets, pending
+notifications) but stay in the database for history.
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+class LeadLifecycle:
+    """
+    Every lead gets an `expires_at` when stored: a tender's parsed closing
+    time (a date-only closing date lasts the whole day), otherwise
+    scraped_at plus the TTL for its signal type. `sweep` moves open leads
+    past their expiry to EXPIRED in BATCH_SIZE batches, one short
+    transaction each, and cancels their undelivered notifications. When the
+    TTL settings change, the next sweep recomputes the TTL-based expiry of
+    stored open leads before expiring any.
+
+    Only leads nobody has acted on expire; accepted, qualified, rejected and
+    converted leads keep their status.
+    """
+
+    EXPIRED = 'EXPIRED'
+    OPEN_STATUSES = ('NEW', 'REVIEW_REQUIRED', 'AUTO_ASSIGNED')
+
+    TTL_DAYS = {
+        'tender': int(os.getenv("LEAD_TTL_DAYS_TENDER", "30")),
+        'news': int(os.getenv("LEAD_TTL_DAYS_NEWS", "60")),
+        'directory': int(os.getenv("LEAD_TTL_DAYS_DIRECTORY", "180")),
+    }
+    DEFAULT_TTL_DAYS = int(os.getenv("LEAD_TTL_DAYS_DEFAULT", "90"))
+    BATCH_SIZE = int(os.getenv("LEAD_EXPIRY_BATCH_SIZE", "1000"))
+
+    @classmethod
+    def expires_at_sql(cls, row: str) -> str:
+        """SQL expression for the expires_at of `row` (NEW in triggers, the table name in updates)"""
+        ttl_cases = ' '.join(f"WHEN '{signal_type}' THEN {days}" for signal_type, days in cls.TTL_DAYS.items())
+        return f"""CASE
+            WHEN {row}.tender_closing_at IS NOT NULL AND length({row}.tender_closing_at) = 10 THEN
+                date({row}.tender_closing_at, '+1 day') || 'T00:00:00'
+            WHEN {row}.tender_closing_at IS NOT NULL THEN {row}.tender_closing_at
+            ELSE strftime('%Y-%m-%dT%H:%M:%S', {row}.scraped_at,
+                          '+' || (CASE lower({row}.signal_type) {ttl_cases} ELSE {cls.DEFAULT_TTL_DAYS} END) || ' days')
+        END"""
+
+    @classmethod
+    def install_trigger(cls, conn) -> bool:
+        """
+        (Re)create the trigger that sets expires_at on insert if its SQL no
+        longer matches the TTL settings; returns whether it was replaced
+        """
+        sql = f'''CREATE TRIGGER leads_expires_at AFTER INSERT ON leads
+                 WHEN NEW.expires_at IS NULL
+                 BEGIN
+                     UPDATE leads SET expires_at = {cls.expires_at_sql('NEW')} WHERE id = NEW.id;
+                 END'''
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'leads_expires_at'"
+                           ).fetchone()
+        if row and row[0] == sql:
+            return False
+        conn.execute('DROP TRIGGER IF EXISTS leads_expires_at')
+        conn.execute(sql)
+        return True
+
+    @classmethod
+    def _fill_expiry(cls, conn, now: str, batch_size: int) -> int:
+        """
+        Compute expires_at where it is missing (leads whose tender fields were
+        just reprocessed). An expired lead whose new expiry is in the future
+        goes back to review.
+        """
+        filled = last_id = 0
+        while True:
+            ids = [row[0] for row in conn.execute(
+                'SELECT id FROM leads WHERE expires_at IS NULL AND id > ? ORDER BY id LIMIT ?',
+                (last_id, batch_size)
+            ).fetchall()]
+            if not ids:
+                return filled
+            last_id = ids[-1]
+            marks = ','.join('?' * len(ids))
+            conn.execute(f'UPDATE leads SET expires_at = {cls.expires_at_sql("leads")} WHERE id IN ({marks})', ids)
+            conn.execute(f'''UPDATE leads SET status = 'REVIEW_REQUIRED', expired_at = NULL
+                             WHERE id IN ({marks}) AND status = ? AND expires_at > ?''',
+                         [*ids, cls.EXPIRED, now])
+            conn.commit()
+            filled += len(ids)
+
+    @classmethod
+    def _refresh_expiry(cls, conn, batch_size: int) -> int:
+        """
+        Recompute expires_at of open leads whose expiry comes from a TTL (no
+        tender closing date), after the TTL settings changed
+        """
+        refreshed = last_id = 0
+        open_marks = ','.join('?' * len(cls.OPEN_STATUSES))
+        while True:
+            ids = [row[0] for row in conn.execute(f'''
+                SELECT id FROM leads
+                WHERE id > ? AND tender_closing_at IS NULL AND status IN ({open_marks})
+                ORDER BY id LIMIT ?
+            ''', (last_id, *cls.OPEN_STATUSES, batch_size)).fetchall()]
+            if not ids:
+                return refreshed
+            last_id = ids[-1]
+            marks = ','.join('?' * len(ids))
+            conn.execute(f'UPDATE leads SET expires_at = {cls.expires_at_sql("leads")} WHERE id IN ({marks})', ids)
+            conn.commit()
+            refreshed += len(ids)
+
+    @classmethod
+    def _expire_batch(cls, conn, now: str, batch_size: int) -> List[int]:
+        open_marks = ','.join('?' * len(cls.OPEN_STATUSES))
+        # `status != 'EXPIRED'` makes the partial expires_at index usable; the
+        # unary + keeps the planner off the (much larger) status index
+        ids = [row[0] for row in conn.execute(f'''
+            SELECT id FROM leads
+            WHERE status != 'EXPIRED' AND expires_at <= ? AND +status IN ({open_marks})
+            LIMIT ?
+        ''', (now, *cls.OPEN_STATUSES, batch_size)).fetchall()]
+        if not ids:
+            return ids
+
+        marks = ','.join('?' * len(ids))
+        conn.execute(f'UPDATE leads SET status = ?, expired_at = ? WHERE id IN ({marks})',
+                     [cls.EXPIRED, now, *ids])
+        conn.execute(f'''UPDATE notification_outbox SET status = 'DEAD', last_error = 'lead expired'
+                         WHERE status = 'PENDING' AND lead_id IN ({marks})''', ids)
+        conn.commit()
+        return ids
+
+    @classmethod
+    def sweep(cls, db, batch_size: int = None, pause: float = 0.0, now: datetime = None) -> Dict[str, Any]:
+        """Expire every open lead past its expiry; returns counts"""
+        batch_size = batch_size or cls.BATCH_SIZE
+        now_iso = (now or datetime.now()).isoformat(timespec='seconds')
+        start = time.perf_counter()
+
+        conn = db.get_connection()
+        try:
+            # TTL settings changed since the trigger was created: new leads get
+            # the new TTL, and so do the open ones already stored
+            refreshed = 0
+            if cls.install_trigger(conn):
+                conn.commit()
+                refreshed = cls._refresh_expiry(conn, batch_size)
+            filled = cls._fill_expiry(conn, now_iso, batch_size)
+            expired = batches = 0
+            while True:
+                ids = cls._expire_batch(conn, now_iso, batch_size)
+                if not ids:
+                    break
+                expired += len(ids)
+                batches += 1
+                if pause:
+                    time.sleep(pause)
+        finally:
+            conn.close()
+
+        return {
+            'expired': expired,
+            'batches': batches,
+            'expiry_filled': filled,
+            'expiry_refreshed': refreshed,
+            'seconds': round(time.perf_counter() - start, 3)
+        }
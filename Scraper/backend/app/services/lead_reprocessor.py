@@ -0,0 +1,269 @@
+"""
+Lead Reprocessing
+Offline job that re-runs product inference and scoring over stored leads,
+so rule or weight changes reach existing leads, not just new ones.
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .product_inference import ProductInferenceService
+from .product_rules import CompiledProductRules
+from .scoring_engine import ScoringEngine
+from .location_extractor import location_extractor
+from .territory_router import TerritoryRouter
+from utils.tender_parser import TenderParser
+
+_worker_rules: Optional[CompiledProductRules] = None
+_worker_router: Optional[TerritoryRouter] = None
+
+
+def _init_worker(rules: Dict[str, Dict[str, Any]], version: int, territories: List[Dict[str, Any]]):
+    # Compiled once per worker; the compiled form holds caches that don't pickle
+    global _worker_rules, _worker_router
+    _worker_rules = CompiledProductRules(rules, version)
+    _worker_router = TerritoryRouter(territories)
+
+
+def _reprocess_chunk(rows: List[Tuple]) -> Tuple[List[Tuple], List[Tuple]]:
+    """
+    (products_mentioned, scoring, confidence, static_score, *tender fields,
+    *location fields, territory, territory_distance_km, id) for each
+    (id, text, type, scraped_at, company location), and the chunk's
+    (lead_id, product_code, confidence) lead_products rows
+    """
+    inferred = ProductInferenceService.infer_products_batch([row[1] or '' for row in rows], _worker_rules)
+    places = []
+    for _, text, _, _, company_location in rows:
+        # Directory listings say nothing about place; they carry the company's
+        place = location_extractor().extract(text or '')
+        if place is None and company_location:
+            place = location_extractor().geocode(company_location)
+        places.append(place)
+    located = [place for place in places if place]
+    routes = iter(_worker_router.route_many([p['lat'] for p in located], [p['lng'] for p in located],
+                                            [p['location'] for p in located]))
+
+    updates, product_rows = [], []
+    for (lead_id, text, signal_type, scraped_at, company_location), products, place in zip(rows, inferred, places):
+        codes = [p['code'] for p in products]
+        product_rows.extend((lead_id, p['code'].upper(), p['confidence']) for p in products)
+        route = next(routes) if place else None
+        score_data = ScoringEngine.calculate_score(
+            signal_type=signal_type or 'news',
+            scraped_at=scraped_at,
+            signal_text=text or '',
+            location=place['location'] if place else company_location,
+            route=route
+        )
+        geo_values = (place['location'], place['state'], place['lat'], place['lng']) if place else (None,) * 4
+        if (signal_type or '').lower() == 'tender':
+            tender = TenderParser.parse(text or '')
+            tender_values = tuple(tender[field] for field in TenderParser.FIELDS)
+        else:
+            tender_values = (None,) * len(TenderParser.FIELDS)
+        route_values = (route['territory'], route['distance_km']) if route and route['territory'] else (None, None)
+        updates.append((json.dumps(codes) if codes else None, json.dumps(score_data),
+                        score_data['final_score'], score_data['static_score'], *tender_values, *geo_values,
+                        *route_values, lead_id))
+    return updates, product_rows
+
+
+class LeadReprocessor:
+    """
+    Recomputes products_mentioned (and lead_products), scoring, confidence, static_score, the
+    parsed tender fields, the location and the territory route of every lead
+    with the current product rules, scoring weights, tender parser, place
+    gazetteer and territories. Leads routed by hand keep their territory.
+    expires_at is cleared for the next lifecycle sweep to recompute from the
+    new closing dates.
+
+    Leads are read in id order in CHUNK_SIZE pages (keyset: id > last id),
+    scored in a worker pool with at most a few chunks in flight, and written
+    back one short transaction per chunk, in order. After each write the last
+    id is checkpointed in `reprocess_checkpoints`, so an interrupted run
+    resumes where it stopped. Between writes the job sleeps `pause` seconds
+    (and longer when over `max_rate` rows/sec) to leave the database to API
+    readers.
+    """
+
+    CHUNK_SIZE = 500
+    IN_FLIGHT_PER_WORKER = 2
+    PROGRESS_EVERY_SECONDS = 5
+
+    def __init__(self, db, workers: int = None, chunk_size: int = None,
+                 pause: float = 0.05, max_rate: float = 0, name: str = 'leads'):
+        self.db = db
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.pause = pause
+        self.max_rate = max_rate
+        self.name = name
+
+    # Checkpoints
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        conn = self.db.get_connection()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute('SELECT * FROM reprocess_checkpoints WHERE name = ?', (self.name,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def _save_checkpoint(self, conn: sqlite3.Connection, last_id: int, rows_done: int,
+                         rules_version: int, started_at: str, finished: bool = False):
+        now = datetime.now().isoformat()
+        conn.execute('''INSERT INTO reprocess_checkpoints
+                        (name, last_id, rows_done, rules_version, started_at, updated_at, finished_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(name) DO UPDATE SET
+                            last_id = excluded.last_id, rows_done = excluded.rows_done,
+                            rules_version = excluded.rules_version, started_at = excluded.started_at,
+                            updated_at = excluded.updated_at, finished_at = excluded.finished_at''',
+                     (self.name, last_id, rows_done, rules_version, started_at, now, now if finished else None))
+
+    # Reading
+    def _chunks(self, after_id: int) -> Iterator[List[Tuple]]:
+        """Keyset-paginated lead chunks; each page is its own short read"""
+        last_id = after_id
+        while True:
+            conn = self.db.get_connection()
+            rows = conn.execute('''
+                SELECT l.id, l.signal_text, l.signal_type, l.scraped_at, c.location
+                FROM leads l
+                LEFT JOIN companies c ON c.id = l.company_id
+                WHERE l.id > ?
+                ORDER BY l.id
+                LIMIT ?
+            ''', (last_id, self.chunk_size)).fetchall()
+            conn.close()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield rows
+
+    def _pool(self, rules: CompiledProductRules, territories: List[Dict[str, Any]]):
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        return ctx.Pool(self.workers, initializer=_init_worker, initargs=(rules.rules, rules.version, territories))
+
+    # Writing
+    def _write(self, updates: List[Tuple], product_rows: List[Tuple], last_id: int, rows_done: int,
+               rules_version: int, started_at: str):
+        conn = self.db.get_connection()
+        try:
+            conn.executemany('DELETE FROM lead_products WHERE lead_id = ?', [(update[-1],) for update in updates])
+            conn.executemany('INSERT INTO lead_products (lead_id, product_code, confidence) VALUES (?, ?, ?)',
+                             product_rows)
+            conn.executemany('''UPDATE leads
+                                SET products_mentioned = ?, scoring = ?, confidence = ?, static_score = ?,
+                                    tender_reference = ?, tender_organization = ?, tender_value_inr = ?,
+                                    tender_closing_at = ?, tender_opening_at = ?, tender_published_at = ?,
+                                    geo_location = ?, geo_state = ?, geo_lat = ?, geo_lng = ?,
+                                    territory = CASE WHEN territory IS NULL OR territory_distance_km IS NOT NULL
+                                                     THEN ? ELSE territory END,
+                                    territory_distance_km = CASE WHEN territory IS NULL OR territory_distance_km IS NOT NULL
+                                                                 THEN ? ELSE territory_distance_km END,
+                                    expires_at = NULL
+                                WHERE id = ?''', updates)
+            self._save_checkpoint(conn, last_id, rows_done, rules_version, started_at)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def run(self, restart: bool = False, limit: int = None) -> Dict[str, Any]:
+        """
+        Reprocess leads (resuming from the checkpoint unless `restart`).
+        `limit` stops after about that many rows (the checkpoint is kept).
+        """
+        rules = self.db.get_product_rules(force=True)
+        checkpoint = None if restart else self.load_checkpoint()
+        if checkpoint and checkpoint['finished_at'] is None and checkpoint['rules_version'] != rules.version:
+            print(f"⚠️  Product rules changed since the checkpoint (v{checkpoint['rules_version']} → "
+                  f"v{rules.version}); starting over")
+            checkpoint = None
+        if checkpoint and checkpoint['finished_at'] is not None:
+            checkpoint = None  # Last run completed; this is a new one
+
+        after_id = checkpoint['last_id'] if checkpoint else 0
+        rows_done = checkpoint['rows_done'] if checkpoint else 0
+        started_at = checkpoint['started_at'] if checkpoint else datetime.now().isoformat()
+        if checkpoint:
+            print(f"↩️  Resuming after lead #{after_id} ({rows_done} rows already done)")
+
+        processed = 0
+        last_id = after_id
+        start = time.perf_counter()
+        last_report = start
+        chunks = self._chunks(after_id)
+        in_flight = deque()
+
+        def submit_next(pool) -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            if pool is None:
+                in_flight.append((chunk[-1][0], len(chunk), _reprocess_chunk(chunk)))
+            else:
+                in_flight.append((chunk[-1][0], len(chunk), pool.apply_async(_reprocess_chunk, (chunk,))))
+            return True
+
+        territories = self.db.get_territory_router().territories
+        pool = self._pool(rules, territories) if self.workers > 1 else None
+        if pool is None:
+            _init_worker(rules.rules, rules.version, territories)
+        try:
+            for _ in range(self.workers * self.IN_FLIGHT_PER_WORKER):
+                if not submit_next(pool):
+                    break
+
+            while in_flight:
+                chunk_last_id, size, result = in_flight.popleft()
+                updates, product_rows = result if pool is None else result.get()
+                submit_next(pool)
+
+                processed += size
+                last_id = chunk_last_id
+                self._write(updates, product_rows, last_id, rows_done + processed, rules.version, started_at)
+
+                elapsed = time.perf_counter() - start
+                now = time.perf_counter()
+                if now - last_report >= self.PROGRESS_EVERY_SECONDS:
+                    last_report = now
+                    print(f"   ... {processed} rows, up to lead #{last_id} ({processed / elapsed:,.0f} rows/sec)")
+
+                if limit and processed >= limit:
+                    break
+
+                # Leave gaps between write transactions for API readers
+                delay = self.pause
+                if self.max_rate:
+                    delay = max(delay, processed / self.max_rate - elapsed)
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        finished = not in_flight and not (limit and processed >= limit)
+        if finished:
+            conn = self.db.get_connection()
+            self._save_checkpoint(conn, last_id, rows_done + processed, rules.version, started_at, finished=True)
+            conn.commit()
+            conn.close()
+
+        elapsed = time.perf_counter() - start
+        return {
+            'rows': processed,
+            'total_rows': rows_done + processed,
+            'last_id': last_id,
+            'finished': finished,
+            'rules_version': rules.version,
+            'seconds': round(elapsed, 2),
+            'rows_per_sec': round(processed / elapsed, 1) if elapsed > 0 else 0.0
+        }
@@ -0,0 +1,45 @@
+"""
+Lead Search
+Turns what a user types in the leads search box into a query on the
+leads_fts full-text index (lead text, company name and tender fields).
+"""
+
+import html
+import re
+from typing import Optional
+
+
+class LeadSearch:
+    """
+    Every word typed must appear in the lead (in any indexed column). Words
+    of two or more characters match as prefixes, so results follow the
+    keystrokes ("relia" finds Reliance). Words are quoted, so FTS5 syntax
+    typed into the box is searched for as text. Results rank by bm25 with
+    the column weights set on the index. Text with no words finds nothing.
+    """
+
+    MAX_TERMS = 8
+    SNIPPET_TOKENS = 16
+    # Marks the matches in snippets until they are HTML-escaped (see highlight)
+    _OPEN, _CLOSE = '\x02', '\x03'
+    _WORD = re.compile(r'\w+')
+
+    @classmethod
+    def match_query(cls, text: str) -> Optional[str]:
+        """FTS5 MATCH expression for the search text; None when it has no words"""
+        terms = cls._WORD.findall(text or '')[:cls.MAX_TERMS]
+        if not terms:
+            return None
+        return ' '.join(f'"{term}"*' if len(term) > 1 else f'"{term}"' for term in terms)
+
+    @classmethod
+    def snippet_sql(cls) -> str:
+        """SQL for the best-matching fragment of a leads_fts row"""
+        return f"snippet(leads_fts, -1, '{cls._OPEN}', '{cls._CLOSE}', '…', {cls.SNIPPET_TOKENS})"
+
+    @classmethod
+    def highlight(cls, snippet: Optional[str]) -> Optional[str]:
+        """An HTML-safe snippet with the matched words in <mark> tags"""
+        if snippet is None:
+            return None
+        return html.escape(snippet).replace(cls._OPEN, '<mark>').replace(cls._CLOSE, '</mark>')
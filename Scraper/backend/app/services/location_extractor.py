@@ -0,0 +1,137 @@
+"""
+Location Extractor
+Finds Indian cities, districts and states in text in a single pass over a
+bundled offline gazetteer (backend/app/data/india_places.json) and resolves
+them to coordinates, without any network calls.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .gazetteer import AhoCorasick, EntityGazetteer
+
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'india_places.json'
+
+
+class LocationExtractor:
+    """
+    Gazetteer of places compiled into one Aho-Corasick trie.
+
+    Names match case-insensitively on word boundaries but must start with a
+    capital, as place names do in running text. Overlapping mentions resolve
+    to the leftmost-longest one ("Navi Mumbai" beats "Mumbai"). The most
+    specific place wins (city over district over state), preferring places
+    in a state the text also names, then the first mentioned; that also
+    settles names shared by two places (Aurangabad). Names that merely
+    contain a place ("Bank of Baroda") are matched too and then ignored.
+    """
+
+    KIND_RANK = {'city': 3, 'district': 2, 'state': 1}
+    GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "10000"))
+
+    def __init__(self, places: List[Dict[str, Any]], not_places: List[str] = ()):
+        self.automaton = AhoCorasick()
+        self.places: Dict[str, List[Dict[str, Any]]] = {}
+        for name in not_places:
+            key = EntityGazetteer.alias_key(name)
+            self.places[key] = []
+            self.automaton.add(key, key)
+        for place in places:
+            for name in [place['name']] + place.get('aliases', []):
+                key = EntityGazetteer.alias_key(name)
+                if key not in self.places:
+                    self.places[key] = []
+                    self.automaton.add(key, key)
+                self.places[key].append(place)
+        self.automaton.build()
+        # Repeat location strings (company addresses, directory cells) skip the scan
+        self.geocode = lru_cache(maxsize=self.GEOCODE_CACHE_SIZE)(self._geocode)
+
+    @classmethod
+    def load(cls, path: Path = None) -> 'LocationExtractor':
+        """Extractor over the bundled gazetteer (or another file in the same format)"""
+        with open(path or DATA_PATH, encoding='utf-8') as f:
+            data = json.load(f)
+        places = [dict(state, kind='state', state=state['name']) for state in data['states']]
+        places += data['places']
+        return cls(places, data.get('not_places', []))
+
+    def find(self, text: str) -> List[Dict[str, Any]]:
+        """Place mentions in `text`, in order: {'text', 'start', 'end', 'places'}"""
+        if not text:
+            return []
+
+        original = re.sub(r'\s+', ' ', text)
+        lowered = original.lower()
+        if len(lowered) != len(original):
+            lowered = ''.join(ch.lower()[:1] or ch for ch in original)
+
+        matches = []
+        n = len(original)
+        for start, end, key in self.automaton.iter(lowered):
+            if start > 0 and original[start - 1].isalnum():
+                continue
+            if end < n and original[end].isalnum():
+                continue
+            if not original[start].isupper():
+                continue
+            matches.append((start, end, key))
+
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        mentions = []
+        last_end = -1
+        for start, end, key in matches:
+            if start < last_end:
+                continue
+            mentions.append({'text': original[start:end], 'start': start, 'end': end, 'places': self.places[key]})
+            last_end = end
+        return mentions
+
+    def extract(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        The location of a signal: {'location': "Dahej, Gujarat", 'name',
+        'kind', 'state', 'lat', 'lng'}, or None when no place is named
+        """
+        mentions = self.find(text)
+        if not mentions:
+            return None
+
+        named_states = {place['state'] for mention in mentions for place in mention['places']
+                        if place['kind'] == 'state'}
+        best, best_key = None, None
+        for order, mention in enumerate(mentions):
+            for place in mention['places']:
+                key = (self.KIND_RANK[place['kind']], place['state'] in named_states, -order)
+                if best_key is None or key > best_key:
+                    best, best_key = place, key
+        return self.describe(best) if best else None
+
+    def _geocode(self, location: str) -> Optional[Dict[str, Any]]:
+        return self.extract(location)
+
+    @staticmethod
+    def describe(place: Dict[str, Any]) -> Dict[str, Any]:
+        name, state = place['name'], place['state']
+        return {
+            'location': name if name == state else f'{name}, {state}',
+            'name': name,
+            'kind': place['kind'],
+            'state': state,
+            'lat': place['lat'],
+            'lng': place['lng']
+        }
+
+
+_extractor: Optional[LocationExtractor] = None
+
+
+def location_extractor() -> LocationExtractor:
+    """Shared extractor over the bundled gazetteer, built on first use"""
+    global _extractor
+    if _extractor is None:
+        _extractor = LocationExtractor.load()
+    return _extractor
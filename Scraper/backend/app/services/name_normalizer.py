@@ -0,0 +1,84 @@
+"""
+Company Name Normalizer
+Normalization of company names for matching: precompiled legal-suffix
+patterns, skipped when their leading word is absent, and one translate pass
+for punctuation.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+# Common legal suffixes to remove, each applied in turn to what the previous left
+LEGAL_SUFFIXES = [
+    r'\bPvt\.? Ltd\.?', r'\bPrivate Limited\b',
+    r'\bLtd\.?\b', r'\bLimited\b',
+    r'\bCorp\.?\b', r'\bCorporation\b',
+    r'\bInc\.?\b', r'\bIncorporated\b',
+    r'\bLLC\b', r'\bLLP\b',
+    r'\bCo\.?\b', r'\bCompany\b',
+    r'\bInds\.?\b', r'\bIndustries\b',
+    r'\bEnt\.?\b', r'\bEnterprises\b',
+    r'\bGroup\b', r'\bHoldings\b'
+]
+
+# (leading word, pattern): a pattern can't match text its leading word isn't in
+_SUFFIX_PATTERNS = [
+    (re.match(r'\\b([A-Za-z ]+)', pattern).group(1).lower(), re.compile(pattern, re.IGNORECASE))
+    for pattern in LEGAL_SUFFIXES
+]
+
+_KEEP = set('abcdefghijklmnopqrstuvwxyz0123456789')
+
+
+class _PunctuationTable(dict):
+    """str.translate table: keeps [a-z0-9] and whitespace, maps the rest to a space"""
+
+    def __missing__(self, codepoint: int):
+        ch = chr(codepoint)
+        value = self[codepoint] = codepoint if ch in _KEEP or ch.isspace() else ' '
+        return value
+
+
+_PUNCTUATION = _PunctuationTable()
+
+
+def _fold(name: str) -> str:
+    """Lowercase; non-ASCII names also lose accents ("Nestlé" -> "nestle")"""
+    if name.isascii():
+        return name.lower()
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    """
+    Normalize a company name for comparison:
+    1. Lowercase (and strip accents)
+    2. Remove legal suffixes
+    3. Replace special characters with spaces
+    4. Collapse whitespace
+    """
+    if not name:
+        return ""
+    normalized = _fold(name)
+    # In sequence, not one alternation pass: removing one suffix can expose
+    # another ("pvt ltdco" -> "co" -> "")
+    for word, pattern in _SUFFIX_PATTERNS:
+        if word in normalized:
+            normalized = pattern.sub('', normalized)
+    return ' '.join(normalized.translate(_PUNCTUATION).split())
+
+
+def normalize_many(names: Iterable[str]) -> List[str]:
+    """Normalize a batch of names; repeats are normalized once"""
+    seen: Dict[str, str] = {}
+    results = []
+    for name in names:
+        normalized = seen.get(name)
+        if normalized is None:
+            normalized = seen[name] = normalize_name(name)
+        results.append(normalized)
+    return results
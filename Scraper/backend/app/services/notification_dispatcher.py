@@ -0,0 +1,195 @@
+"""
+Notification Dispatcher
+Drains the notification outbox asynchronously, off the scraping path.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from .notification_service import NotificationService
+
+
+class NotificationDispatcher:
+    """
+    Async worker that delivers queued alerts from `notification_outbox`.
+
+    - Bounded concurrency: at most `concurrency` sends in flight, sharing one
+      pooled HTTP session.
+    - Retries with exponential backoff, then the DEAD (dead-letter) state.
+    - Each outbox row carries a unique idempotency key, so a lead is never
+      queued twice for the same recipient and channel.
+    - In digest mode (see NotificationService.plan_deliveries) non-urgent
+      alerts are coalesced into one message per recipient.
+    - Emails go out in chunks over a pooled, already-authenticated SMTP
+      connection instead of one login per message.
+    """
+
+    MAX_ATTEMPTS = 5
+    BASE_BACKOFF_SECONDS = 30
+    MAX_BACKOFF_SECONDS = 3600
+    EMAIL_CHUNK_SIZE = 25
+
+    def __init__(self, db, notifier: Optional[NotificationService] = None,
+                 concurrency: int = 4, batch_size: int = 50, poll_interval: float = 5.0):
+        self.db = db
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.notifier = notifier or NotificationService(pool_size=concurrency)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {
+            'messages': 0,
+            'sent': 0,
+            'retried': 0,
+            'dead': 0,
+            'latency_total': 0.0
+        }
+
+    def backoff_seconds(self, attempts: int) -> int:
+        """Exponential backoff: 30s, 60s, 120s, ... capped at one hour"""
+        return min(self.BASE_BACKOFF_SECONDS * (2 ** (attempts - 1)), self.MAX_BACKOFF_SECONDS)
+
+    async def _record(self, rows: List[Dict[str, Any]], error: Optional[str]):
+        """Mark one delivered message's rows as sent, or schedule their retry"""
+        if error is None:
+            batch_key = f"digest:{rows[0]['id']}" if len(rows) > 1 else None
+            await asyncio.to_thread(self.db.mark_outbox_sent, [row['id'] for row in rows], batch_key)
+            now = datetime.now()
+            self.stats['messages'] += 1
+            self.stats['sent'] += len(rows)
+            self.stats['latency_total'] += sum(
+                (now - datetime.fromisoformat(row['created_at'])).total_seconds() for row in rows
+            )
+            return
+
+        for row in rows:
+            if row['attempts'] >= self.MAX_ATTEMPTS:
+                next_attempt_at = None
+                self.stats['dead'] += 1
+                print(f"   ☠️  Outbox #{row['id']} dead-lettered after {row['attempts']} attempts: {error}")
+            else:
+                delay = self.backoff_seconds(row['attempts'])
+                next_attempt_at = (datetime.now() + timedelta(seconds=delay)).isoformat()
+                self.stats['retried'] += 1
+
+            await asyncio.to_thread(self.db.mark_outbox_failed, row['id'], error, next_attempt_at)
+
+    async def _deliver(self, batch: List[Dict[str, Any]]):
+        """Claim and deliver one planned message (a single alert or a digest)"""
+        async with self._semaphore:
+            rows = await asyncio.to_thread(self.db.claim_outbox_rows, [row['id'] for row in batch])
+            if not rows:
+                return  # Claimed by another worker in the meantime
+
+            channel, recipient = rows[0]['channel'], rows[0]['recipient']
+            leads = [json.loads(row['payload']) for row in rows]
+            try:
+                ok = await asyncio.to_thread(self.notifier.deliver, channel, recipient, leads)
+                error = None if ok else 'delivery failed'
+            except Exception as e:
+                error = str(e)
+
+            await self._record(rows, error)
+
+    async def _deliver_emails(self, batches: List[List[Dict[str, Any]]]):
+        """Claim several email messages and send them over one pooled SMTP connection"""
+        async with self._semaphore:
+            claimed = []
+            for batch in batches:
+                rows = await asyncio.to_thread(self.db.claim_outbox_rows, [row['id'] for row in batch])
+                if rows:
+                    claimed.append(rows)
+            if not claimed:
+                return
+
+            deliveries = [
+                (rows[0]['recipient'], [json.loads(row['payload']) for row in rows])
+                for rows in claimed
+            ]
+            try:
+                errors = await asyncio.to_thread(self.notifier.send_email_batch, deliveries)
+            except Exception as e:
+                errors = [str(e)] * len(claimed)
+
+            for rows, error in zip(claimed, errors):
+                await self._record(rows, error)
+
+    def _channels(self) -> List[str]:
+        """Channels we can deliver on; rows for unconfigured channels stay queued"""
+        channels = []
+        if self.notifier.email_configured:
+            channels.append('EMAIL')
+        if self.notifier.whatsapp_configured:
+            channels.append('WHATSAPP')
+        return channels
+
+    async def drain_once(self) -> int:
+        """Plan due rows into messages and deliver up to one batch of them concurrently"""
+        channels = self._channels()
+        if not channels:
+            return 0
+
+        rows = await asyncio.to_thread(self.db.peek_outbox_due, self.batch_size * 10, channels,
+                                       self.notifier.digest_enabled)
+        batches, deferred = self.notifier.plan_deliveries(rows)
+        batches = batches[:self.batch_size]
+
+        # Park digest rows until their window ends, so they don't fill the
+        # peek window every tick and starve urgent alerts queued behind them.
+        # Parked rows come back with the next due row for their recipient, so
+        # later alerts join the same digest and count towards its size.
+        for ready_at, outbox_ids in deferred:
+            await asyncio.to_thread(self.db.defer_outbox_rows, outbox_ids, ready_at)
+
+        # Emails are sent in chunks that share one SMTP connection each
+        emails = [batch for batch in batches if batch[0]['channel'] == 'EMAIL']
+        others = [batch for batch in batches if batch[0]['channel'] != 'EMAIL']
+        chunks = [emails[i:i + self.EMAIL_CHUNK_SIZE] for i in range(0, len(emails), self.EMAIL_CHUNK_SIZE)]
+
+        await asyncio.gather(
+            *(self._deliver(batch) for batch in others),
+            *(self._deliver_emails(chunk) for chunk in chunks)
+        )
+        return len(batches)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Outbox backlog/latency from the DB plus this worker's counters"""
+        metrics = self.db.get_outbox_metrics()
+        sent = self.stats['sent']
+        metrics['worker'] = {
+            'messagesSent': self.stats['messages'],
+            'sent': sent,
+            'retried': self.stats['retried'],
+            'dead': self.stats['dead'],
+            'avgLatencySeconds': round(self.stats['latency_total'] / sent, 2) if sent else None
+        }
+        return metrics
+
+    async def run_forever(self, metrics_every: float = 300.0):
+        """Poll the outbox until cancelled"""
+        print(f"📨 Notification dispatcher started (concurrency={self.concurrency}, batch={self.batch_size})")
+        if self.notifier.digest_enabled:
+            print(f"   Digest mode: {self.notifier.digest_window}s window / {self.notifier.digest_max_items} leads, "
+                  f"immediate at confidence >= {self.notifier.urgent_confidence}")
+        if not self.notifier.whatsapp_configured:
+            print("⚠️  WhatsApp credentials missing. WhatsApp alerts will stay queued.")
+        if not self.notifier.email_configured:
+            print("⚠️  SMTP settings missing. Email alerts will stay queued.")
+
+        last_report = time.monotonic()
+        while True:
+            delivered = await self.drain_once()
+
+            if time.monotonic() - last_report >= metrics_every:
+                m = self.metrics()
+                print(f"📊 Outbox backlog: {m['backlog']} | messages: {m['worker']['messagesSent']} "
+                      f"for {m['worker']['sent']} leads | dead: {m['worker']['dead']} | "
+                      f"p95 latency: {m['p95LatencySeconds']}s")
+                last_report = time.monotonic()
+
+            # Keep draining while there is work; otherwise poll
+            if delivered < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
@@ -5,8 +5,12 @@ Handles multi-channel alerts (WhatsApp via Meta Cloud API, Email via SMTP).
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+
+from .email_channel import SMTPConnectionPool, EmailChannel
 
 class NotificationService:
     """
@@ -16,39 +20,63 @@ class NotificationService:
     # Meta Cloud API Config
     META_API_URL = "https://graph.facebook.com/v19.0"
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 4):
         # WhatsApp Config
         self.wa_phone_id = os.getenv("META_PHONE_NUMBER_ID")
         self.wa_token = os.getenv("META_ACCESS_TOKEN")
+        self.timeout = float(os.getenv("NOTIFY_TIMEOUT", "10"))
+        
+        # Keep-alive session so repeated alerts reuse the same TLS connection(s)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
         
-        # Email Config (Placeholder)
+        # Email Config
         self.smtp_server = os.getenv("SMTP_SERVER")
-        self.smtp_port = os.getenv("SMTP_PORT")
+        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
         self.email_user = os.getenv("EMAIL_USER")
         self.email_pass = os.getenv("EMAIL_PASS")
+        self.email_from = os.getenv("EMAIL_FROM") or self.email_user
+        self.smtp_use_tls = os.getenv("SMTP_USE_TLS", "1") == "1"
+        self.smtp_pool_size = int(os.getenv("SMTP_POOL_SIZE", "2"))
+        self._email_channel = None
+        
+        # Digest mode: coalesce non-urgent alerts per recipient
+        self.digest_enabled = os.getenv("NOTIFY_DIGEST_ENABLED", "0") == "1"
+        self.digest_window = int(os.getenv("NOTIFY_DIGEST_WINDOW_SECONDS", "900"))
+        self.digest_max_items = int(os.getenv("NOTIFY_DIGEST_MAX_ITEMS", "10"))
+        self.urgent_confidence = float(os.getenv("NOTIFY_URGENT_CONFIDENCE", "0.9"))
 
-    def send_whatsapp_alert(self, lead: Dict[str, Any], user_phone: str) -> bool:
+    @property
+    def whatsapp_configured(self) -> bool:
+        """True when Meta Cloud API credentials are present"""
+        return bool(self.wa_phone_id and self.wa_token)
+
+    @property
+    def email_configured(self) -> bool:
+        """True when an SMTP server and sender address are set"""
+        return bool(self.smtp_server and self.email_from)
+
+    @property
+    def email_channel(self) -> Optional[EmailChannel]:
+        """Pooled SMTP channel, opened on first use"""
+        if self._email_channel is None and self.email_configured:
+            pool = SMTPConnectionPool(
+                self.smtp_server, self.smtp_port,
+                user=self.email_user, password=self.email_pass,
+                use_tls=self.smtp_use_tls, size=self.smtp_pool_size,
+                timeout=self.timeout
+            )
+            self._email_channel = EmailChannel(pool, self.email_from)
+        return self._email_channel
+
+    @staticmethod
+    def build_whatsapp_payload(lead: Dict[str, Any], user_phone: str) -> Dict[str, Any]:
         """
-        Send WhatsApp template message using Meta Cloud API.
+        Build the 'new_lead_alert' template message for one lead.
+        Note: You must create a template named 'new_lead_alert' in Meta Business Manager
         """
-        if not self.wa_phone_id or not self.wa_token:
-            print("⚠️  WhatsApp credentials missing. Skipping alert.")
-            return False
-            
-        if not user_phone:
-            print("⚠️  User phone number missing. Skipping alert.")
-            return False
-            
-        url = f"{self.META_API_URL}/{self.wa_phone_id}/messages"
-        
-        headers = {
-            "Authorization": f"Bearer {self.wa_token}",
-            "Content-Type": "application/json"
-        }
-        
-        # Construct message payload (using a template)
-        # Note: You must create a template named 'new_lead_alert' in Meta Business Manager
-        payload = {
+        return {
             "messaging_product": "whatsapp",
             "to": user_phone,
             "type": "template",
@@ -78,28 +106,208 @@ class NotificationService:
                 ]
             }
         }
+
+    @staticmethod
+    def build_whatsapp_digest_payload(leads: List[Dict[str, Any]], user_phone: str) -> Dict[str, Any]:
+        """
+        Build one 'lead_digest_alert' template message summarising several leads.
+        Note: You must create a template named 'lead_digest_alert' in Meta Business Manager
+        """
+        ranked = sorted(leads, key=lambda l: float(l.get('confidence', 0.0)), reverse=True)
+        
+        # Template parameters can't contain newlines, so list the top leads inline
+        top = [
+            f"{l.get('company_name', 'Unknown Company')} ({l.get('confidence', 0.0)}, {l.get('signal_type', 'General')})"
+            for l in ranked[:3]
+        ]
+        summary = '; '.join(top)
+        if len(ranked) > 3:
+            summary += f" +{len(ranked) - 3} more"
+        
+        return {
+            "messaging_product": "whatsapp",
+            "to": user_phone,
+            "type": "template",
+            "template": {
+                "name": "lead_digest_alert",
+                "language": {
+                    "code": "en"
+                },
+                "components": [
+                    {
+                        "type": "body",
+                        "parameters": [
+                            {
+                                "type": "text",
+                                "text": str(len(ranked))
+                            },
+                            {
+                                "type": "text",
+                                "text": summary
+                            }
+                        ]
+                    }
+                ]
+            }
+        }
+
+    def post_whatsapp(self, payload: Dict[str, Any]) -> requests.Response:
+        """
+        POST a message payload to the Meta Cloud API.
+        Raises on network errors, timeouts and non-2xx responses.
+        """
+        url = f"{self.META_API_URL}/{self.wa_phone_id}/messages"
+        
+        headers = {
+            "Authorization": f"Bearer {self.wa_token}",
+            "Content-Type": "application/json"
+        }
+        
+        response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def send_whatsapp_alert(self, lead: Dict[str, Any], user_phone: str) -> bool:
+        """
+        Send WhatsApp template message using Meta Cloud API.
+        """
+        if not self.whatsapp_configured:
+            print("⚠️  WhatsApp credentials missing. Skipping alert.")
+            return False
+            
+        if not user_phone:
+            print("⚠️  User phone number missing. Skipping alert.")
+            return False
+        
+        payload = self.build_whatsapp_payload(lead, user_phone)
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
+            self.post_whatsapp(payload)
             print(f"✅ WhatsApp alert sent to {user_phone}")
             return True
         except Exception as e:
             print(f"❌ Failed to send WhatsApp alert: {e}")
-            if hasattr(e, 'response') and e.response:
+            if hasattr(e, 'response') and e.response is not None:
+                print(f"   Response: {e.response.text}")
+            return False
+
+    def send_whatsapp_digest(self, leads: List[Dict[str, Any]], user_phone: str) -> bool:
+        """
+        Send several leads to one officer as a single WhatsApp message.
+        """
+        if not self.whatsapp_configured or not user_phone:
+            print("⚠️  WhatsApp credentials or phone missing. Skipping digest.")
+            return False
+        
+        try:
+            self.post_whatsapp(self.build_whatsapp_digest_payload(leads, user_phone))
+            print(f"✅ WhatsApp digest ({len(leads)} leads) sent to {user_phone}")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to send WhatsApp digest: {e}")
+            if hasattr(e, 'response') and e.response is not None:
                 print(f"   Response: {e.response.text}")
             return False
 
+    def send_email_batch(self, deliveries: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Optional[str]]:
+        """
+        Send several (recipient, leads) emails over one pooled SMTP connection.
+        Returns an error string per delivery (None = sent).
+        """
+        if not self.email_configured:
+            return ["SMTP not configured"] * len(deliveries)
+        
+        errors = self.email_channel.send_batch(deliveries)
+        sent = sum(1 for error in errors if error is None)
+        if sent:
+            print(f"📧 {sent} email(s) sent")
+        for (recipient, _), error in zip(deliveries, errors):
+            if error:
+                print(f"❌ Failed to send email to {recipient}: {error}")
+        return errors
+
+    def send_email_digest(self, leads: List[Dict[str, Any]], user_email: str) -> bool:
+        """
+        Send several leads to one officer as a single email.
+        """
+        if not self.email_configured or not user_email:
+            print("⚠️  SMTP settings or email missing. Skipping digest.")
+            return False
+        
+        return self.send_email_batch([(user_email, leads)])[0] is None
+
     def send_email_alert(self, lead: Dict[str, Any], user_email: str) -> bool:
         """
-        Send email alert (Placeholder).
+        Send email alert via SMTP.
         """
-        if not user_email:
+        if not self.email_configured or not user_email:
+            print("⚠️  SMTP settings or email missing. Skipping alert.")
             return False
-            
-        # TODO: Implement SMTP sending logic
-        print(f"📧 [Mock] Email sent to {user_email}: New Lead - {lead.get('company_name')}")
-        return True
+        
+        return self.send_email_batch([(user_email, [lead])])[0] is None
+
+    def deliver(self, channel: str, recipient: str, leads: List[Dict[str, Any]]) -> bool:
+        """
+        Deliver queued alerts to one recipient (used by the outbox dispatcher).
+        A single lead goes out as a normal alert, several as one digest.
+        """
+        if channel == 'WHATSAPP':
+            if len(leads) == 1:
+                return self.send_whatsapp_alert(leads[0], recipient)
+            return self.send_whatsapp_digest(leads, recipient)
+        if channel == 'EMAIL':
+            if len(leads) == 1:
+                return self.send_email_alert(leads[0], recipient)
+            return self.send_email_digest(leads, recipient)
+        
+        print(f"⚠️  Unknown notification channel: {channel}")
+        return False
+
+    def plan_deliveries(self, rows: List[Dict[str, Any]],
+                        now: datetime = None) -> Tuple[List[List[Dict[str, Any]]], List[Tuple[str, List[int]]]]:
+        """
+        Group pending outbox rows into messages.
+
+        Without digest mode every row is its own message. In digest mode, leads
+        at or above `urgent_confidence` still go out immediately; the rest are
+        coalesced per recipient/channel and released once the oldest has waited
+        `digest_window` seconds or `digest_max_items` have accumulated.
+
+        Returns (batches, deferred): deferred lists (ready_at, row ids) for the
+        groups that aren't ready yet, so the caller can park those rows until
+        their window ends instead of peeking them again every tick. Rows parked
+        earlier are passed in again with their recipient's new rows, so a group
+        keeps the window of its oldest row.
+        """
+        if not self.digest_enabled:
+            return [[row] for row in rows], []
+        
+        now = now or datetime.now()
+        batches = []
+        deferred = []
+        groups = {}
+        
+        for row in rows:
+            lead = json.loads(row['payload'])
+            if float(lead.get('confidence', 0.0)) >= self.urgent_confidence:
+                batches.append([row])
+            else:
+                groups.setdefault((row['channel'], row['recipient']), []).append(row)
+        
+        for group in groups.values():
+            group.sort(key=lambda r: r['created_at'])
+            # Flush full digests first, then the remainder if its window has elapsed
+            while len(group) >= self.digest_max_items:
+                batches.append(group[:self.digest_max_items])
+                group = group[self.digest_max_items:]
+            if group:
+                ready_at = datetime.fromisoformat(group[0]['created_at']) + timedelta(seconds=self.digest_window)
+                if ready_at <= now:
+                    batches.append(group)
+                else:
+                    deferred.append((ready_at.isoformat(), [row['id'] for row in group]))
+        
+        return batches, deferred
 
     def notify_officer(self, lead: Dict[str, Any], user_context: Dict[str, Any]):
         """
@@ -3,69 +3,29 @@ Product Inference Service
 Maps signal text and contexts to HPCL products with confidence scores.
 """
 
-from typing import List, Dict, Any, Tuple
 import re
+from typing import List, Dict, Any, Tuple, Optional
+
+from .product_rules import CompiledProductRules, active_rules
+from .signal_matcher import KeyScanner, SignalMatcher
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Optional: infer_products_batch aggregates in plain Python without them
+    np = sparse = None
 
 class ProductInferenceService:
     """
     Service for inferring products from text signals.
+
+    Rules come from a CompiledProductRules version (see product_rules): pass
+    the one returned by db.get_product_rules(), or leave it out to use the
+    process's active version (the built-in rules until one is loaded).
     """
     
-    # Product Knowledge Base
-    # Maps keywords/contexts to Product Codes
-    PRODUCT_RULES = {
-        'FO': {
-            'name': 'Furnace Oil',
-            'keywords': ['furnace oil', 'fuel oil', 'bunker fuel', 'heavy oil', 'fo 180', 'fo 380'],
-            'contexts': ['boiler', 'heating', 'power plant', 'thermal', 'kiln', 'furnace'],
-            'min_confidence': 0.7
-        },
-        'LSHS': {
-            'name': 'Low Sulphur Heavy Stock',
-            'keywords': ['lshs', 'low sulphur heavy stock', 'low sulfur heavy stock'],
-            'contexts': ['fertilizer', 'power generation', 'low emission', 'sulfur limit'],
-            'min_confidence': 0.8
-        },
-        'HSD': {
-            'name': 'High Speed Diesel',
-            'keywords': ['hsd', 'high speed diesel', 'diesel', 'gas oil'],
-            'contexts': ['transport', 'genset', 'generator', 'backup power', 'mining', 'fleet'],
-            'min_confidence': 0.6
-        },
-        'LDO': {
-            'name': 'Light Diesel Oil',
-            'keywords': ['ldo', 'light diesel oil'],
-            'contexts': ['pump', 'lift irrigation', 'small boiler', 'diesel engine'],
-            'min_confidence': 0.75
-        },
-        'BITUMEN': {
-            'name': 'Bitumen',
-            'keywords': ['bitumen', 'asphalt', 'road tar', 'vg 30', 'vg 10', 'vg 40'],
-            'contexts': ['road construction', 'highway', 'paving', 'infrastructure', 'waterproofing'],
-            'min_confidence': 0.85
-        },
-        'HEXANE': {
-            'name': 'Hexane',
-            'keywords': ['hexane', 'food grade hexane'],
-            'contexts': ['solvent extraction', 'vegetable oil', 'pharma', 'polymer'],
-            'min_confidence': 0.8
-        },
-        'MTO': {
-            'name': 'Mineral Turpentine Oil',
-            'keywords': ['mto', 'mineral turpentine oil', 'white spirit'],
-            'contexts': ['paint', 'varnish', 'dry cleaning', 'degreasing'],
-            'min_confidence': 0.75
-        },
-        'JBO': {
-            'name': 'Jute Batching Oil',
-            'keywords': ['jbo', 'jute batching oil'],
-            'contexts': ['jute', 'textile mill', 'fiber processing'],
-            'min_confidence': 0.9
-        }
-    }
-    
     @classmethod
-    def infer_products(cls, text: str) -> List[Dict[str, Any]]:
+    def infer_products(cls, text: str, rules: CompiledProductRules = None) -> List[Dict[str, Any]]:
         """
         Analyze text and return list of probable products.
         Returns: [
@@ -78,38 +38,24 @@ class ProductInferenceService:
             ...
         ]
         """
+        rules = rules or active_rules()
         results = []
-        text_lower = text.lower()
+        hits = rules.matcher.scan(text)
         
-        for code, rules in cls.PRODUCT_RULES.items():
-            confidence = 0.0
-            reasons = []
-            
-            # Check direct keywords (High impact)
-            for kw in rules['keywords']:
-                if kw in text_lower:
-                    confidence += 0.6
-                    reasons.append(f"Matched keyword: '{kw}'")
-                    break  # Count only one keyword match per product
-            
-            # Check context keywords (Medium impact)
-            for ctx in rules['contexts']:
-                if ctx in text_lower:
-                    confidence += 0.3
-                    reasons.append(f"Matched context: '{ctx}'")
-                    break # Count only one context match
+        for code, (negative, keyword, context, disqualifier) in rules.categories.items():
+            # A negative keyword discards the product outright
+            if negative in hits:
+                continue
             
-            # Cap confidence at 1.0
-            confidence = min(confidence, 1.0)
-            
-            # Filter by minimum confidence
-            if confidence >= 0.4: # Return low confidence matches too, for review
-                results.append({
-                    'code': code,
-                    'name': rules['name'],
-                    'confidence': round(confidence, 2),
-                    'reasoning': '; '.join(reasons)
-                })
+            # Only the first keyword / context in rule order counts
+            kw = hits.get(keyword, (None,))[0]
+            ctx = hits.get(context, (None,))[0]
+            disqualifiers = hits.get(disqualifier, ())
+            if kw is None and ctx is None and not disqualifiers:
+                continue
+            result = cls._score(rules, code, kw, ctx, disqualifiers)
+            if result:
+                results.append(result)
         
         # Sort by confidence desc
         results.sort(key=lambda x: x['confidence'], reverse=True)
@@ -117,7 +63,223 @@ class ProductInferenceService:
         return results
 
     @classmethod
-    def get_top_recommendations(cls, text: str, limit: int = 3) -> List[Dict[str, Any]]:
+    def _score(cls, rules: CompiledProductRules, code: str, kw: Optional[str], ctx: Optional[str],
+               disqualifiers: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Result entry for one product from its matched terms, or None below the threshold"""
+        rule = rules.rules[code]
+        confidence = 0.0
+        reasons = []
+        
+        # Check direct keywords (High impact)
+        if kw:
+            confidence += rules.KEYWORD_WEIGHT
+            reasons.append(f"Matched keyword: '{kw}'")
+        
+        # Check context keywords (Medium impact)
+        if ctx:
+            confidence += rules.CONTEXT_WEIGHT
+            reasons.append(f"Matched context: '{ctx}'")
+        
+        for term in disqualifiers:
+            penalty = rule['disqualifiers'][term]
+            confidence += penalty
+            reasons.append(f"Disqualifier: '{term}' ({penalty:+.2f})")
+        
+        # Cap confidence at 1.0
+        confidence = min(confidence, 1.0)
+        
+        if confidence < rules.MIN_CONFIDENCE:
+            return None
+        return {
+            'code': code,
+            'name': rule['name'],
+            'confidence': round(confidence, 2),
+            'reasoning': '; '.join(reasons)
+        }
+
+    @classmethod
+    def infer_products_batch(cls, texts: List[str], rules: CompiledProductRules = None) -> List[List[Dict[str, Any]]]:
+        """
+        infer_products for many texts at once (e.g. re-inferring history).
+        Returns one result list per text, identical to infer_products(text, rules).
+
+        Distinct texts are scanned once, by one automaton over every product
+        term. The hits form a sparse texts x terms
+        matrix; per-product confidences come from matrix products with
+        NumPy/SciPy when installed (plain Python otherwise).
+        """
+        rules = rules or active_rules()
+        index = cls._batch_index(rules)
+        distinct = list(dict.fromkeys(text or '' for text in texts))
+        rows, cols = index.hits(distinct)
+        
+        if np is not None:
+            per_text = index.aggregate_sparse(len(distinct), rows, cols)
+        else:
+            per_text = index.aggregate(len(distinct), rows, cols)
+        
+        # Many texts share a result; build each distinct one once
+        built: Dict[tuple, List[Dict[str, Any]]] = {}
+        by_text = {}
+        for text, products in zip(distinct, per_text):
+            key = tuple(products)
+            results = built.get(key)
+            if results is None:
+                results = built[key] = cls._format_results(rules, index, products)
+            by_text[text] = results
+        
+        # Fresh dicts per text, so callers can modify one result freely
+        return [[dict(r) for r in by_text[text or '']] for text in texts]
+
+    @classmethod
+    def _format_results(cls, rules: CompiledProductRules, index: '_ProductTermIndex', products) -> List[Dict[str, Any]]:
+        """infer_products output from (product index, keyword, context, disqualifiers) candidates"""
+        results = []
+        for p, kw, ctx, disqualifiers in products:
+            result = cls._score(rules, index.codes[p], kw, ctx, disqualifiers)
+            if result:
+                results.append(result)
+        results.sort(key=lambda x: x['confidence'], reverse=True)
+        return results
+
+    @classmethod
+    def _batch_index(cls, rules: CompiledProductRules) -> '_ProductTermIndex':
+        if rules.term_index is None:
+            rules.term_index = _ProductTermIndex(rules)
+        return rules.term_index
+
+    @classmethod
+    def get_top_recommendations(cls, text: str, limit: int = 3, rules: CompiledProductRules = None) -> List[Dict[str, Any]]:
         """Get top N product recommendations"""
-        products = cls.infer_products(text)
+        products = cls.infer_products(text, rules)
         return products[:limit]
+
+
+class _ProductTermIndex:
+    """
+    Every product term as one matrix column (numbered in rule order: per
+    product its keywords, contexts, negative keywords, disqualifiers), and the
+    KeyScanner that finds them all, as SignalMatcher does.
+    """
+
+    KEYWORD, CONTEXT, NEGATIVE, DISQUALIFIER = range(4)
+    ROLES = 4
+
+    def __init__(self, rules: CompiledProductRules):
+        self.codes = list(rules.rules)
+        # column -> (product index, role, term, case_sensitive)
+        self.columns: List[Tuple[int, int, str, bool]] = []
+        self.penalties: List[float] = []
+        by_key: Dict[str, List[int]] = {}
+        for p, code in enumerate(self.codes):
+            rule = rules.rules[code]
+            disqualifiers = rule.get('disqualifiers', {})
+            for role, terms in ((self.KEYWORD, rule['keywords']), (self.CONTEXT, rule['contexts']),
+                                (self.NEGATIVE, rule.get('negative_keywords', [])),
+                                (self.DISQUALIFIER, list(disqualifiers))):
+                for term in terms:
+                    if not term or not term.strip():
+                        continue
+                    by_key.setdefault(SignalMatcher.term_key(term), []).append(len(self.columns))
+                    self.columns.append((p, role, term.strip(), SignalMatcher.is_case_sensitive(term)))
+                    self.penalties.append(disqualifiers[term] if role == self.DISQUALIFIER else 0.0)
+        self.weights = (rules.KEYWORD_WEIGHT, rules.CONTEXT_WEIGHT, rules.MIN_CONFIDENCE)
+
+        self.key_columns = by_key
+        # Case-sensitive columns -> regex finding the term in the original text
+        self.capitals = {col: SignalMatcher.whole_word(entry[2])
+                         for col, entry in enumerate(self.columns) if entry[3]}
+        self.scanner = KeyScanner(by_key)
+
+    def hits(self, texts: List[str]) -> Tuple[List[int], List[int]]:
+        """(row, column) of every term hit"""
+        rows: List[int] = []
+        cols: List[int] = []
+        key_columns, capitals = self.key_columns, self.capitals
+        for row, text in enumerate(texts):
+            for key in self.scanner.scan(text.lower()):
+                for col in key_columns[key]:
+                    if col in capitals and not capitals[col].search(text):
+                        continue
+                    rows.append(row)
+                    cols.append(col)
+        return rows, cols
+
+    def aggregate(self, n: int, rows: List[int], cols: List[int]) -> List[List[tuple]]:
+        """
+        Per text: (product index, first keyword, first context, disqualifiers)
+        for every product not discarded by a negative keyword, in product order
+        """
+        matched: List[Dict[int, List]] = [{} for _ in range(n)]
+        for row, col in sorted(set(zip(rows, cols))):
+            p, role, term, _ = self.columns[col]
+            slot = matched[row].setdefault(p, [None, None, False, []])
+            if role == self.DISQUALIFIER:
+                slot[3].append(term)
+            elif role == self.NEGATIVE:
+                slot[2] = True
+            elif slot[role] is None:
+                slot[role] = term
+
+        return [[(p, kw, ctx, tuple(disqualifiers))
+                 for p, (kw, ctx, negative, disqualifiers) in sorted(products.items())
+                 if not negative and (kw or ctx)]
+                for products in matched]
+
+    def aggregate_sparse(self, n: int, rows: List[int], cols: List[int]) -> List[List[tuple]]:
+        """
+        aggregate() with the hit matrix reduced by NumPy/SciPy ops; products
+        that cannot reach the confidence threshold are left out
+        """
+        num_products = len(self.codes)
+        results: List[List] = [[] for _ in range(n)]
+        if not rows:
+            return results
+
+        rows_a = np.asarray(rows, dtype=np.int64)
+        cols_a = np.asarray(cols, dtype=np.int64)
+        col_group = np.array([self.ROLES * p + role for p, role, _, _ in self.columns], dtype=np.int64)
+
+        # texts x terms hit matrix (0/1), reduced to texts x (product, role)
+        # hit counts and texts x product penalties
+        hits = sparse.csr_matrix((np.ones(len(rows_a), dtype=np.int32), (rows_a, cols_a)),
+                                 shape=(n, len(self.columns)))
+        hits.data[:] = 1
+        membership = sparse.csr_matrix(
+            (np.ones(len(self.columns), dtype=np.int32), (np.arange(len(self.columns)), col_group)),
+            shape=(len(self.columns), self.ROLES * num_products)
+        )
+        has = (hits @ membership).toarray() > 0
+        penalty_matrix = sparse.csr_matrix(
+            (np.asarray(self.penalties, dtype=np.float64), (np.arange(len(self.columns)), col_group // self.ROLES)),
+            shape=(len(self.columns), num_products)
+        )
+        penalty = (hits.astype(np.float64) @ penalty_matrix).toarray()
+
+        keyword_weight, context_weight, min_confidence = self.weights
+        confidence = np.minimum(keyword_weight * has[:, self.KEYWORD::self.ROLES]
+                                + context_weight * has[:, self.CONTEXT::self.ROLES] + penalty, 1.0)
+        # Slack so float summation order never drops a product the exact score keeps
+        candidates = (confidence >= min_confidence - 1e-9) & ~has[:, self.NEGATIVE::self.ROLES]
+
+        # First matched column (rule order) per text and (product, role)
+        groups = rows_a * (self.ROLES * num_products) + col_group[cols_a]
+        order = np.lexsort((cols_a, groups))
+        unique_groups, first = np.unique(groups[order], return_index=True)
+        first_col = dict(zip(unique_groups.tolist(), cols_a[order][first].tolist()))
+
+        # Every matched disqualifier (rare), in rule order
+        group_cols: Dict[int, List[int]] = {}
+        disqualified = (col_group[cols_a] % self.ROLES) == self.DISQUALIFIER
+        for group, col in sorted(set(zip(groups[disqualified].tolist(), cols_a[disqualified].tolist()))):
+            group_cols.setdefault(group, []).append(col)
+
+        terms = [entry[2] for entry in self.columns]
+        for row, p in zip(*(a.tolist() for a in np.nonzero(candidates))):
+            base = (row * num_products + p) * self.ROLES
+            kw = first_col.get(base + self.KEYWORD)
+            ctx = first_col.get(base + self.CONTEXT)
+            results[row].append((p, terms[kw] if kw is not None else None,
+                                 terms[ctx] if ctx is not None else None,
+                                 tuple(terms[c] for c in group_cols.get(base + self.DISQUALIFIER, ()))))
+        return results
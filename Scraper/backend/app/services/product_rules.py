@@ -0,0 +1,229 @@
+"""
+Product Rules
+The product inference rule set. Rules live in the `products` table (edited
+via PUT /api/products/{code}/rules); each version is compiled once and
+swapped in atomically in every process that infers products.
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List
+
+from .signal_matcher import SignalMatcher
+
+# Built-in rules: seeded into `products` by backend/scripts/seed_data.py and
+# used as-is while the table is empty.
+#   keywords           direct product mentions (+0.6)
+#   contexts           usage contexts (+0.3)
+#   negative_keywords  any hit discards the product for that signal
+#   disqualifiers      phrase -> penalty added to the confidence
+# The products table's base_confidence_rules (confidence per named scenario,
+# e.g. 'explicitTenderWithVolume') is reference data for reviewers; inference
+# can't tell those scenarios apart, so it doesn't read them.
+DEFAULT_PRODUCT_RULES: Dict[str, Dict[str, Any]] = {
+    'FO': {
+        'name': 'Furnace Oil',
+        'category': 'Fuels',
+        'keywords': ['furnace oil', 'fuel oil', 'bunker fuel', 'heavy oil', 'fo 180', 'fo 380'],
+        'contexts': ['boiler', 'heating', 'power plant', 'thermal', 'kiln', 'furnace'],
+        'negative_keywords': ['automotive', 'vehicle'],
+        'disqualifiers': {'coal fired': -0.3, 'gas based': -0.4}
+    },
+    'LSHS': {
+        'name': 'Low Sulphur Heavy Stock',
+        'category': 'Fuels',
+        'keywords': ['lshs', 'low sulphur heavy stock', 'low sulfur heavy stock'],
+        'contexts': ['fertilizer', 'power generation', 'low emission', 'sulfur limit'],
+        'negative_keywords': [],
+        'disqualifiers': {}
+    },
+    'HSD': {
+        'name': 'High Speed Diesel',
+        'category': 'Fuels',
+        'keywords': ['hsd', 'high speed diesel', 'diesel', 'gas oil'],
+        'contexts': ['transport', 'genset', 'generator', 'backup power', 'mining', 'fleet'],
+        'negative_keywords': ['retail', 'petrol pump', 'filling station'],
+        'disqualifiers': {}
+    },
+    'LDO': {
+        'name': 'Light Diesel Oil',
+        'category': 'Fuels',
+        'keywords': ['ldo', 'light diesel oil'],
+        'contexts': ['pump', 'lift irrigation', 'small boiler', 'diesel engine'],
+        'negative_keywords': [],
+        'disqualifiers': {}
+    },
+    'BITUMEN': {
+        'name': 'Bitumen',
+        'category': 'Specialty',
+        'keywords': ['bitumen', 'asphalt', 'road tar', 'vg 30', 'vg 10', 'vg 40'],
+        'contexts': ['road construction', 'highway', 'paving', 'infrastructure', 'waterproofing'],
+        'negative_keywords': ['patch work', 'minor maintenance'],
+        'disqualifiers': {}
+    },
+    'HEXANE': {
+        'name': 'Hexane',
+        'category': 'Specialty',
+        'keywords': ['hexane', 'food grade hexane'],
+        'contexts': ['solvent extraction', 'vegetable oil', 'pharma', 'polymer'],
+        'negative_keywords': [],
+        'disqualifiers': {}
+    },
+    'MTO': {
+        'name': 'Mineral Turpentine Oil',
+        'category': 'Specialty',
+        'keywords': ['mto', 'mineral turpentine oil', 'white spirit'],
+        'contexts': ['paint', 'varnish', 'dry cleaning', 'degreasing'],
+        'negative_keywords': [],
+        'disqualifiers': {}
+    },
+    'JBO': {
+        'name': 'Jute Batching Oil',
+        'category': 'Specialty',
+        'keywords': ['jbo', 'jute batching oil'],
+        'contexts': ['jute', 'textile mill', 'fiber processing'],
+        'negative_keywords': [],
+        'disqualifiers': {}
+    },
+    'MS': {
+        'name': 'Motor Spirit (Petrol)',
+        'category': 'Fuels',
+        'keywords': ['motor spirit', 'MS', 'petrol', 'gasoline'],
+        'contexts': ['fleet', 'vehicles', 'transportation'],
+        'negative_keywords': ['retail pump'],
+        'disqualifiers': {}
+    },
+    'LUBRICANTS': {
+        'name': 'Lubricants',
+        'category': 'Lubricants',
+        'keywords': ['lubricant', 'engine oil', 'grease', 'HP Racer', 'HP Milcy'],
+        'contexts': ['maintenance', 'machinery', 'industrial oil'],
+        'negative_keywords': [],
+        'disqualifiers': {}
+    }
+}
+
+
+def disqualifier_phrase(key: str) -> str:
+    """Disqualifier keys may be camelCase like the frontend's ('coalFired' -> 'coal fired')"""
+    key = key.strip()
+    if ' ' in key:
+        return key
+    return re.sub(r'(?<=[a-z0-9])(?=[A-Z])', ' ', key).lower()
+
+
+def rules_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Inference rules from `products` rows (JSON columns as stored)"""
+    def parse(value, default):
+        try:
+            return json.loads(value) if value else default
+        except (TypeError, ValueError):
+            return default
+
+    rules = {}
+    for row in rows:
+        rules[row['code']] = {
+            'name': row['name'],
+            'category': row['category'],
+            'keywords': parse(row['primary_keywords'], []),
+            'contexts': parse(row['secondary_keywords'], []),
+            'negative_keywords': parse(row['negative_keywords'], []),
+            'disqualifiers': {disqualifier_phrase(k): float(v)
+                              for k, v in parse(row['disqualifiers'], {}).items()}
+        }
+    return rules
+
+
+class CompiledProductRules:
+    """
+    One version of the rule set with its keyword matcher built. Never mutated
+    after construction, so a reader holding it sees one consistent version
+    while a newer one is swapped in.
+    """
+
+    KEYWORD_WEIGHT = 0.6
+    CONTEXT_WEIGHT = 0.3
+    MIN_CONFIDENCE = 0.4  # Low confidence matches are still returned, for review
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]], version: int = 0):
+        self.version = version
+        self.rules = rules
+        self.matcher = SignalMatcher()
+        # code -> its matcher categories: (negative, keyword, context, disqualifier)
+        self.categories = {code: (f'negative:{code}', f'keyword:{code}', f'context:{code}', f'disqualifier:{code}')
+                           for code in rules}
+        for code, rule in rules.items():
+            negative, keyword, context, disqualifier = self.categories[code]
+            self.matcher.register_many({
+                keyword: rule['keywords'],
+                context: rule['contexts'],
+                negative: rule.get('negative_keywords', []),
+                disqualifier: list(rule.get('disqualifiers', {}))
+            })
+        self.matcher.scan('')  # Compile now rather than on the first signal
+        # Batch index (ProductInferenceService.infer_products_batch), built on first use
+        self.term_index = None
+
+
+_active = CompiledProductRules(DEFAULT_PRODUCT_RULES)
+
+
+def active_rules() -> CompiledProductRules:
+    """Rule set used when a caller doesn't pass one"""
+    return _active
+
+
+def activate(compiled: CompiledProductRules):
+    global _active
+    _active = compiled
+
+
+class ProductRuleEngine:
+    """
+    Keeps a process on the current version of the `products` rules.
+
+    The 'product_rules' cache version is checked at most every
+    VERSION_CHECK_SECONDS; when it moved, the rules are reloaded, compiled
+    and activated with one reference swap. Signals being inferred at that
+    moment finish on the version they started with.
+    """
+
+    VERSION_CHECK_SECONDS = 5
+
+    def __init__(self, db):
+        self.db = db
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self, force: bool = False) -> CompiledProductRules:
+        now = time.monotonic()
+        if not force and self._version is not None and now - self._checked_at < self.VERSION_CHECK_SECONDS:
+            return _active
+
+        with self._lock:
+            self._checked_at = now
+            version = self.db.get_cache_version('product_rules')
+            if version != self._version:
+                activate(self.load(version))
+                self._version = version
+                print(f"🔄 Product rules v{version} active ({len(_active.rules)} products)")
+        return _active
+
+    def load(self, version: int) -> CompiledProductRules:
+        conn = self.db.get_connection()
+        conn.row_factory = None
+        rows = conn.execute('''
+            SELECT code, name, category, primary_keywords,
+                   secondary_keywords, negative_keywords, disqualifiers
+            FROM products
+            ORDER BY id
+        ''').fetchall()
+        conn.close()
+
+        columns = ['code', 'name', 'category', 'primary_keywords',
+                   'secondary_keywords', 'negative_keywords', 'disqualifiers']
+        rules = rules_from_rows([dict(zip(columns, row)) for row in rows])
+        return CompiledProductRules(rules or DEFAULT_PRODUCT_RULES, version)
@@ -0,0 +1,110 @@
+"""
+Resolution Cache
+Remembers which company a raw scraped name resolved to, so repeat names skip
+normalization, alias lookup and fuzzy matching entirely.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class ResolutionCache:
+    """
+    Two-level raw name -> company_id cache.
+
+    An in-process LRU sits in front of the `company_resolution_cache` table,
+    which every scraper process shares through the database. Table rows stay
+    valid across merges (dedup_companies.py repoints them) and are cleared
+    when aliases change. The LRU is dropped whenever the 'companies' or
+    'company_aliases' cache version moves, checked at most every
+    VERSION_CHECK_SECONDS so hits don't cost a round trip each.
+    """
+
+    MAX_SIZE = int(os.getenv("RESOLUTION_CACHE_SIZE", "50000"))
+    VERSION_CHECK_SECONDS = 5
+
+    def __init__(self, db, max_size: int = None):
+        self.db = db
+        self.max_size = max_size or self.MAX_SIZE
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+        self.reset_stats()
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.VERSION_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        version = (self.db.get_cache_version('companies'), self.db.get_cache_version('company_aliases'))
+        if version != self._version:
+            self._lru.clear()
+            self._version = version
+
+    def _remember(self, name: str, company_id: int):
+        self._lru[name] = company_id
+        self._lru.move_to_end(name)
+        if len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def get(self, name: str) -> Optional[int]:
+        """Cached company id for a raw name, or None"""
+        if not name:
+            return None
+        self._sync()
+
+        company_id = self._lru.get(name)
+        if company_id is not None:
+            self._lru.move_to_end(name)
+            self.memory_hits += 1
+            return company_id
+
+        conn = self.db.get_connection()
+        row = conn.execute('SELECT company_id FROM company_resolution_cache WHERE raw_name = ?',
+                           (name,)).fetchone()
+        conn.close()
+        if row:
+            self._remember(name, row[0])
+            self.db_hits += 1
+            return row[0]
+
+        self.misses += 1
+        return None
+
+    def put(self, name: str, company_id: int):
+        """Record a resolution (shared with other processes)"""
+        if not name or company_id is None:
+            return
+        conn = self.db.get_connection()
+        conn.execute('''INSERT INTO company_resolution_cache (raw_name, company_id, created_at) VALUES (?, ?, ?)
+                        ON CONFLICT(raw_name) DO UPDATE SET company_id = excluded.company_id''',
+                     (name, company_id, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        self._remember(name, company_id)
+
+    def reset_stats(self):
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.db_hits + self.misses
+        hits = self.memory_hits + self.db_hits
+        return {
+            'lookups': lookups,
+            'memory_hits': self.memory_hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'resident': len(self._lru)
+        }
+
+    def take_stats(self) -> Dict[str, Any]:
+        """Stats since the last call (one scrape cycle), then reset"""
+        stats = self.stats()
+        self.reset_stats()
+        return stats
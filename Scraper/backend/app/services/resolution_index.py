@@ -0,0 +1,96 @@
+"""
+Resolution Index
+Resident in-memory index of company names for entity resolution.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Iterable, Tuple
+
+
+class CompanyResolutionIndex:
+    """
+    In-memory index over `companies.normalized_name`.
+
+    - `exact`: normalized name -> company id (hash lookup)
+    - `blocks`: blocking key (a token, or a token's 4-char prefix/suffix so a
+      typo inside the word still collides) -> ids of companies with that key,
+      used to retrieve fuzzy-match candidates without scanning every company
+
+    The index is loaded once and then kept current incrementally: `refresh`
+    indexes rows above `max_id`, whichever process inserted them.
+    """
+
+    def __init__(self, companies: Iterable[Tuple[int, str]] = ()):
+        self.exact: Dict[str, int] = {}
+        self.names: Dict[int, str] = {}
+        self.blocks: Dict[str, List[int]] = {}
+        self.max_id = 0
+
+        for company_id, normalized in companies:
+            self.add(company_id, normalized)
+
+    PREFIX_LENGTH = 4
+
+    @classmethod
+    def block_keys(cls, text: str) -> set:
+        """Blocking keys of a normalized name: its tokens, their prefixes and suffixes"""
+        keys = set()
+        for token in text.split():
+            keys.add(token)
+            if len(token) > cls.PREFIX_LENGTH:
+                keys.add(token[:cls.PREFIX_LENGTH] + '~')
+                keys.add('~' + token[-cls.PREFIX_LENGTH:])
+        return keys
+
+    def add(self, company_id: int, normalized: Optional[str]):
+        """Index one company (no-op for already-indexed ids)"""
+        if company_id in self.names:
+            return
+        self.max_id = max(self.max_id, company_id)
+        if not normalized:
+            return
+
+        self.names[company_id] = normalized
+        # Keep the oldest company for a name, like the ORDER BY-less SQL lookup did
+        self.exact.setdefault(normalized, company_id)
+        for key in self.block_keys(normalized):
+            self.blocks.setdefault(key, []).append(company_id)
+
+    def refresh(self, db_instance):
+        """Index companies inserted since the last load (by any process)"""
+        conn = db_instance.get_connection()
+        c = conn.cursor()
+        c.execute("SELECT id, normalized_name FROM companies WHERE id > ? ORDER BY id", (self.max_id,))
+        for company_id, normalized in c.fetchall():
+            self.add(company_id, normalized)
+        conn.close()
+
+    def lookup_exact(self, normalized: str) -> Optional[int]:
+        return self.exact.get(normalized)
+
+    def candidates(self, normalized: str, limit: int = 10, probes: int = 6,
+                   max_posting: int = 2000) -> List[int]:
+        """
+        Blocking step for fuzzy matching: ids of up to `limit` companies that
+        share the most blocking keys with `normalized`.
+
+        Only the `probes` rarest keys are looked up, and keys shared by more
+        than `max_posting` companies ("india", "steel", ...) are skipped as they
+        carry little signal, so the cost per lookup stays bounded however large
+        the table grows.
+        """
+        postings = []
+        for key in self.block_keys(normalized):
+            posting = self.blocks.get(key)
+            if posting and len(posting) <= max_posting:
+                postings.append(posting)
+        postings.sort(key=len)
+
+        shared = Counter()
+        for posting in postings[:probes]:
+            shared.update(posting)
+
+        return [company_id for company_id, _ in shared.most_common(limit)]
+
+    def __len__(self):
+        return len(self.names)
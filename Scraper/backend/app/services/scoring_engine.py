@@ -2,11 +2,17 @@
 Scoring Engine
 Calculates lead score based on multiple factors:
 Score(L) = w1*Intent + w2*Freshness + w3*Size + w4*Geography
+
+Only freshness changes after a lead is stored. Leads keep the rest as
+`static_score`, and the live score is computed at read time by the
+`lead_score` SQL function (see live_score).
 """
 
 from datetime import datetime
 import math
 
+from .signal_matcher import signals
+
 class ScoringEngine:
     """
     Engine to calculate lead scores.
@@ -20,6 +26,13 @@ class ScoringEngine:
         'geography': 0.1
     }
     
+    # Keywords indicating scale, checked largest first
+    SIZE_INDICATORS = {
+        'huge': (1.0, ['billion', 'mega project', 'massive expansion', 'integrated plant']),
+        'large': (0.7, ['million', 'crore', 'large scale', 'capacity expansion']),
+        'medium': (0.4, ['sme', 'mid-sized', 'growing'])
+    }
+    
     # Intent Scores
     INTENT_SCORES = {
         'tender': 1.0,
@@ -31,7 +44,7 @@ class ScoringEngine:
     }
     
     @staticmethod
-    def calculate_freshness(scraped_at_iso: str) -> float:
+    def calculate_freshness(scraped_at_iso: str, now: datetime = None) -> float:
         """
         Calculate freshness score using exponential decay.
         Score = e^(-lambda * days)
@@ -39,7 +52,7 @@ class ScoringEngine:
         """
         try:
             scraped_at = datetime.fromisoformat(scraped_at_iso)
-            now = datetime.now()
+            now = now or datetime.now()
             days_diff = (now - scraped_at).days
             
             # Ensure non-negative
@@ -50,35 +63,54 @@ class ScoringEngine:
             return round(score, 2)
         except Exception:
             return 1.0 # Default to fresh if error
+
+    @classmethod
+    def calculate_static_score(cls, breakdown: dict) -> float:
+        """The part of the score that doesn't change with time (intent, size, geography)"""
+        return (
+            (cls.WEIGHTS['intent'] * breakdown.get('intent', 0.0)) +
+            (cls.WEIGHTS['size'] * breakdown.get('size', 0.0)) +
+            (cls.WEIGHTS['geography'] * breakdown.get('geography', 0.0))
+        )
+
+    @classmethod
+    def live_score(cls, static_score: float, scraped_at_iso: str, now: datetime = None) -> float:
+        """Score as of `now`: the stored static part plus current freshness"""
+        if static_score is None:
+            return None
+        freshness = cls.calculate_freshness(scraped_at_iso, now)
+        return round(static_score + cls.WEIGHTS['freshness'] * freshness, 2)
             
-    @staticmethod
-    def calculate_size_proxy(text: str) -> float:
+    @classmethod
+    def calculate_size_proxy(cls, text: str) -> float:
         """
         Estimate company size from text mentions.
         Returns 0.0 to 1.0
         """
-        text_lower = text.lower()
-        
-        # Keywords indicating scale
-        huge_indicators = ['billion', 'mega project', 'massive expansion', 'integrated plant']
-        large_indicators = ['million', 'crore', 'large scale', 'capacity expansion']
-        medium_indicators = ['sme', 'mid-sized', 'growing']
-        
-        if any(i in text_lower for i in huge_indicators):
-            return 1.0
-        if any(i in text_lower for i in large_indicators):
-            return 0.7
-        if any(i in text_lower for i in medium_indicators):
-            return 0.4
+        tier = signals.first(text, [f'size:{tier}' for tier in cls.SIZE_INDICATORS])
+        if tier:
+            return cls.SIZE_INDICATORS[tier.split(':', 1)[1]][0]
             
         return 0.2 # Default baseline
         
-    @staticmethod
-    def calculate_geo_score(lead_location: str, territory: str = None) -> float:
+    # Geography: full marks within GEO_NEAR_KM of the routed depot (or inside
+    # its coverage areas), falling linearly to GEO_MIN_SCORE at GEO_FAR_KM
+    GEO_NEAR_KM = 50
+    GEO_FAR_KM = 500
+    GEO_MIN_SCORE = 0.2
+
+    @classmethod
+    def calculate_geo_score(cls, lead_location: str = None, territory: str = None, route: dict = None) -> float:
         """
-        Calculate geographic relevance.
-        Placeholder logic: 1.0 if match, 0.5 if unknown.
+        Calculate geographic relevance from the lead's territory route
+        (see TerritoryRouter); 0.5 if unknown.
         """
+        if route and route.get('territory') and route.get('covered'):
+            return 1.0
+        if route and route.get('distance_km') is not None:
+            span = (route['distance_km'] - cls.GEO_NEAR_KM) / (cls.GEO_FAR_KM - cls.GEO_NEAR_KM)
+            return round(1.0 - (1.0 - cls.GEO_MIN_SCORE) * min(max(span, 0.0), 1.0), 2)
+
         if not lead_location or not territory:
             return 0.5
             
@@ -89,7 +121,7 @@ class ScoringEngine:
 
     @classmethod
     def calculate_score(cls, signal_type: str, scraped_at: str, 
-                       signal_text: str, location: str = None) -> dict:
+                       signal_text: str, location: str = None, route: dict = None) -> dict:
         """
         Calculate composite score and return breakdown.
         """
@@ -103,7 +135,7 @@ class ScoringEngine:
         size_score = cls.calculate_size_proxy(signal_text)
         
         # 4. Geography Score
-        geo_score = cls.calculate_geo_score(location)
+        geo_score = cls.calculate_geo_score(location, route=route)
         
         # Weighted Sum
         final_score = (
@@ -115,6 +147,9 @@ class ScoringEngine:
         
         return {
             'final_score': round(final_score, 2),
+            'static_score': cls.calculate_static_score({
+                'intent': intent_score, 'size': size_score, 'geography': geo_score
+            }),
             'breakdown': {
                 'intent': intent_score,
                 'freshness': freshness_score,
@@ -122,3 +157,6 @@ class ScoringEngine:
                 'geography': geo_score
             }
         }
+
+
+signals.register_many({f'size:{tier}': keywords for tier, (_, keywords) in ScoringEngine.SIZE_INDICATORS.items()})
@@ -0,0 +1,277 @@
+"""
+Signal Matcher
+One keyword scan over every keyword list used on the scraping hot path
+(relevance, products, industries, size indicators), so each text is read
+once and every consumer reads its hits from the same result.
+"""
+
+import re
+import threading
+import weakref
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .gazetteer import AhoCorasick
+
+_WORD = re.compile(r'\w+')
+# Stands in for punctuation in the text KeyScanner scans
+_SEPARATOR = '\x01'
+
+
+class KeyScanner:
+    """
+    Finds which of a fixed set of term keys occur in a lowercased text as
+    whole words, a plural "s"/"es" allowed after the last word.
+
+    The text is copied with whitespace turned into spaces and every other
+    non-word character into a separator, and run through one Aho-Corasick
+    automaton (see gazetteer) over each key in that form, between word
+    boundaries, so keys only ever hit as whole words. Whitespace runs are
+    collapsed first, so a phrase matches across line breaks. Keys with
+    punctuation inside ("mid-sized") are confirmed with their own regex.
+    Keys not starting with a word character never match.
+    """
+
+    PLURAL_ENDINGS = ('s', 'es')
+    # ASCII whitespace to a space, every other ASCII character \w does not match to the separator
+    _SPLIT = {i: ' ' if chr(i).isspace() else _SEPARATOR for i in range(128) if not re.match(r'\w', chr(i))}
+    _NON_WORD = re.compile(r'[^\w\s]')
+    _SPACE = re.compile(r'\s')
+
+    def __init__(self, keys: Iterable[str]):
+        self.automaton = AhoCorasick()
+        plural = '|'.join(self.PLURAL_ENDINGS)
+        # pattern -> ([keys it matches], [(key, regex confirming it at the hit)])
+        patterns: Dict[str, Tuple[List[str], List[Tuple[str, re.Pattern]]]] = {}
+        for key in sorted(set(keys)):
+            if not _WORD.match(key):
+                continue
+            body = self.spaced(key)[1:-1]
+            confirm = None
+            if _SEPARATOR in body:
+                escaped = r'\s+'.join(re.escape(part) for part in key.split(' '))
+                confirm = re.compile(rf'{escaped}(?:{plural})?(?!\w)')
+            for ending in ('',) + self.PLURAL_ENDINGS:
+                for left in (' ', _SEPARATOR):
+                    for right in (' ', _SEPARATOR):
+                        keys_matched, confirms = patterns.setdefault(f'{left}{body}{ending}{right}', ([], []))
+                        if confirm:
+                            confirms.append((key, confirm))
+                        else:
+                            keys_matched.append(key)
+        for pattern, (keys_matched, confirms) in patterns.items():
+            self.automaton.add(pattern, (tuple(keys_matched), tuple(confirms)))
+        self.automaton.build()
+
+    @classmethod
+    def spaced(cls, lowered: str) -> str:
+        """`lowered` in scanning form, padded by one space each side"""
+        if lowered.isascii():
+            return f' {lowered.translate(cls._SPLIT)} '
+        return f' {cls._SPACE.sub(" ", cls._NON_WORD.sub(_SEPARATOR, lowered))} '
+
+    def scan(self, lowered: str) -> Set[str]:
+        """Keys found in `lowered`"""
+        spaced = self.spaced(lowered)
+        if '  ' in spaced:
+            # A whitespace run (or leading/trailing whitespace); collapse it so phrases match across it
+            lowered = ' '.join(lowered.split())
+            spaced = self.spaced(lowered)
+        hits = self.automaton.find_all(spaced)
+        found = {key for _, (keys, _) in hits for key in keys}
+        for start, (_, confirms) in hits:
+            for key, confirm in confirms:
+                # The hit starts at the boundary before the key: `start` in `lowered`, less the padding
+                if key not in found and confirm.match(lowered, start):
+                    found.add(key)
+        return found
+
+
+class _SharedScan:
+    """
+    One KeyScanner over the term keys of every live SignalMatcher, so a text
+    is scanned once however many matchers (the shared one, each product rule
+    version) read it. Rebuilt, under a new generation number, on the first
+    scan after a matcher's terms change.
+    """
+
+    CACHE_SIZE = 256
+
+    def __init__(self):
+        self._matchers = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._scanner = None  # (generation, KeyScanner)
+        self._keys = lru_cache(maxsize=self.CACHE_SIZE)(self._keys_uncached)
+
+    def changed(self, matcher: 'SignalMatcher'):
+        with self._lock:
+            self._matchers.add(matcher)
+            self._generation += 1
+            self._scanner = None
+        self._keys.cache_clear()
+
+    def scanner(self) -> Tuple[int, KeyScanner]:
+        scanner = self._scanner
+        if scanner is None:
+            with self._lock:
+                if self._scanner is None:
+                    keys = {key for matcher in list(self._matchers) for key in matcher.keys()}
+                    self._scanner = (self._generation, KeyScanner(keys))
+                scanner = self._scanner
+        return scanner
+
+    def _keys_uncached(self, text: str) -> Tuple[int, FrozenSet[str]]:
+        generation, scanner = self.scanner()
+        return generation, frozenset(scanner.scan(text.lower()))
+
+    def keys(self, text: str) -> FrozenSet[str]:
+        """Keys, of any matcher, found in `text`"""
+        generation, keys = self._keys(text)
+        if generation != self._generation:
+            # Scanned (and cached) while a matcher was changing its terms
+            generation, keys = self._keys_uncached(text)
+        return keys
+
+
+_shared = _SharedScan()
+
+
+class SignalMatcher:
+    """
+    Categorized keyword matcher with word-boundary semantics.
+
+    Consumers register their keyword lists under a category name
+    (`signals.register('fuel', FUEL_KEYWORDS)`). The terms of every matcher
+    go into one KeyScanner, a single automaton pass per text, so a scan's
+    cost barely grows with the number of terms.
+
+    Matching is case-insensitive, except all-caps terms of up to
+    CASE_SENSITIVE_MAX_LENGTH characters ("MS", "FO", "IT"), which must
+    appear in capitals. Terms match whole words only, though a plural
+    "s"/"es" may follow ("boilers", "gensets").
+    """
+
+    CASE_SENSITIVE_MAX_LENGTH = 2
+    PLURAL_ENDINGS = KeyScanner.PLURAL_ENDINGS
+    CACHE_SIZE = 256
+
+    def __init__(self):
+        self._terms: Dict[str, List[str]] = {}
+        self._entries: Dict[str, List[Tuple[str, str, bool, int]]] = {}
+        self._plain: Dict[str, tuple] = {}
+        self._capitals: Dict[str, tuple] = {}
+        self._plain_keys = self._capital_keys = frozenset()
+        self._categories: Dict[str, Tuple[FrozenSet[str], tuple]] = {}
+        self._scan = lru_cache(maxsize=self.CACHE_SIZE)(self._scan_uncached)
+        _shared.changed(self)
+
+    @staticmethod
+    def term_key(term: str) -> str:
+        return re.sub(r'\s+', ' ', term).strip().lower()
+
+    @classmethod
+    def is_case_sensitive(cls, term: str) -> bool:
+        term = term.strip()
+        return term.isupper() and term.isalnum() and len(term) <= cls.CASE_SENSITIVE_MAX_LENGTH
+
+    @staticmethod
+    def whole_word(term: str) -> re.Pattern:
+        """Case-sensitive whole-word regex for a term (literal first, for a fast search)"""
+        return re.compile(rf'{re.escape(term)}(?!\w)(?<!\w{re.escape(term)})')
+
+    def keys(self) -> Iterable[str]:
+        return self._entries.keys()
+
+    def register(self, category: str, terms: Iterable[str]):
+        """Set the terms of a category (replacing any registered before)"""
+        self._terms[category] = [t for t in terms if t and t.strip()]
+
+        # key -> [(category, term, case_sensitive, registration order)]
+        entries: Dict[str, List[Tuple[str, str, bool, int]]] = {}
+        order = 0
+        for name, category_terms in self._terms.items():
+            for term in category_terms:
+                entries.setdefault(self.term_key(term), []).append(
+                    (name, term.strip(), self.is_case_sensitive(term), order)
+                )
+                order += 1
+        self._entries = entries
+
+        # key -> ((order, category, term), ...) of its case-insensitive terms and of
+        # its case-sensitive ones, with the regex finding them in the original text;
+        # category -> (case-insensitive keys, ((key, regex), ...)) for any() and first()
+        plain: Dict[str, list] = {}
+        capitals: Dict[str, list] = {}
+        categories = {name: (set(), []) for name in self._terms}
+        for key, key_entries in entries.items():
+            for name, term, case_sensitive, order in key_entries:
+                if case_sensitive:
+                    regex = self.whole_word(term)
+                    capitals.setdefault(key, []).append((order, name, term, regex))
+                    categories[name][1].append((key, regex))
+                else:
+                    plain.setdefault(key, []).append((order, name, term))
+                    categories[name][0].add(key)
+        self._plain = {key: tuple(hits) for key, hits in plain.items()}
+        self._capitals = {key: tuple(hits) for key, hits in capitals.items()}
+        self._plain_keys = frozenset(self._plain)
+        self._capital_keys = frozenset(self._capitals)
+        self._categories = {name: (frozenset(keys), tuple(terms)) for name, (keys, terms) in categories.items()}
+        self._scan.cache_clear()
+        _shared.changed(self)
+
+    def register_many(self, categories: Dict[str, Iterable[str]]):
+        for category, terms in categories.items():
+            self.register(category, terms)
+
+    def _scan_uncached(self, text: str) -> Dict[str, Tuple[str, ...]]:
+        keys = _shared.keys(text)
+        if not keys:
+            return {}
+
+        found = []
+        for key in keys & self._plain_keys:
+            found.extend(self._plain[key])
+        for key in keys & self._capital_keys:
+            found.extend(entry[:3] for entry in self._capitals[key] if entry[3].search(text))
+        found.sort()
+
+        result: Dict[str, List[str]] = {}
+        for _, category, term in found:
+            if category in result:
+                result[category].append(term)
+            else:
+                result[category] = [term]
+        return {category: tuple(terms) for category, terms in result.items()}
+
+    def scan(self, text: str) -> Dict[str, Tuple[str, ...]]:
+        """
+        Matched terms per category, in registration order:
+        {'fuel': ('diesel',), 'product:HSD': ('diesel',), ...}.
+        Results are cached per text; treat them as read-only.
+        """
+        return self._scan(text or '')
+
+    def matches(self, text: str, category: str) -> Tuple[str, ...]:
+        return self.scan(text).get(category, ())
+
+    def _has_hit(self, text: str, keys: FrozenSet[str], category: str) -> bool:
+        plain, capitals = self._categories.get(category, (frozenset(), ()))
+        return not plain.isdisjoint(keys) or any(key in keys and regex.search(text) for key, regex in capitals)
+
+    def any(self, text: str, *categories: str) -> bool:
+        """True if any of the categories has a hit in `text`"""
+        text = text or ''
+        keys = _shared.keys(text)
+        return any(self._has_hit(text, keys, category) for category in categories)
+
+    def first(self, text: str, categories: Iterable[str]) -> Optional[str]:
+        """First category, in the order given, with a hit in `text`"""
+        text = text or ''
+        keys = _shared.keys(text)
+        return next((category for category in categories if self._has_hit(text, keys, category)), None)
+
+
+# Shared instance; categories are registered by the modules that own the keywords
+signals = SignalMatcher()
@@ -0,0 +1,108 @@
+"""
+String Similarity
+Jaro-Winkler and token-level similarity for company name matching.
+Uses rapidfuzz's C implementation when it is installed.
+"""
+
+from functools import lru_cache
+from typing import List
+
+try:
+    from rapidfuzz.distance import JaroWinkler as _RapidJaroWinkler
+except ImportError:  # Optional accelerator
+    _RapidJaroWinkler = None
+
+
+def _jaro_winkler_py(s1: str, s2: str, prefix_weight: float = 0.1) -> float:
+    if s1 == s2:
+        return 1.0
+    len1, len2 = len(s1), len(s2)
+    if not len1 or not len2:
+        return 0.0
+
+    window = max(len1, len2) // 2 - 1
+    matched2 = [False] * len2
+    matches1 = []
+    for i, ch in enumerate(s1):
+        lo, hi = max(0, i - window), min(len2, i + window + 1)
+        for j in range(lo, hi):
+            if not matched2[j] and s2[j] == ch:
+                matched2[j] = True
+                matches1.append(ch)
+                break
+
+    m = len(matches1)
+    if not m:
+        return 0.0
+
+    matches2 = [s2[j] for j in range(len2) if matched2[j]]
+    transpositions = sum(a != b for a, b in zip(matches1, matches2)) / 2
+    jaro = (m / len1 + m / len2 + (m - transpositions) / m) / 3
+
+    prefix = 0
+    for a, b in zip(s1[:4], s2[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_weight * (1 - jaro)
+
+
+def jaro_winkler(s1: str, s2: str) -> float:
+    """Jaro-Winkler similarity in [0, 1]"""
+    if _RapidJaroWinkler is not None:
+        return _RapidJaroWinkler.similarity(s1, s2)
+    return _jaro_winkler_py(s1, s2)
+
+
+@lru_cache(maxsize=65536)
+def _token_score(token: str, other: str, token_threshold: float) -> float:
+    """Jaro-Winkler of two tokens, or 0.0 when they can't reach the threshold"""
+    if token == other:
+        return 1.0
+    # Upper bound on Jaro-Winkler from the lengths alone (all chars matching)
+    short, long_ = sorted((len(token), len(other)))
+    jaro_max = (1 + short / long_ + 1) / 3
+    if jaro_max + 0.4 * (1 - jaro_max) < token_threshold:
+        return 0.0
+    return jaro_winkler(token, other)
+
+
+def token_similarity(tokens1: List[str], tokens2: List[str], token_threshold: float = 0.9) -> float:
+    """
+    Soft Dice coefficient over tokens: each token counts by its best
+    Jaro-Winkler match in the other name (if >= token_threshold).
+
+    Unlike a token-set ratio, extra tokens lower the score, so
+    "tata power" vs "tata power renewable" is 0.8 rather than 1.0, while a
+    typo like "tata powr" vs "tata power" stays close to 1.0.
+    """
+    if not tokens1 or not tokens2:
+        return 0.0
+
+    remaining = list(tokens2)
+    total = 0.0
+    for token in tokens1:
+        best, best_idx = 0.0, -1
+        for idx, other in enumerate(remaining):
+            score = _token_score(token, other, token_threshold)
+            if score > best:
+                best, best_idx = score, idx
+                if score == 1.0:
+                    break
+        if best >= token_threshold:
+            total += best
+            remaining.pop(best_idx)
+
+    return 2 * total / (len(tokens1) + len(tokens2))
+
+
+def name_similarity(s1: str, s2: str) -> float:
+    """
+    Similarity of two normalized company names in [0, 1]: a weighted blend of
+    token similarity (0.6) and whole-string Jaro-Winkler (0.4).
+    """
+    if not s1 or not s2:
+        return 0.0
+    if s1 == s2:
+        return 1.0
+    return 0.6 * token_similarity(s1.split(), s2.split()) + 0.4 * jaro_winkler(s1, s2)
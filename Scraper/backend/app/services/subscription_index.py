@@ -0,0 +1,115 @@
+"""
+Subscription Index
+In-memory inverted index of officer alert subscriptions.
+"""
+
+import json
+from typing import Dict, Any, List, Optional, Iterable, Set
+
+
+class SubscriptionIndex:
+    """
+    Inverted index over users' alert preferences.
+
+    Each user is posted under (product, territory, confidence bucket) keys built
+    from the `products`, `territories` and `min_confidence` columns that
+    /api/alerts/preferences edits. An empty product/territory list subscribes to
+    everything and is posted under the '*' wildcard. Users are also posted
+    under (product, bucket) keys for leads without a territory. Matching a lead
+    only visits the keys it can hit, so cost grows with the number of matches
+    rather than the number of users or territories.
+    """
+
+    WILDCARD = '*'
+    BUCKETS = 10  # confidence buckets of width 0.1
+
+    def __init__(self, users: Iterable[Dict[str, Any]]):
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.postings: Dict[tuple, Set[int]] = {}
+        # (product, bucket) -> users with any territory subscription
+        self.any_territory: Dict[tuple, Set[int]] = {}
+
+        for user in users:
+            self._add(user)
+
+    @classmethod
+    def bucket(cls, confidence: float) -> int:
+        """Map a confidence in [0, 1] to its bucket"""
+        return max(0, min(cls.BUCKETS, int((confidence or 0.0) * cls.BUCKETS)))
+
+    @staticmethod
+    def _json_list(value: Optional[str]) -> List[str]:
+        try:
+            parsed = json.loads(value) if value else []
+            return parsed if isinstance(parsed, list) else []
+        except (TypeError, ValueError):
+            return []
+
+    @classmethod
+    def subscriber_from_row(cls, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the subscriber record (contact details + filters) for a users row"""
+        try:
+            prefs = json.loads(row.get('alert_preferences') or '{}')
+        except (TypeError, ValueError):
+            prefs = {}
+
+        phone = prefs.get('phone')
+        whatsapp = bool(phone) and bool(prefs.get('whatsapp_enabled') or row.get('push_enabled'))
+
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'email': row['email'] if row.get('email_enabled', 1) else None,
+            'phone': phone if whatsapp else None,
+            'min_confidence': row['min_confidence'] if row.get('min_confidence') is not None else 0.7,
+            'products': [p.upper() for p in cls._json_list(row.get('products'))],
+            'territories': [t.lower() for t in cls._json_list(row.get('territories'))]
+        }
+
+    def _add(self, row: Dict[str, Any]):
+        user = self.subscriber_from_row(row)
+        if not user['email'] and not user['phone']:
+            return  # No channel to reach this user on
+
+        self.users[user['id']] = user
+        bucket = self.bucket(user['min_confidence'])
+        for product in user['products'] or [self.WILDCARD]:
+            self.any_territory.setdefault((product, bucket), set()).add(user['id'])
+            for territory in user['territories'] or [self.WILDCARD]:
+                self.postings.setdefault((product, territory, bucket), set()).add(user['id'])
+
+    def match(self, products: List[str] = None, territory: str = None,
+              confidence: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Users to notify for a lead.
+
+        A user matches when the lead's confidence reaches their min_confidence,
+        one of the lead's products is subscribed (or they take all products),
+        and the lead's territory is subscribed (or they take all territories).
+        Territory extraction is best-effort, so a lead with no territory is
+        offered to every territory subscription.
+        """
+        product_keys = [p.upper() for p in products or []] + [self.WILDCARD]
+        buckets = range(self.bucket(confidence) + 1)
+        if territory:
+            territory_keys = [territory.lower(), self.WILDCARD]
+            postings = self.postings
+            keys = [(product, territory_key, bucket)
+                    for product in product_keys for territory_key in territory_keys for bucket in buckets]
+        else:
+            postings = self.any_territory
+            keys = [(product, bucket) for product in product_keys for bucket in buckets]
+
+        matched = set()
+        for key in keys:
+            posting = postings.get(key)
+            if posting:
+                matched |= posting
+
+        return [
+            dict(self.users[user_id]) for user_id in sorted(matched)
+            if self.users[user_id]['min_confidence'] <= confidence
+        ]
+
+    def __len__(self):
+        return len(self.users)
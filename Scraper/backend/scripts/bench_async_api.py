@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+API concurrency: does a slow query hold up other requests?
+
+Fills a scratch database with leads, then fires a burst of concurrent
+dashboard/stats requests (the heaviest endpoint) at the app in-process
+while a client keeps polling a cheap endpoint (/api/auth/me). Runs once
+with repository calls executed inline on the event loop (how routers used
+to call sqlite3) and once on the DB thread pool, where the dashboard runs
+on the 'reports' lane.
+
+Usage: python backend/scripts/bench_async_api.py [leads] [concurrent]   (defaults: 100000 16)
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench_async_api.db')
+
+import httpx
+
+from backend.app.main import app
+from backend.app.models.database import db
+from backend.app.repositories import base
+from backend.app.utils.security import create_access_token, get_password_hash
+
+run_on_pool = base.run_db
+
+
+async def run_inline(fn, *args, lane='default', **kwargs):
+    return fn(*args, **kwargs)
+
+
+def fill(leads):
+    rng = random.Random(3)
+    company_id = db.insert_company('Bench Ltd')
+    now = datetime.now()
+    conn = db.get_connection()
+    conn.executemany('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url,
+                                           scraped_at, static_score, products_mentioned)
+                        VALUES (?, 'bench', 'news', 'bench', 'https://example.com', ?, ?, '["HSD"]')''',
+                     [(company_id, (now - timedelta(days=rng.uniform(0, 60))).isoformat(), rng.uniform(0.2, 0.7))
+                      for _ in range(leads)])
+    conn.commit()
+    conn.close()
+    user_id = db.create_user('bench@example.com', get_password_hash('bench'), 'Bench', 'ADMIN')
+    return {'Authorization': f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+
+
+async def measure(headers, concurrent):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        done = asyncio.Event()
+        pings = []
+
+        async def poll():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get('/api/auth/me', headers=headers)
+                pings.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.005)
+
+        async def dashboard():
+            response = await client.get('/api/dashboard/stats?dateRange=90d', headers=headers)
+            response.raise_for_status()
+
+        poller = asyncio.create_task(poll())
+        start = time.perf_counter()
+        await asyncio.gather(*(dashboard() for _ in range(concurrent)))
+        wall = time.perf_counter() - start
+        done.set()
+        await poller
+
+    pings.sort()
+    return wall, len(pings), pings[len(pings) // 2], pings[-1]
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    concurrent = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    headers = fill(leads)
+
+    print("=" * 72)
+    print(f"{concurrent} concurrent /api/dashboard/stats over {leads:,} leads, polling /api/auth/me")
+    print("=" * 72)
+    print(f"{'':<10} {'burst wall s':>13} {'polls':>7} {'poll p50 ms':>12} {'poll max ms':>12}")
+    for label, runner in (('inline', run_inline), ('db pool', run_on_pool)):
+        base.run_db = runner
+        wall, polls, p50, worst = asyncio.run(measure(headers, concurrent))
+        print(f"{label:<10} {wall:>13.2f} {polls:>7} {p50:>12.1f} {worst:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
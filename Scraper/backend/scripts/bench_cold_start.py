@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+API cold start: what opening the database costs each worker
+
+Fills a scratch database with leads, then starts fresh interpreters that
+import the API app (as each uvicorn worker does) and reports the median
+wall time, plus the time to open the database in an already warm process.
+Runs once with the schema current (one PRAGMA user_version read) and once
+with user_version reset to 0 before every start, which replays every
+(idempotent) migration: the DDL and backfills every start used to run.
+Finally starts `workers` processes at once on the reset database and
+counts how many of them applied the migrations (should be one).
+
+Usage: python backend/scripts/bench_cold_start.py [leads] [runs] [workers]   (defaults: 200000 5 4)
+"""
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+# Add parent directory to path
+sys.path.append(str(ROOT))
+
+from backend.app.models.database import DatabaseExtended
+
+START = '''
+import time
+start = time.perf_counter()
+import backend.app.main
+print(time.perf_counter() - start)
+'''
+
+
+def fill(path, leads):
+    db = DatabaseExtended(path)
+    rng = random.Random(5)
+    now = datetime.now()
+    conn = db.get_connection()
+    conn.executemany('''INSERT INTO companies (name, normalized_name, location, created_at)
+                        VALUES (?, ?, 'Mumbai, Maharashtra', ?)''',
+                     [(f'Bench {i}', f'bench {i}', now.isoformat()) for i in range(leads // 40)])
+    conn.executemany('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url,
+                                           scraped_at, confidence, status)
+                        VALUES (?, 'bench', 'news', 'bench', 'https://example.com', ?, 0.6, 'NEW')''',
+                     [(rng.randint(1, leads // 40), (now - timedelta(days=rng.uniform(0, 60))).isoformat())
+                      for _ in range(leads)])
+    conn.commit()
+    conn.close()
+
+
+def reset_version(path):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA user_version = 0')
+    conn.close()
+
+
+def start_worker(path):
+    return subprocess.Popen([sys.executable, '-c', START], cwd=ROOT, stdout=subprocess.PIPE, text=True,
+                            env={**os.environ, 'DATABASE_PATH': path})
+
+
+def worker_output(process):
+    out, _ = process.communicate()
+    return out.strip().splitlines()
+
+
+def worker_seconds(process):
+    return float(worker_output(process)[-1])
+
+
+def measure(path, runs, reset):
+    starts, opens = [], []
+    for _ in range(runs):
+        if reset:
+            reset_version(path)
+        starts.append(worker_seconds(start_worker(path)))
+        if reset:
+            reset_version(path)
+        begin = time.perf_counter()
+        DatabaseExtended(path)
+        opens.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(starts), statistics.median(opens)
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    path = os.path.join(tempfile.mkdtemp(), 'bench_cold_start.db')
+    fill(path, leads)
+
+    print("=" * 66)
+    print(f"API cold start over {leads:,} leads (median of {runs})")
+    print("=" * 66)
+    print(f"{'':<22} {'import app s':>13} {'open db ms':>12}")
+    for label, reset in (('DDL every start', True), ('user_version check', False)):
+        start, opened = measure(path, runs, reset)
+        print(f"{label:<22} {start:>13.3f} {opened:>12.1f}")
+
+    reset_version(path)
+    outputs = [worker_output(p) for p in [start_worker(path) for _ in range(workers)]]
+    applied = sum(any('Applied migration' in line for line in out) for out in outputs)
+    version = sqlite3.connect(path).execute('PRAGMA user_version').fetchone()[0]
+    print(f"\n{workers} workers started at once with the migrations pending: "
+          f"{applied} applied them, user_version now {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Connection pooling: request latency and insert throughput
+
+Runs the same workload against two scratch databases: one opening a fresh
+connection per call in the default rollback-journal mode (how every query
+used to run), one through the tuned connection pool. Measures scored-lead
+inserts per second, p50/p95 of a typical API read (a leads page plus one
+lead's detail), and the same reads while a scraper thread inserts
+WRITER_RATE leads per second (the same rate in both runs, so both tables
+grow alike).
+
+Usage: python backend/scripts/bench_connection_pool.py [inserts] [reads]   (defaults: 2000 300)
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.models.database import DatabaseExtended
+from backend.app.services.scoring_engine import ScoringEngine
+
+WRITER_RATE = 100
+TEXT = 'Tender for supply of HSD and furnace oil for boilers at Dahej, Gujarat. Estimated value Rs 2.5 crore.'
+
+
+class UnpooledDatabase(DatabaseExtended):
+    """A new default connection per call"""
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        self.configure_connection(conn)
+        return conn
+
+
+def insert_leads(db, company_id, count):
+    score_data = ScoringEngine.calculate_score('tender', datetime.now().isoformat(), TEXT)
+    for _ in range(count):
+        db.insert_scored_lead(company_id, TEXT, 'tender', 'bench', 'https://example.com', ['HSD', 'FO'],
+                              score_data, location={})
+
+
+def read_request(db):
+    leads = db.get_leads_paginated(limit=50)['leads']
+    if leads:
+        db.get_lead_by_id(leads[0]['id'])
+
+
+def read_latency(db, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        read_request(db)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95) - 1]
+
+
+def run(label, db_class, inserts, reads):
+    path = os.path.join(tempfile.mkdtemp(), f'bench_{label}.db')
+    db = db_class(path)
+    company_id = db.insert_company('Bench Refineries Ltd')
+
+    start = time.perf_counter()
+    insert_leads(db, company_id, inserts)
+    insert_rate = inserts / (time.perf_counter() - start)
+
+    idle = read_latency(db, reads)
+
+    stop = threading.Event()
+
+    def scraper():
+        while not stop.is_set():
+            start = time.perf_counter()
+            insert_leads(db, company_id, 10)
+            stop.wait(max(0.0, 10 / WRITER_RATE - (time.perf_counter() - start)))
+
+    writer = threading.Thread(target=scraper)
+    writer.start()
+    try:
+        busy = read_latency(db, reads)
+    finally:
+        stop.set()
+        writer.join()
+
+    print(f"{label:<10} {insert_rate:>12,.0f} {idle[0]:>9.2f} /{idle[1]:>7.2f} {busy[0]:>9.2f} /{busy[1]:>7.2f}")
+
+
+def main():
+    inserts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    print("=" * 66)
+    print(f"{inserts:,} scored-lead inserts, {reads} read requests (page + detail)")
+    print("=" * 66)
+    print(f"{'':<10} {'inserts/s':>12} {'read p50/p95 ms':>18} {'with writer p50/p95':>20}")
+    run('before', UnpooledDatabase, inserts, reads)
+    run('pooled', DatabaseExtended, inserts, reads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Email channel throughput benchmark
+
+Sends lead alerts to a local aiosmtpd sink and compares the pooled channel
+(one login, many messages) with a fresh connection + login per message.
+
+Usage: python backend/scripts/bench_email_channel.py [messages]
+Requires: pip install aiosmtpd
+"""
+import sys
+import smtplib
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from backend.app.services.email_channel import SMTPConnectionPool, EmailChannel
+
+HOST, PORT = '127.0.0.1', 8025
+
+
+def sample_deliveries(count: int):
+    """(recipient, leads) pairs; every fourth message is a 5-lead digest"""
+    deliveries = []
+    for i in range(count):
+        size = 5 if i % 4 == 0 else 1
+        leads = [
+            {'lead_id': i * 10 + j, 'company_name': f'Company {i % 50}',
+             'confidence': '0.82', 'signal_type': 'TENDER'}
+            for j in range(size)
+        ]
+        deliveries.append((f'officer{i % 20}@hpcl.com', leads))
+    return deliveries
+
+
+def bench_pooled(deliveries, batch_size: int = 25) -> float:
+    channel = EmailChannel(SMTPConnectionPool(HOST, PORT, use_tls=False), 'alerts@hpcl.com')
+    start = time.perf_counter()
+    for i in range(0, len(deliveries), batch_size):
+        errors = channel.send_batch(deliveries[i:i + batch_size])
+        assert not any(errors), errors
+    elapsed = time.perf_counter() - start
+    print(f"   SMTP logins: {channel.pool.logins}")
+    channel.close()
+    return elapsed
+
+
+def bench_per_message(deliveries) -> float:
+    channel = EmailChannel(None, 'alerts@hpcl.com')
+    start = time.perf_counter()
+    for recipient, leads in deliveries:
+        with smtplib.SMTP(HOST, PORT) as conn:
+            conn.send_message(channel.build_message(recipient, leads))
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    deliveries = sample_deliveries(count)
+
+    controller = Controller(Sink(), hostname=HOST, port=PORT)
+    controller.start()
+    try:
+        print("=" * 60)
+        print(f"Email channel benchmark ({count} messages)")
+        print("=" * 60)
+
+        print("\nPooled connection, batched sends:")
+        pooled = bench_pooled(deliveries)
+        print(f"   {count / pooled:,.0f} msgs/sec ({pooled:.2f}s)")
+
+        print("\nNew connection per message:")
+        single = bench_per_message(deliveries)
+        print(f"   {count / single:,.0f} msgs/sec ({single:.2f}s)")
+
+        print(f"\n✅ Pooled channel is {single / pooled:.1f}x faster")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
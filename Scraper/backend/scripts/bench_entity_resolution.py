@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Entity resolution benchmark
+
+Resolves a batch of 10k incoming names (exact repeats, typo'd variants and
+new companies) with EntityResolutionService.match_many at several table
+sizes, and reports latency, typo recall and false merges next to the legacy
+full-table substring scan.
+
+Usage: python backend/scripts/bench_entity_resolution.py [sizes...]
+       (default: 10000 100000 1000000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# Work on a throwaway database, never the real one
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench_resolution.db')
+
+from backend.app.models.database import DatabaseExtended
+from backend.app.services.entity_resolution import EntityResolutionService
+
+SYLLABLES = ['ba', 'ra', 'ti', 'ka', 'ma', 'shi', 'van', 'del', 'pur', 'nag', 'sar', 'ko', 'lin',
+             'dha', 'vi', 'jay', 'ram', 'tek', 'su', 'ga', 'ni', 'har', 'bo', 'mit', 'ran', 'de', 'chan',
+             'pa', 'lo', 'mu', 'ind', 'or', 'sha', 'ki', 'val', 'ton', 'es', 'ku', 'an', 'gri']
+CORES = ['steel', 'cement', 'power', 'textiles', 'logistics', 'chemicals', 'infra', 'paper',
+         'sugar', 'pharma', 'foods', 'ceramics', 'fertilizers', 'polymers', 'glass', 'mining']
+SUFFIXES = ['Pvt Ltd', 'Limited', 'Industries', 'Corporation', 'Enterprises', 'LLP']
+
+
+def word(rng: random.Random) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def company_name(rng: random.Random) -> str:
+    return f"{word(rng).title()} {word(rng).title()} {rng.choice(CORES).title()} {rng.choice(SUFFIXES)}"
+
+
+def typo(rng: random.Random, normalized: str) -> str:
+    """Drop one character from the longest word (a typical data-entry slip)"""
+    words = normalized.split()
+    i = max(range(len(words)), key=lambda k: len(words[k]))
+    pos = rng.randrange(1, len(words[i]))
+    words[i] = words[i][:pos] + words[i][pos + 1:]
+    return ' '.join(words)
+
+
+def legacy_resolve(db, normalized_name: str):
+    """The pre-index lookup: exact SQL match, then a full-table substring scan"""
+    conn = db.get_connection()
+    c = conn.cursor()
+    c.execute("SELECT id, name FROM companies WHERE normalized_name = ?", (normalized_name,))
+    result = c.fetchone()
+    if result:
+        conn.close()
+        return result[0]
+
+    c.execute("SELECT id, name, normalized_name FROM companies")
+    for comp_id, comp_name, comp_norm in c.fetchall():
+        if not comp_norm:
+            continue
+        if (normalized_name in comp_norm and len(normalized_name) > 4) or \
+           (comp_norm in normalized_name and len(comp_norm) > 4):
+            conn.close()
+            return comp_id
+    conn.close()
+    return None
+
+
+def fill(db, size: int, rng: random.Random):
+    conn = db.get_connection()
+    conn.execute("DELETE FROM companies")
+    seen = set()
+    rows = []
+    while len(rows) < size:
+        name = company_name(rng)
+        normalized = EntityResolutionService.normalize_name(name)
+        if normalized not in seen:
+            seen.add(normalized)
+            rows.append((name, normalized))
+    conn.executemany("INSERT INTO companies (name, normalized_name) VALUES (?, ?)", rows)
+    conn.commit()
+    ids = [row[0] for row in conn.execute("SELECT id FROM companies ORDER BY id")]
+    conn.close()
+    db.bump_cache_version('companies')
+    return list(zip(ids, [norm for _, norm in rows]))
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    rng = random.Random(42)
+    db = DatabaseExtended()
+    threshold = EntityResolutionService.MATCH_THRESHOLD
+
+    print(f"Match threshold: {threshold}")
+    print("=" * 88)
+    print(f"{'companies':>10} {'index build':>12} {'resolve':>10} {'legacy scan':>12} "
+          f"{'10k batch':>10} {'typo recall':>12} {'false merges':>13}")
+    print("=" * 88)
+
+    for size in sizes:
+        companies = fill(db, size, rng)
+
+        start = time.perf_counter()
+        db.get_company_index()
+        build = time.perf_counter() - start
+
+        # Incoming batch: exact repeats, typo'd variants of known companies, brand-new names
+        known = [rng.choice(companies) for _ in range(5000)]
+        typos = [rng.choice(companies) for _ in range(2500)]
+        batch = [name for _, name in known]
+        batch += [typo(rng, name) for _, name in typos]
+        batch += [EntityResolutionService.normalize_name(company_name(rng)) for _ in range(2500)]
+
+        start = time.perf_counter()
+        results = EntityResolutionService.match_many(db, batch)
+        elapsed = time.perf_counter() - start
+
+        typo_results = results[5000:7500]
+        recall = sum(r['company_id'] == cid for r, (cid, _) in zip(typo_results, typos)) / len(typos)
+        false_merges = sum(r['company_id'] is not None for r in results[7500:]) / 2500
+
+        # The legacy scan is O(N) per miss; sample a few brand-new names only
+        sample = batch[7500:7500 + max(3, 100_000 // size)]
+        start = time.perf_counter()
+        for name in sample:
+            legacy_resolve(db, name)
+        legacy_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+        print(f"{size:>10,} {build:>11.1f}s {elapsed / len(batch) * 1000:>8.3f}ms {legacy_ms:>10.1f}ms "
+              f"{elapsed:>9.2f}s {recall:>11.1%} {false_merges:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
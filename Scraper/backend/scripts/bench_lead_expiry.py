@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Lead list latency vs. history size
+
+Fills a scratch database with a fixed working set of live leads plus a
+growing history of stale ones, and measures p50/p95 of the default leads
+list (live score sort, a min-confidence filter, newest-first) before and
+after the lifecycle sweep expires the history.
+
+Usage: python backend/scripts/bench_lead_expiry.py [live_leads] [max_history]   (defaults: 5000 200000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.models.database import DatabaseExtended
+from backend.app.services.lead_lifecycle import LeadLifecycle
+
+QUERIES = {
+    'default': dict(),
+    'min 0.6': dict(min_confidence=0.6),
+    'newest': dict(sort_by='timestamp'),
+}
+RUNS = 30
+
+
+def insert_leads(db, company_ids, count, age_days, rng):
+    now = datetime.now()
+    rows = []
+    for _ in range(count):
+        scraped = now - timedelta(days=rng.uniform(*age_days))
+        rows.append((rng.choice(company_ids), 'Supply of HSD for DG sets', rng.choice(['tender', 'news']),
+                     'bench', 'https://example.com', scraped.isoformat(), rng.uniform(0.2, 0.8)))
+    conn = db.get_connection()
+    conn.executemany('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url,
+                                           scraped_at, static_score)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)''', rows)
+    conn.commit()
+    conn.close()
+
+
+def measure(db):
+    results = {}
+    for name, kwargs in QUERIES.items():
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            db.get_leads_paginated(limit=50, **kwargs)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[name] = (timings[len(timings) // 2], timings[int(len(timings) * 0.95) - 1])
+    return results
+
+
+def main():
+    live = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    max_history = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    rng = random.Random(7)
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_expiry.db')
+    db = DatabaseExtended(path)
+    company_ids = [db.insert_company(f'Company {i} Ltd') for i in range(500)]
+    insert_leads(db, company_ids, live, (0, 10), rng)
+
+    print("=" * 72)
+    print(f"Leads list p50/p95 (ms), {live:,} live leads")
+    print("=" * 72)
+    print(f"{'history':>9} {'state':<9}" + ''.join(f"{name:>18}" for name in QUERIES))
+
+    history = 0
+    for target in sorted({0, max_history // 20, max_history // 4, max_history}):
+        insert_leads(db, company_ids, target - history, (200, 900), rng)
+        history = target
+
+        # Same queries with and without the working-set filter in effect
+        conn = db.get_connection()
+        conn.execute("UPDATE leads SET status = 'REVIEW_REQUIRED' WHERE status = 'EXPIRED'")
+        conn.commit()
+        conn.close()
+        before = measure(db)
+        sweep = LeadLifecycle.sweep(db)
+        after = measure(db)
+
+        for state, results in (('unswept', before), ('swept', after)):
+            print(f"{history:>9,} {state:<9}" + ''.join(f"{p50:>9.1f} /{p95:>6.1f}" for p50, p95 in results.values()))
+        print(f"{'':>9} sweep: {sweep['expired']:,} expired in {sweep['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Product filters and per-product counts: JSON LIKE vs lead_products
+
+Fills a scratch database with leads mentioning one to three products
+(stored as the products_mentioned JSON only), times the lead_products
+backfill migration, then compares, for each product:
+  - the leads-list filter (count + first page, by score and by date):
+    products_mentioned LIKE '%CODE%' (how the filter used to work) vs
+    get_leads_paginated, and how many leads the LIKE matched that don't
+    mention the product
+  - the dashboard's per-product counts over 7/30/90 days: GROUP BY the
+    JSON string, parsed in Python, vs GROUP BY product_code
+Leads carry signal text and a scoring breakdown of realistic size, so
+scanning the table costs what it does in production.
+
+Usage: python backend/scripts/bench_lead_products.py [leads] [runs]   (defaults: 200000 5)
+"""
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.models import migrations
+from backend.app.models.database import DatabaseExtended
+
+PRODUCTS = ['HSD', 'FO', 'LDO', 'BITUMEN', 'HEXANE', 'MTO', 'MTO_2445', 'JBO', 'LSHS', 'SKO_NON_PDS']
+RARE = 'SULPHUR'  # In 1% of leads
+FILTERS = ('FO', 'MTO', RARE, 'LUBRICANTS')  # The last is in no lead
+SORTS = {'confidence': 'live_score DESC', 'timestamp': 'l.scraped_at DESC'}
+WINDOWS = (7, 30, 90)
+TEXT = ('Tender for supply of HSD and furnace oil for boilers at the Dahej plant, Gujarat. '
+        'Bidders must hold a valid licence; EMD Rs 50,000. ') * 4
+# get_leads_paginated's queries, as they were
+PAGE = '''SELECT l.*, c.name, lead_score(l.static_score, l.scraped_at, ?) AS live_score
+          FROM leads l JOIN companies c ON l.company_id = c.id
+          WHERE l.status != 'EXPIRED' AND {where}
+          ORDER BY {order} LIMIT 50'''
+COUNT = '''SELECT COUNT(*) FROM leads l JOIN companies c ON l.company_id = c.id
+           WHERE l.status != 'EXPIRED' AND {where}'''
+LIKE = 'l.products_mentioned LIKE ?'
+
+
+def fill(path, leads):
+    """Leads at the schema version before lead_products, then migrate"""
+    latest = migrations.MIGRATIONS
+    before = next(version for version, _, fn in latest if fn is migrations._lead_products) - 1
+    migrations.MIGRATIONS = latest[:before]
+    migrations.LATEST_VERSION = before
+    db = DatabaseExtended(path)
+    migrations.MIGRATIONS = latest
+    migrations.LATEST_VERSION = len(latest)
+
+    rng = random.Random(9)
+    now = datetime.now()
+    conn = db.get_connection()
+    company_id = db.insert_company('Bench Ltd')
+    # Stored in scrape order, as the scrapers do
+    scraped = sorted((now - timedelta(days=rng.uniform(0, 60))).isoformat() for _ in range(leads))
+    scoring = json.dumps({'final_score': 0.6, 'breakdown': {'intent': 0.8, 'size': 0.5, 'geography': 0.5},
+                          'explanation': ['Strong buying intent detected'] * 12})
+    conn.executemany('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url,
+                                           products_mentioned, confidence, scraped_at, scoring, status)
+                        VALUES (?, ?, 'news', 'bench', 'https://example.com', ?, 0.6, ?, ?, 'NEW')''',
+                     [(company_id, TEXT, json.dumps(rng.sample(PRODUCTS, rng.randint(1, 3))
+                                                    + ([RARE] if rng.random() < 0.01 else [])), scraped_at, scoring)
+                      for scraped_at in scraped])
+    conn.commit()
+    conn.close()
+
+    start = time.perf_counter()
+    db.init_db()
+    return db, time.perf_counter() - start
+
+
+def timed(runs, fn):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def like_filter(conn, code, order):
+    count = conn.execute(COUNT.format(where=LIKE), (f'%{code}%',)).fetchone()[0]
+    conn.execute(PAGE.format(where=LIKE, order=order), (datetime.now().isoformat(), f'%{code}%')).fetchall()
+    return count
+
+
+def counts_from_json(conn, period):
+    """The old dashboard query: one row per distinct JSON string, split up in Python"""
+    by_product = Counter()
+    unknown = 0
+    for products, count in conn.execute('''SELECT products_mentioned, COUNT(*) FROM leads
+                                           WHERE DATE(scraped_at) BETWEEN ? AND ?
+                                           GROUP BY products_mentioned''', period):
+        codes = json.loads(products) if products else []
+        unknown += 0 if codes else count
+        for code in codes:
+            by_product[code] += count
+    return with_unknown(by_product.most_common(10), unknown)
+
+
+def counts_from_table(conn, period):
+    """As dashboard.get_stats"""
+    by_product = conn.execute('''SELECT COALESCE(lp.product_code, 'Unknown') as product, COUNT(*) as count
+                                 FROM leads l LEFT JOIN lead_products lp ON lp.lead_id = l.id
+                                 WHERE l.scraped_at >= ? AND l.scraped_at < date(?, '+1 day')
+                                 GROUP BY product ORDER BY count DESC''', period).fetchall()
+    top = [row for row in by_product if row[0] != 'Unknown'][:10]
+    unknown = next((row[1] for row in by_product if row[0] == 'Unknown'), 0)
+    return with_unknown(top, unknown)
+
+
+def with_unknown(top, unknown):
+    """Per-product counts as the dashboard shows them: the top ten, plus leads with no product"""
+    counts = dict(top)
+    if unknown:
+        counts['Unknown'] = unknown
+    return counts
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    db, backfill = fill(os.path.join(tempfile.mkdtemp(), 'bench_lead_products.db'), leads)
+    conn = db.get_connection()
+    rows = conn.execute('SELECT COUNT(*) FROM lead_products').fetchone()[0]
+
+    print("=" * 72)
+    print(f"{leads:,} leads; backfill migration wrote {rows:,} lead_products rows in {backfill:.2f}s")
+    print("=" * 72)
+    print(f"{'filter, sort':<22} {'LIKE ms':>9} {'index ms':>9} {'LIKE matches':>13} {'leads':>8} {'false':>7}")
+    for code in FILTERS:
+        for sort, order in SORTS.items():
+            like_ms, like_count = timed(runs, lambda: like_filter(conn, code, order))
+            index_ms, result = timed(runs, lambda: db.get_leads_paginated(product_code=code, sort_by=sort))
+            count = result['pagination']['total']
+            print(f"{f'{code}, {sort}':<22} {like_ms:>9.1f} {index_ms:>9.1f} {like_count:>13,} {count:>8,} "
+                  f"{like_count - count:>7,}")
+
+    print(f"\n{'per-product counts':<20} {'JSON ms':>9} {'table ms':>9} {'same':>6}")
+    today = datetime.now().date()
+    for days in WINDOWS:
+        period = ((today - timedelta(days=days)).isoformat(), today.isoformat())
+        json_ms, from_json = timed(runs, lambda: counts_from_json(conn, period))
+        table_ms, from_table = timed(runs, lambda: counts_from_table(conn, period))
+        same = from_json == from_table
+        print(f"{f'last {days} days':<20} {json_ms:>9.1f} {table_ms:>9.1f} {str(same):>6}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Lead search: LIKE scan vs the leads_fts full-text index
+
+Fills a scratch database with news and tender leads of realistic length
+(at schema version 2, before leads_fts), times the migration that builds
+the index, then runs the same searches through GET /api/leads' query both
+ways: the old `c.name LIKE '%x%' OR l.signal_text LIKE '%x%'` (count +
+first page by score) and get_leads_paginated (count + first page by
+relevance, with snippets). Also replays typing a company name one
+keystroke at a time.
+
+Usage: python backend/scripts/bench_lead_search.py [leads] [runs]   (defaults: 1000000 3)
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.models import migrations
+from backend.app.models.database import DatabaseExtended
+
+PREFIXES = ['Reliance', 'Tata', 'Adani', 'Jindal', 'Bharat', 'Hindustan', 'Ultratech', 'Shree', 'Gujarat',
+            'Vedanta', 'Essar', 'Nayara', 'Larsen', 'Ambuja', 'Dalmia', 'Birla', 'Mahindra', 'Ashok', 'Ramco']
+SUFFIXES = ['Industries', 'Cements', 'Steel', 'Power', 'Infra', 'Chemicals', 'Logistics', 'Textiles',
+            'Fertilizers', 'Refineries', 'Roadways', 'Shipping', 'Paper Mills', 'Glass Works']
+PRODUCTS = ['furnace oil', 'high speed diesel', 'light diesel oil', 'bitumen', 'hexane', 'mineral turpentine oil',
+            'jute batching oil', 'LSHS', 'lubricants', 'bunker fuel']
+PLACES = ['Jamnagar', 'Dahej', 'Vizag', 'Haldia', 'Pune', 'Nagpur', 'Chennai', 'Kochi', 'Mundra', 'Panipat',
+          'Bhopal', 'Raipur', 'Kolkata', 'Surat', 'Ludhiana', 'Indore', 'Guwahati', 'Paradip']
+NEWS = ('{company} announced a Rs {value} crore expansion of its {place} plant, adding boilers and captive '
+        'power that will run on {product}. The company expects commissioning by the end of the year and is '
+        'in talks with suppliers for long-term {product2} contracts. Analysts said demand in the region '
+        'continues to grow as new units come up.')
+TENDER = ('Tender for supply of {product} for {place} unit. {company} invites bids from registered vendors '
+          'for {qty} KL of {product} and {product2} over twelve months. Tender No. {ref}. Estimated value '
+          'Rs {value} crore. Bid submission closes in three weeks; EMD and eligibility as per the tender document.')
+
+SEARCHES = ['reliance', 'furnace oil', 'bitumen haldia', 'jindal steel dahej', 'mundra', 'GEM/2025/B/4242',
+            'turpentine']
+TYPING = 'ultratech'
+LIKE_COUNT = '''SELECT COUNT(*) FROM leads l JOIN companies c ON l.company_id = c.id
+                WHERE l.status != 'EXPIRED' AND (c.name LIKE ? OR l.signal_text LIKE ?)'''
+LIKE_PAGE = '''SELECT l.*, c.name, lead_score(l.static_score, l.scraped_at, ?) AS live_score
+               FROM leads l JOIN companies c ON l.company_id = c.id
+               WHERE l.status != 'EXPIRED' AND (c.name LIKE ? OR l.signal_text LIKE ?)
+               ORDER BY live_score DESC LIMIT 50'''
+
+
+def fill(path, leads):
+    """Leads at the schema version before leads_fts, then migrate"""
+    latest = migrations.MIGRATIONS
+    before = next(version for version, _, fn in latest if fn is migrations._leads_fts) - 1
+    migrations.MIGRATIONS = latest[:before]
+    migrations.LATEST_VERSION = before
+    db = DatabaseExtended(path)
+    migrations.MIGRATIONS = latest
+    migrations.LATEST_VERSION = len(latest)
+
+    rng = random.Random(11)
+    conn = db.get_connection()
+    names = list(dict.fromkeys(f'{rng.choice(PREFIXES)} {rng.choice(SUFFIXES)} {rng.choice(PLACES)}'
+                               for _ in range(20_000)))
+    conn.executemany('INSERT INTO companies (name, normalized_name, created_at) VALUES (?, ?, ?)',
+                     [(name, name.lower(), datetime.now().isoformat()) for name in names])
+    start_at = datetime.now() - timedelta(days=60)
+    step = timedelta(days=60) / leads
+    batch = []
+    for i in range(leads):
+        company_id = rng.randrange(len(names)) + 1
+        fields = dict(company=names[company_id - 1], place=rng.choice(PLACES), product=rng.choice(PRODUCTS),
+                      product2=rng.choice(PRODUCTS), value=rng.randint(5, 900), qty=rng.randint(50, 5000),
+                      ref=f'GEM/{rng.choice((2024, 2025))}/B/{rng.randint(1000, 99999)}')
+        tender = rng.random() < 0.4
+        batch.append((company_id, (TENDER if tender else NEWS).format(**fields), 'tender' if tender else 'news',
+                      (start_at + step * i).isoformat(), fields['ref'] if tender else None))
+        if len(batch) == 50_000:
+            insert(conn, batch)
+            batch = []
+    insert(conn, batch)
+    conn.close()
+
+    start = time.perf_counter()
+    db.init_db()
+    return db, time.perf_counter() - start
+
+
+def insert(conn, batch):
+    conn.executemany('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url,
+                                           scraped_at, tender_reference, confidence, status)
+                        VALUES (?, ?, ?, 'bench', 'https://example.com', ?, ?, 0.6, 'NEW')''', batch)
+    conn.commit()
+
+
+def timed(runs, fn):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def like_search(conn, text):
+    term = f'%{text}%'
+    count = conn.execute(LIKE_COUNT, (term, term)).fetchone()[0]
+    conn.execute(LIKE_PAGE, (datetime.now().isoformat(), term, term)).fetchall()
+    return count
+
+
+def main():
+    leads = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    path = os.path.join(tempfile.mkdtemp(), 'bench_lead_search.db')
+    db, build = fill(path, leads)
+    conn = db.get_connection()
+
+    print("=" * 74)
+    print(f"{leads:,} leads; building leads_fts took {build:.1f}s, database {os.path.getsize(path) / 2**20:,.0f} MB")
+    print("=" * 74)
+    print(f"{'search':<22} {'LIKE ms':>9} {'FTS ms':>9} {'LIKE hits':>10} {'FTS hits':>10}")
+    for text in SEARCHES:
+        like_ms, like_hits = timed(runs, lambda: like_search(conn, text))
+        fts_ms, result = timed(runs, lambda: db.get_leads_paginated(search=text, sort_by='relevance'))
+        print(f"{text:<22} {like_ms:>9.1f} {fts_ms:>9.1f} {like_hits:>10,} {result['pagination']['total']:>10,}")
+
+    print(f"\ntyping '{TYPING}' (FTS, page by relevance):")
+    for end in range(1, len(TYPING) + 1):
+        fts_ms, result = timed(runs, lambda: db.get_leads_paginated(search=TYPING[:end], sort_by='relevance'))
+        print(f"  {TYPING[:end]:<12} {fts_ms:>9.1f} ms {result['pagination']['total']:>10,} hits")
+    top = db.get_leads_paginated(search=SEARCHES[1], sort_by='relevance', limit=1)['leads']
+    if top:
+        print(f"\ntop '{SEARCHES[1]}' snippet: {top[0]['snippet']}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
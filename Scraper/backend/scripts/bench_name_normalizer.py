@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Name normalizer benchmark
+
+Normalizes N generated company names (with repeats, punctuation and legal
+suffixes) with the legacy per-suffix re.sub loop and with name_normalizer,
+cold and memoized, and checks both produce the same output, including the
+verify_services.py cases.
+
+Usage: python backend/scripts/bench_name_normalizer.py [names]   (default: 200000)
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.services import name_normalizer
+from backend.app.services.name_normalizer import LEGAL_SUFFIXES, normalize_name, normalize_many
+
+SYLLABLES = ['ba', 'ra', 'ti', 'ka', 'ma', 'shi', 'van', 'del', 'pur', 'nag', 'sar', 'ko', 'lin',
+             'dha', 'vi', 'jay', 'ram', 'tek', 'su', 'ga', 'ni', 'har', 'bo', 'mit', 'ran', 'de']
+CORES = ['Steel', 'Cement', 'Power', 'Textiles', 'Logistics', 'Chemicals', 'Infra', 'Paper',
+         'Co-operative', 'Oil & Gas', 'Agro (India)', 'Engg. Works']
+SUFFIXES = ['Pvt Ltd', 'Pvt. Ltd.', 'Private Limited', 'Limited', 'Ltd.', 'Corporation', 'Corp.',
+            'Industries', 'Inds.', 'Enterprises', 'LLP', 'Co.', 'Company Limited', 'Group', '']
+
+# (input, expected) from verify_services.py
+VERIFY_CASES = [
+    ("Tata Power Ltd", "tata power"),
+    ("Tata Power Company Limited", "tata power"),
+    ("HPCL", "hpcl"),
+    ("Hindustan Petroleum Corp Ltd", "hindustan petroleum"),
+]
+
+
+def legacy_normalize(name: str) -> str:
+    """EntityResolutionService.normalize_name before the single-pass normalizer"""
+    if not name:
+        return ""
+    normalized = name.lower()
+    for suffix in LEGAL_SUFFIXES:
+        normalized = re.sub(suffix, '', normalized, flags=re.IGNORECASE)
+    normalized = re.sub(r'[^a-z0-9\s]', ' ', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    return normalized
+
+
+def company_name(rng: random.Random) -> str:
+    words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+             for _ in range(rng.randint(1, 3))]
+    return f"{' '.join(words)} {rng.choice(CORES)} {rng.choice(SUFFIXES)}".strip()
+
+
+def rate(fn, names) -> float:
+    start = time.perf_counter()
+    fn(names)
+    return len(names) / (time.perf_counter() - start)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(11)
+
+    # Scraped names repeat a lot: draw from a pool a quarter of the batch size
+    pool = [company_name(rng) for _ in range(max(1, size // 4))]
+    names = [rng.choice(pool) for _ in range(size)]
+
+    print("=" * 60)
+    print(f"Name normalizer benchmark: {size:,} names, {len(set(names)):,} distinct")
+    print("=" * 60)
+
+    for name, expected in VERIFY_CASES:
+        got = normalize_name(name)
+        status = "✅" if got == expected == legacy_normalize(name) else "❌"
+        print(f"   {status} '{name}' -> '{got}'")
+
+    legacy = [legacy_normalize(n) for n in pool]
+    current = [normalize_name(n) for n in pool]
+    diffs = [(n, a, b) for n, a, b in zip(pool, legacy, current) if a != b]
+    print(f"Identical output: {len(pool) - len(diffs):,}/{len(pool):,} distinct names")
+    for n, a, b in diffs[:5]:
+        print(f"   '{n}': legacy '{a}' vs '{b}'")
+
+    normalize_name.cache_clear()
+    print(f"Legacy re.sub loop:        {rate(lambda ns: [legacy_normalize(n) for n in ns], names):>10,.0f} names/sec")
+    normalize_name.cache_clear()
+    print(f"Unmemoized:                "
+          f"{rate(lambda ns: [normalize_name.__wrapped__(n) for n in ns], names):>10,.0f} names/sec")
+    normalize_name.cache_clear()
+    print(f"normalize_many (cold):     {rate(normalize_many, names):>10,.0f} names/sec")
+    print(f"normalize_many (memoized): {rate(normalize_many, names):>10,.0f} names/sec")
+    print(f"Translate table entries:   {len(name_normalizer._PUNCTUATION)}")
+
+
+if __name__ == "__main__":
+    main()
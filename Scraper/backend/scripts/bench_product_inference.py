@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Batch product inference benchmark
+
+Infers products for N generated tender/news signals with the per-text
+ProductInferenceService.infer_products loop and with infer_products_batch,
+checks both return identical results, and reports signals/sec.
+
+Usage: python backend/scripts/bench_product_inference.py [signals]   (default: 100000)
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.services import product_inference
+from backend.app.services.product_inference import ProductInferenceService
+from backend.app.services.product_rules import active_rules
+
+SUBJECTS = ['Supply of', 'Procurement of', 'Rate contract for', 'Annual requirement of', 'Tender for',
+            'Expansion plan needs', 'Company to commission', 'Bids invited for']
+ITEMS = ['High Speed Diesel', 'furnace oil', 'FO 180', 'LDO', 'bitumen VG 30', 'food grade hexane',
+         'mineral turpentine oil', 'jute batching oil', 'LSHS', 'lubricants', 'office furniture',
+         'CCTV cameras', 'diesel', 'asphalt', 'white spirit', 'gas oil']
+PURPOSES = ['for boiler heating at thermal power plant', 'for DG sets and backup power', 'for road construction',
+            'for the highway project', 'for solvent extraction unit', 'for paint and varnish works',
+            'for jute mill operations', 'for fertilizer plant', 'for the fleet', 'at the district office',
+            'for lift irrigation pumps', 'for the mining division', '']
+PLACES = ['Vizag', 'Panipat', 'Haldia', 'Nagpur', 'Kutch', 'Guwahati', 'Bhilai', 'Kochi']
+
+
+def make_signal(rng: random.Random, i: int) -> str:
+    return (f"{rng.choice(SUBJECTS)} {rng.choice(ITEMS)} {rng.choice(PURPOSES)} "
+            f"- {rng.choice(PLACES)} (Ref {i})")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(3)
+    texts = [make_signal(rng, i) for i in range(count)]
+
+    backend = 'NumPy/SciPy' if product_inference.np is not None else 'pure Python'
+    print("=" * 60)
+    print(f"Product inference benchmark: {count:,} signals ({backend} aggregation)")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    loop = [ProductInferenceService.infer_products(t) for t in texts]
+    loop_elapsed = time.perf_counter() - start
+    print(f"Per-text loop:        {count / loop_elapsed:>10,.0f} signals/sec ({loop_elapsed:.2f}s)")
+
+    active_rules().term_index = None
+    start = time.perf_counter()
+    batch = ProductInferenceService.infer_products_batch(texts)
+    batch_elapsed = time.perf_counter() - start
+    print(f"infer_products_batch: {count / batch_elapsed:>10,.0f} signals/sec ({batch_elapsed:.2f}s, "
+          f"{loop_elapsed / batch_elapsed:.1f}x)")
+
+    mismatches = [i for i, (a, b) in enumerate(zip(loop, batch)) if a != b]
+    print(f"Identical results: {count - len(mismatches):,}/{count:,}")
+    for i in mismatches[:3]:
+        print(f"   {texts[i]!r}\n      loop:  {loop[i]}\n      batch: {batch[i]}")
+
+    # History re-inference repeats texts; the batch scans each distinct one once
+    repeated = [rng.choice(texts[:count // 10 or 1]) for _ in range(count)]
+    start = time.perf_counter()
+    ProductInferenceService.infer_products_batch(repeated)
+    elapsed = time.perf_counter() - start
+    print(f"Batch, 10% distinct:  {count / elapsed:>10,.0f} signals/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Signal matcher benchmark
+
+Runs the per-text keyword checks of the scraping hot path (news and tender
+relevance, product inference, industry, size proxy) over N generated
+news-sized texts: once with the legacy per-keyword substring loops and once
+through the shared SignalMatcher, which scans each text a single time.
+Two text mixes: keyword-dense (every sentence has signal terms) and
+article-like (mostly ordinary prose). Reports texts/sec, how often the two
+disagree, and why the product results differ (word boundaries make the
+matcher stricter, e.g. 'MS' no longer matches inside "systems").
+
+Usage: python backend/scripts/bench_signal_matcher.py [texts]   (default: 5000)
+"""
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from config import FUEL_KEYWORDS, OPERATIONAL_KEYWORDS, TENDER_KEYWORDS
+from scrapers.news_scraper import NewsScraper
+from scrapers.tender_scraper import TenderScraper
+from utils.company_extractor import CompanyExtractor
+from backend.app.services.product_inference import ProductInferenceService
+from backend.app.services.product_rules import DEFAULT_PRODUCT_RULES, CompiledProductRules
+from backend.app.services.scoring_engine import ScoringEngine
+from backend.app.services.signal_matcher import signals
+
+SYLLABLES = ['ba', 'ra', 'ti', 'ka', 'ma', 'shi', 'van', 'del', 'pur', 'nag', 'sar', 'ko', 'lin']
+CORES = ['steel', 'cement', 'power', 'textiles', 'logistics', 'chemicals', 'paper']
+
+SENTENCES = [
+    "The company said its new plant in Gujarat will start commissioning next quarter.",
+    "Shares of the firm rose after quarterly results beat estimates.",
+    "Officials announced systems upgrades for formal reporting across the group.",
+    "The board approved a capacity expansion worth 1,200 crore.",
+    "A tender for supply of high speed diesel for gensets was floated.",
+    "The mega project includes a captive power unit and two boilers.",
+    "Road construction on the highway will need VG 30 bitumen.",
+    "The SME lender expanded its digital banking platform.",
+    "Analysts expect demand for furnace oil from thermal units to stay firm.",
+    "MS and HSD sales rose 4% in the month, the ministry said.",
+    "The textile mill is adding jute batching oil capacity.",
+    "Its software arm signed a deal with a European bank.",
+]
+
+# Ordinary article prose, most of a scraped story
+FILLER = [
+    "The announcement came a day after the company's annual general meeting in Mumbai.",
+    "A spokesperson declined to comment on the timeline when contacted by reporters.",
+    "The chairman told shareholders that the outlook for the coming year remained positive.",
+    "Earlier this year the group restructured its board and appointed a new chief executive.",
+    "The state government has offered land at concessional rates to attract investors.",
+    "Local residents welcomed the move, saying it would create jobs in the district.",
+    "The firm's stock closed marginally higher on the National Stock Exchange on Friday.",
+    "Industry observers noted that similar projects had faced delays over land acquisition.",
+    "The company did not disclose the names of the lenders involved in the deal.",
+    "According to people familiar with the matter, talks have been going on for months.",
+]
+
+CAUSES = {
+    'inside': 'term found inside a longer word',
+    'capitals': "capitalised term ('MS', 'HP Racer') never matched the lowercased text",
+    'whitespace': 'phrase split by a line break or a run of spaces',
+}
+
+
+def legacy_infer_products(lowered):
+    """ProductInferenceService.infer_products with the substring tests it used before the shared matcher"""
+    results = []
+    for code, rule in DEFAULT_PRODUCT_RULES.items():
+        if any(neg in lowered for neg in rule['negative_keywords']):
+            continue
+        kw = next((kw for kw in rule['keywords'] if kw in lowered), None)
+        ctx = next((ctx for ctx in rule['contexts'] if ctx in lowered), None)
+        confidence = 0.0
+        reasons = []
+        if kw:
+            confidence += 0.6
+            reasons.append(f"Matched keyword: '{kw}'")
+        if ctx:
+            confidence += 0.3
+            reasons.append(f"Matched context: '{ctx}'")
+        for term, penalty in rule['disqualifiers'].items():
+            if term in lowered:
+                confidence += penalty
+                reasons.append(f"Disqualifier: '{term}' ({penalty:+.2f})")
+        confidence = min(confidence, 1.0)
+        if confidence >= 0.4:
+            results.append({'code': code, 'name': rule['name'], 'confidence': round(confidence, 2),
+                            'reasoning': '; '.join(reasons)})
+    results.sort(key=lambda x: x['confidence'], reverse=True)
+    return results
+
+
+def legacy_pipeline(text):
+    """The substring loops each consumer ran before the shared matcher"""
+    lowered = text.lower()
+    news = any(kw.lower() in lowered for kw in FUEL_KEYWORDS) or \
+        any(kw.lower() in lowered for kw in OPERATIONAL_KEYWORDS)
+    tender = any(kw.lower() in lowered for kw in TENDER_KEYWORDS)
+
+    products = sorted(p['code'] for p in legacy_infer_products(lowered))
+
+    industry = 'General Business'
+    for name, keywords in CompanyExtractor.INDUSTRY_KEYWORDS.items():
+        if any(kw in lowered for kw in keywords):
+            industry = name
+            break
+
+    size = 0.2
+    for weight, keywords in ScoringEngine.SIZE_INDICATORS.values():
+        if any(kw in lowered for kw in keywords):
+            size = weight
+            break
+    return news, tender, products, industry, size
+
+
+def product_causes(text, rules):
+    """Why the product terms hit differently in `text`: {(cause, term)}, cause a key of CAUSES"""
+    lowered = text.lower()
+    hits = rules.matcher.scan(text)
+    causes = set()
+    for code, rule in rules.rules.items():
+        for kind, terms in (('keyword', rule['keywords']), ('context', rule['contexts']),
+                            ('negative', rule['negative_keywords']), ('disqualifier', rule['disqualifiers'])):
+            matched = hits.get(f'{kind}:{code}', ())
+            for term in terms:
+                if (term in lowered) == (term in matched):
+                    continue
+                if term in lowered:
+                    causes.add(('inside', term))
+                elif term != term.lower():
+                    causes.add(('capitals', term))
+                else:
+                    causes.add(('whitespace', term))
+    return causes
+
+
+def matcher_pipeline(text, news_scraper, tender_scraper):
+    return (
+        news_scraper.is_relevant(text),
+        tender_scraper.is_relevant(text),
+        sorted(p['code'] for p in ProductInferenceService.infer_products(text)),
+        CompanyExtractor.get_industry_from_text(text),
+        ScoringEngine.calculate_size_proxy(text)
+    )
+
+
+def timed(fn, runs=3):
+    """Median seconds over `runs` calls, and the last result"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def compare(name, texts, news_scraper, tender_scraper, rules):
+    count = len(texts)
+    print(f"\n{name}: {count:,} texts, avg {sum(map(len, texts)) // count} chars")
+
+    elapsed, legacy = timed(lambda: [legacy_pipeline(t) for t in texts])
+    print(f"Legacy substring loops: {count / elapsed:>8,.0f} texts/sec")
+    elapsed, current = timed(lambda: [matcher_pipeline(t, news_scraper, tender_scraper) for t in texts])
+    print(f"Shared SignalMatcher:   {count / elapsed:>8,.0f} texts/sec")
+
+    fields = ['news relevant', 'tender relevant', 'products', 'industry', 'size']
+    for i, field in enumerate(fields):
+        diffs = sum(a[i] != b[i] for a, b in zip(legacy, current))
+        print(f"   {field:<16} differs on {diffs:,} texts")
+
+    # Texts and terms behind each cause of a product difference
+    causes = {}
+    for text, a, b in zip(texts, legacy, current):
+        if a[2] != b[2]:
+            found = product_causes(text, rules)
+            for cause in {cause for cause, _ in found}:
+                texts_with_cause, terms = causes.setdefault(cause, [0, set()])
+                causes[cause][0] += 1
+                terms.update(term for c, term in found if c == cause)
+    for cause, (texts_with_cause, terms) in sorted(causes.items(), key=lambda item: -item[1][0]):
+        print(f"      {texts_with_cause:>6,} texts: {CAUSES[cause]} ({', '.join(sorted(terms))})")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(5)
+    # Distinct texts so the per-text scan cache only helps within one text's checks
+    dense = [f"[{i}] " + ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(8, 20))) for i in range(count)]
+    articles = [f"[{i}] " + ' '.join(rng.choice(SENTENCES) if rng.random() < 0.15 else rng.choice(FILLER)
+                                     for _ in range(rng.randint(8, 20))) for i in range(count)]
+    news_scraper = NewsScraper(db=None, compliance_checker=None)
+    tender_scraper = TenderScraper(db=None, compliance_checker=None)
+
+    print("=" * 60)
+    print(f"Signal matcher benchmark: {sum(len(t) for t in signals._terms.values())} shared terms")
+    print("=" * 60)
+    rules = CompiledProductRules(DEFAULT_PRODUCT_RULES)
+    compare('Keyword-dense texts', dense, news_scraper, tender_scraper, rules)
+    compare('Article-like texts (15% signal sentences)', articles, news_scraper, tender_scraper, rules)
+
+    # Keyword lists grow (product rules, industries); one substring test per
+    # term grows with them, a scan barely does
+    print()
+    sample = dense[:1000]
+    for extra in (1000, 10000):
+        terms = [f"{rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)} {rng.choice(CORES)}"
+                 for _ in range(extra)]
+        signals.register('bench:extra', terms)
+        all_terms = [t.lower() for terms in signals._terms.values() for t in terms]
+        signals.scan('warm up')
+
+        start = time.perf_counter()
+        for text in sample:
+            lowered = text.lower()
+            [t for t in all_terms if t in lowered]
+        loop_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for text in sample:
+            signals.scan(text)
+        scan_rate = len(sample) / (time.perf_counter() - start)
+        print(f"{len(all_terms):>6,} terms: substring loop {loop_rate:>8,.0f} texts/sec, scan {scan_rate:>8,.0f} texts/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Company extraction worst-case latency check
+
+Feeds pathological inputs (long runs of capitals, one huge word, endless
+"A & B & ..." chains, whitespace floods, megabyte documents) through every
+CompanyExtractor entry point and fails if any call exceeds the budget.
+The pre-engine patterns are timed on small versions of the same inputs to
+show how they grew.
+
+Usage: python backend/scripts/check_extraction_latency.py [budget_ms]   (default: 250)
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from utils.company_extractor import CompanyExtractor
+
+# Patterns as they were compiled per call before the engine
+LEGACY_PATTERNS = {
+    'suffix': re.compile(r'\b([A-Z][A-Za-z&\s]+(?:' + '|'.join(CompanyExtractor.COMPANY_SUFFIXES) + r'))\b'),
+    'headline': re.compile(r'([A-Z][a-zA-Z\s&]+(?:Ltd|Limited|Corporation|Corp|Inc|Industries|Chemicals|Petroleum|Energy|Power|Textiles))'),
+    'primary': re.compile(r'([A-Z][A-Za-z\s&]+?)\s+(?:announces|reported|launched|signed|awarded)'),
+}
+
+
+def pathological(size: int):
+    return {
+        'capitals run': 'A' * size,
+        'capital words': 'ALPHA BETA ' * (size // 11),
+        'one huge word': 'Z' + 'x' * size,
+        'ampersand chain': 'A & ' * (size // 4),
+        'whitespace flood': 'Tata' + ' ' * size + 'Power',
+        'near-miss suffixes': 'Foo Lt Foo Limite Foo Corpo ' * (size // 28),
+        'real news x many': ('Reliance Industries Ltd signed a supply deal with Indian Oil. '
+                             'Tata Power announced expansion. ') * (size // 93),
+    }
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+
+    print("=" * 70)
+    print(f"Extraction worst-case latency (budget {budget_ms:.0f} ms per call)")
+    print("=" * 70)
+
+    entry_points = {
+        'extract_companies': CompanyExtractor.extract_companies,
+        'extract_primary_company': CompanyExtractor.extract_primary_company,
+        'extract_from_headline': lambda text: CompanyExtractor.extract_from_headline(text, text),
+    }
+    worst = 0.0
+    failures = []
+    print(f"   {'input':<20} {'size':>15}  " + "  ".join(f"{ep[:7]:>7}" for ep in entry_points))
+    for size in (10_000, 1_000_000):
+        for name, text in pathological(size).items():
+            times = {ep: timed(fn, text) for ep, fn in entry_points.items()}
+            slowest = max(times.values())
+            worst = max(worst, slowest)
+            if slowest > budget_ms:
+                failures.append((size, name, slowest))
+            print(f"   {name:<20} {size:>9,} chars  " + "  ".join(f"{ms:7.1f}" for ms in times.values()) + " ms")
+
+    batch = list(pathological(10_000).values()) * 20
+    start = time.perf_counter()
+    CompanyExtractor.extract_many(batch)
+    print(f"extract_many: {len(batch)} texts in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print("\nPre-engine patterns (unbounded repeats) on 'capital words', growing quadratically:")
+    for size in (2_000, 4_000, 8_000):
+        text = pathological(size)['capital words']
+        print(f"   {size:>5,} chars: " + ", ".join(f"{name} {timed(pattern.findall, text):7.1f} ms"
+                                            for name, pattern in LEGACY_PATTERNS.items()))
+
+    print(f"\nWorst call: {worst:.1f} ms")
+    if failures:
+        for size, name, ms in failures:
+            print(f"❌ {name} ({size:,} chars) took {ms:.1f} ms")
+        sys.exit(1)
+    print("✅ All calls within budget")
+
+
+if __name__ == "__main__":
+    main()
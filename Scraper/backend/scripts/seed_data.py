@@ -10,9 +10,25 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.app.models.database import db
 from backend.app.utils.security import get_password_hash
+from backend.app.services.gazetteer import DEFAULT_ALIASES
+from backend.app.services.product_rules import DEFAULT_PRODUCT_RULES
 import json
 from datetime import datetime
 
+# Reference confidence per scenario, shown with each product (not used by inference)
+BASE_CONFIDENCE_RULES = {
+    'FO': {'explicitTenderWithVolume': 0.95, 'furnaceInstallation': 0.85, 'boilerMention': 0.75},
+    'LSHS': {'explicitTenderWithVolume': 0.95},
+    'HSD': {'explicitTenderWithVolume': 0.95, 'gensetInstallationAnnouncement': 0.85, 'dieselMention': 0.70},
+    'LDO': {'explicitTenderWithVolume': 0.90},
+    'BITUMEN': {'roadConstructionTender': 0.92, 'bitumenMention': 0.80},
+    'HEXANE': {'explicitTenderWithVolume': 0.90},
+    'MTO': {'explicitTenderWithVolume': 0.90},
+    'JBO': {'explicitTenderWithVolume': 0.90},
+    'MS': {'explicitTender': 0.90, 'fleetRequirement': 0.75},
+    'LUBRICANTS': {'lubricantTender': 0.85, 'maintenanceContract': 0.70},
+}
+
 
 def seed_users():
     """Create initial users"""
@@ -65,95 +81,19 @@ def seed_products():
     conn = db.get_connection()
     c = conn.cursor()
     
+    # The built-in inference rules are the seed; edits then go through the API
     products = [
         {
-            'code': 'HSD',
-            'name': 'High Speed Diesel',
-            'category': 'Fuels',
-            'base_confidence_rules': json.dumps({
-                'explicitTenderWithVolume': 0.95,
-                'gensetInstallationAnnouncement': 0.85,
-                'dieselMention': 0.70
-            }),
-            'primary_keywords': json.dumps([
-                'high speed diesel', 'HSD', 'diesel', 'diesel genset', 'genset fuel'
-            ]),
-            'secondary_keywords': json.dumps([
-                'power backup', 'generator', 'captive power', 'DG set'
-            ]),
-            'negative_keywords': json.dumps([
-                'retail', 'petrol pump', 'filling station'
-            ])
-        },
-        {
-            'code': 'FO',
-            'name': 'Furnace Oil',
-            'category': 'Fuels',
-            'base_confidence_rules': json.dumps({
-                'explicitTenderWithVolume': 0.95,
-                'furnaceInstallation': 0.85,
-                'boilerMention': 0.75
-            }),
-            'primary_keywords': json.dumps([
-                'furnace oil', 'FO', 'LSHS', 'fuel oil'
-            ]),
-            'secondary_keywords': json.dumps([
-                'boiler', 'furnace', 'industrial heating', 'thermal power'
-            ]),
-            'negative_keywords': json.dumps([
-                'automotive', 'vehicle'
-            ])
-        },
-        {
-            'code': 'BITUMEN',
-            'name': 'Bitumen',
-            'category': 'Specialty',
-            'base_confidence_rules': json.dumps({
-                'roadConstructionTender': 0.92,
-                'bitumenMention': 0.80
-            }),
-            'primary_keywords': json.dumps([
-                'bitumen', 'asphalt', 'road construction', 'highway project'
-            ]),
-            'secondary_keywords': json.dumps([
-                'paving', 'surfacing', 'road work', 'NHAI'
-            ]),
-            'negative_keywords': json.dumps([])
-        },
-        {
-            'code': 'MS',
-            'name': 'Motor Spirit (Petrol)',
-            'category': 'Fuels',
-            'base_confidence_rules': json.dumps({
-                'explicitTender': 0.90,
-                'fleetRequirement': 0.75
-            }),
-            'primary_keywords': json.dumps([
-                'motor spirit', 'MS', 'petrol', 'gasoline'
-            ]),
-            'secondary_keywords': json.dumps([
-                'fleet', 'vehicles', 'transportation'
-            ]),
-            'negative_keywords': json.dumps([
-                'retail pump'
-            ])
-        },
-        {
-            'code': 'LUBRICANTS',
-            'name': 'Lubricants',
-            'category': 'Lubricants',
-            'base_confidence_rules': json.dumps({
-                'lubricantTender': 0.85,
-                'maintenanceContract': 0.70
-            }),
-            'primary_keywords': json.dumps([
-                'lubricant', 'engine oil', 'grease', 'HP Racer', 'HP Milcy'
-            ]),
-            'secondary_keywords': json.dumps([
-                'maintenance', 'machinery', 'industrial oil'
-            ]),
-            'negative_keywords': json.dumps([])
+            'code': code,
+            'name': rule['name'],
+            'category': rule['category'],
+            'base_confidence_rules': json.dumps(BASE_CONFIDENCE_RULES.get(code, {})),
+            'primary_keywords': json.dumps(rule['keywords']),
+            'secondary_keywords': json.dumps(rule['contexts']),
+            'negative_keywords': json.dumps(rule['negative_keywords']),
+            'disqualifiers': json.dumps(rule['disqualifiers'])
         }
+        for code, rule in DEFAULT_PRODUCT_RULES.items()
     ]
     
     now = datetime.now().isoformat()
@@ -171,11 +111,12 @@ def seed_products():
                      (product['code'], product['name'], product['category'],
                       product['base_confidence_rules'], product['primary_keywords'],
                       product['secondary_keywords'], product['negative_keywords'],
-                      '{}', '{}', now))
+                      '{}', product['disqualifiers'], now))
             print(f"✅ Created product: {product['code']} - {product['name']}")
         else:
             print(f"⏭️  Product already exists: {product['code']}")
     
+    db.bump_cache_version('product_rules', conn)
     conn.commit()
     conn.close()
 
@@ -225,10 +166,26 @@ def seed_territories():
         except Exception as e:
             print(f"⚠️  Territory {territory['name']} might already exist: {e}")
     
+    db.bump_cache_version('territories', conn)
     conn.commit()
     conn.close()
 
 
+def seed_company_aliases():
+    """Create canonical records for well-known companies and map their acronyms/spellings"""
+    print("\nSeeding company aliases...")
+    
+    added = 0
+    for canonical_name, aliases in DEFAULT_ALIASES.items():
+        company_id = db.insert_company(canonical_name)
+        added += db.add_company_alias(company_id, canonical_name, alias_type='CANONICAL')
+        for alias in aliases:
+            alias_type = 'ACRONYM' if alias.isupper() and ' ' not in alias else 'ALIAS'
+            added += db.add_company_alias(company_id, alias, alias_type=alias_type)
+    
+    print(f"✅ {added} aliases added for {len(DEFAULT_ALIASES)} companies")
+
+
 def main():
     """Run all seeding functions"""
     print("=" * 60)
@@ -238,6 +195,7 @@ def main():
     seed_users()
     seed_products()
     seed_territories()
+    seed_company_aliases()
     
     print("\n" + "=" * 60)
     print("✅ Seeding completed successfully!")
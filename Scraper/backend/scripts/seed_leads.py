@@ -197,6 +197,7 @@ def seed_leads(count=100):
                       f"https://example.com/{signal_type.lower()}/{i}",
                       products_mentioned, round(confidence, 2), timestamp, 
                       status, assigned_to))
+            c.execute('INSERT INTO lead_products (lead_id, product_code) VALUES (?, ?)', (c.lastrowid, product))
             created_leads += 1
             
             if (created_leads) % 25 == 0:
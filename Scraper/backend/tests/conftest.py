@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the backend tests
+
+Run from Scraper/: python -m pytest backend/tests
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# Importing the models opens the module-level database; keep it off hp_pulse.db
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(), 'test.db'))
+
+import pytest
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh, fully migrated database"""
+    from backend.app.models.database import DatabaseExtended
+    return DatabaseExtended(str(tmp_path / 'test.db'))
@@ -0,0 +1,39 @@
+from backend.app.services.company_dedup import CompanyDeduplicator
+
+
+def add_company(db, name, leads):
+    conn = db.get_connection()
+    c = conn.cursor()
+    c.execute("INSERT INTO companies (name, normalized_name, created_at) VALUES (?, ?, '2025-01-01')",
+              (name, name.lower()))
+    company_id = c.lastrowid
+    c.executemany('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url, scraped_at)
+                     VALUES (?, 'text', 'news', 'test', 'https://example.com', '2025-01-01')''',
+                  [(company_id,)] * leads)
+    conn.commit()
+    conn.close()
+    return company_id
+
+
+def test_chained_matches_only_merge_into_a_matching_canonical(db):
+    # sharma~sharda and sharda~shard, but sharma and shard are far apart
+    sharma = add_company(db, 'Sharma Traders', 3)
+    sharda = add_company(db, 'Sharda Traders', 1)
+    shard = add_company(db, 'Shard Traders', 0)
+
+    plan = CompanyDeduplicator(db, workers=1).plan()
+
+    assert [(m['merged_id'], m['canonical_id']) for m in plan['merges']] == [(sharda, sharma)]
+    assert plan['merges'][0]['score'] >= 0.88
+    assert plan['clusters'] == 1
+    assert shard not in {m['merged_id'] for m in plan['merges']}
+
+
+def test_cluster_around_the_middle_name_merges_both(db):
+    sharma = add_company(db, 'Sharma Traders', 0)
+    sharda = add_company(db, 'Sharda Traders', 5)
+    shard = add_company(db, 'Shard Traders', 0)
+
+    plan = CompanyDeduplicator(db, workers=1).plan()
+
+    assert sorted((m['merged_id'], m['canonical_id']) for m in plan['merges']) == [(sharma, sharda), (shard, sharda)]
@@ -0,0 +1,33 @@
+from backend.app.repositories import dashboard
+
+
+def add_lead(db, products):
+    conn = db.get_connection()
+    c = conn.cursor()
+    c.execute("INSERT OR IGNORE INTO companies (id, name, normalized_name, created_at) "
+              "VALUES (1, 'Acme Steel', 'acme steel', '2025-01-01')")
+    c.execute('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url, scraped_at)
+                 VALUES (1, 'text', 'news', 'test', 'https://example.com', '2025-01-10T09:00:00')''')
+    c.executemany("INSERT INTO lead_products (lead_id, product_code) VALUES (?, ?)",
+                  [(c.lastrowid, code) for code in products])
+    conn.commit()
+    conn.close()
+
+
+def test_leads_without_products_count_as_unknown(db, monkeypatch):
+    monkeypatch.setattr(dashboard, 'db', db)
+    # Eleven products, each with more leads than the untagged ones
+    codes = [f'P{i}' for i in range(11)]
+    for code in codes:
+        for _ in range(3):
+            add_lead(db, [code])
+    add_lead(db, ['P0', 'P1'])
+    add_lead(db, [])
+    add_lead(db, [])
+
+    stats = dashboard.get_stats.sync('2025-01-01', '2025-01-31', '2025-01-31T00:00:00', [])
+
+    assert stats['total_leads'] == 36
+    assert len(stats['by_product']) == 10
+    assert dict(stats['by_product'])['P0'] == 4
+    assert stats['no_product'] == 2
@@ -0,0 +1,94 @@
+import smtplib
+
+import pytest
+
+from backend.app.services.email_channel import EmailChannel, SMTPConnectionPool
+
+
+class FakeSMTP:
+    """SMTP stand-in: `failures` maps a recipient to the error raised when sending to it"""
+
+    failures = {}
+    sent = []
+    connections = []
+
+    def __init__(self, host, port, timeout=None):
+        self.closed = False
+        FakeSMTP.connections.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        return (250, b'OK')
+
+    def send_message(self, message):
+        error = FakeSMTP.failures.get(message['To'])
+        if error is not None:
+            if isinstance(error, smtplib.SMTPServerDisconnected):
+                del FakeSMTP.failures[message['To']]  # Only this session drops
+            raise error
+        FakeSMTP.sent.append(message['To'])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def channel(monkeypatch):
+    monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+    FakeSMTP.failures, FakeSMTP.sent, FakeSMTP.connections = {}, [], []
+    return EmailChannel(SMTPConnectionPool('smtp.example.com', 587, 'user', 'secret', size=1), 'alerts@example.com')
+
+
+def deliveries(count):
+    return [(f'officer{i}@example.com', [{'lead_id': i, 'company_name': 'Acme', 'confidence': 0.8}])
+            for i in range(count)]
+
+
+def test_disconnect_mid_batch_resends_only_unsent_and_reports_success(channel):
+    FakeSMTP.failures['officer2@example.com'] = smtplib.SMTPServerDisconnected('gone')
+
+    errors = channel.send_batch(deliveries(5))
+
+    assert errors == [None] * 5
+    assert FakeSMTP.sent == [f'officer{i}@example.com' for i in range(5)]
+    assert len(FakeSMTP.connections) == 2 and FakeSMTP.connections[0].closed
+
+
+def test_rejected_message_fails_alone(channel):
+    FakeSMTP.failures['officer1@example.com'] = smtplib.SMTPDataError(554, b'message rejected')
+
+    errors = channel.send_batch(deliveries(4))
+
+    assert errors[0] is None and errors[2] is None and errors[3] is None
+    assert '554' in errors[1]
+    assert len(FakeSMTP.connections) == 1 and channel.pool.logins == 1
+
+
+def test_unsent_messages_keep_the_connection_error(channel):
+    FakeSMTP.failures['officer1@example.com'] = smtplib.SMTPServerDisconnected('gone')
+    FakeSMTP.failures['officer2@example.com'] = smtplib.SMTPResponseException(421, b'closing channel')
+
+    errors = channel.send_batch(deliveries(4))
+
+    assert errors[0] is None and errors[1] is None
+    assert all('421' in error for error in errors[2:])
+
+
+def test_connection_dropped_on_any_error(channel):
+    pool = channel.pool
+    with pytest.raises(KeyError):
+        with pool.connection():
+            raise KeyError('company_name')  # e.g. a template failing mid-batch
+
+    assert FakeSMTP.connections[0].closed and not pool._idle
+    with pool.connection() as conn:  # The slot was released
+        assert conn is FakeSMTP.connections[1]
+    assert pool._idle[0][0] is conn
@@ -0,0 +1,48 @@
+import sqlite3
+
+from backend.app.models import migrations
+from backend.app.models.database import DatabaseExtended
+from backend.app.services.entity_resolution import EntityResolutionService
+
+
+def add_legacy_company(path, name):
+    """A company as stored before this normalizer: normalized_name = name.lower().strip()"""
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute("INSERT INTO companies (name, normalized_name, created_at) VALUES (?, ?, '2025-01-01')",
+              (name, name.lower().strip()))
+    conn.commit()
+    conn.close()
+    return c.lastrowid
+
+
+def test_legacy_row_is_found_by_name(db):
+    company_id = add_legacy_company(db.db_path, 'Tata Power Ltd')
+
+    assert db.insert_company('Tata Power Ltd', normalized_name='tata power') == company_id
+    assert EntityResolutionService.resolve_company(db, 'Tata Power Ltd') == company_id
+    conn = db.get_connection()
+    assert conn.execute('SELECT COUNT(*) FROM companies').fetchone()[0] == 1
+    conn.close()
+
+
+def test_migration_renormalizes_legacy_rows(tmp_path):
+    path = str(tmp_path / 'test.db')
+    conn = sqlite3.connect(path)
+    for _, _, fn in migrations.MIGRATIONS[:-1]:
+        fn(conn.cursor())
+    conn.execute(f'PRAGMA user_version = {migrations.LATEST_VERSION - 1}')
+    conn.commit()
+    conn.close()
+    tata = add_legacy_company(path, 'Tata Power Ltd')
+    hpcl = add_legacy_company(path, 'Hindustan Petroleum Corp Ltd')
+
+    db = DatabaseExtended(path)
+
+    conn = db.get_connection()
+    assert conn.execute('SELECT id, normalized_name FROM companies ORDER BY id').fetchall() == [
+        (tata, 'tata power'), (hpcl, 'hindustan petroleum')
+    ]
+    conn.close()
+    assert EntityResolutionService.resolve_company(db, 'Tata Power Company Limited') == tata
+    assert EntityResolutionService.resolve_company(db, 'Tata Power Ltd') == tata
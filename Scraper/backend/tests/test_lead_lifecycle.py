@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from backend.app.services.lead_lifecycle import LeadLifecycle
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def add_lead(db, signal_type, days_old, tender_closing_at=None):
+    conn = db.get_connection()
+    c = conn.cursor()
+    c.execute("INSERT OR IGNORE INTO companies (id, name, normalized_name, created_at) "
+              "VALUES (1, 'Acme Steel', 'acme steel', '2025-01-01')")
+    c.execute('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url, scraped_at,
+                                    tender_closing_at)
+                 VALUES (1, 'text', ?, 'test', 'https://example.com', ?, ?)''',
+              (signal_type, (NOW - timedelta(days=days_old)).isoformat(), tender_closing_at))
+    conn.commit()
+    conn.close()
+    return c.lastrowid
+
+
+def lead_state(db, lead_id):
+    conn = db.get_connection()
+    row = conn.execute('SELECT status, expires_at FROM leads WHERE id = ?', (lead_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def test_ttl_changes_apply_to_stored_open_leads(db, monkeypatch):
+    news = add_lead(db, 'news', 45)            # within the 60-day news TTL
+    directory = add_lead(db, 'directory', 150)  # within the 180-day directory TTL
+    tender = add_lead(db, 'tender', 45, tender_closing_at='2025-07-01')
+    assert LeadLifecycle.sweep(db, now=NOW)['expired'] == 0
+
+    monkeypatch.setitem(LeadLifecycle.TTL_DAYS, 'news', 30)
+    monkeypatch.setitem(LeadLifecycle.TTL_DAYS, 'directory', 365)
+    result = LeadLifecycle.sweep(db, now=NOW)
+
+    assert result['expiry_refreshed'] == 2
+    assert result['expired'] == 1
+    assert lead_state(db, news)[0] == LeadLifecycle.EXPIRED
+    assert lead_state(db, directory) == ('REVIEW_REQUIRED', (NOW + timedelta(days=215)).isoformat(timespec='seconds'))
+    assert lead_state(db, tender) == ('REVIEW_REQUIRED', '2025-07-02T00:00:00')
+
+    # Unchanged settings: nothing to recompute
+    assert LeadLifecycle.sweep(db, now=NOW)['expiry_refreshed'] == 0
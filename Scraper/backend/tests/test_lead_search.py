@@ -0,0 +1,66 @@
+import pytest
+
+from backend.app.services.lead_search import LeadSearch
+
+
+def add_lead(db, company, text):
+    conn = db.get_connection()
+    c = conn.cursor()
+    c.execute("INSERT INTO companies (name, normalized_name, created_at) VALUES (?, ?, '2025-01-01')",
+              (company, company.lower()))
+    c.execute('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url, scraped_at)
+                 VALUES (?, ?, 'news', 'test', 'https://example.com', '2025-01-10T09:00:00')''',
+              (c.lastrowid, text))
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def leads(db):
+    add_lead(db, 'Reliance Industries', 'New furnace oil boilers at Jamnagar')
+    add_lead(db, 'Jindal Steel', 'Expansion at Dahej needs high speed diesel')
+    add_lead(db, 'Acme <Chemicals>', 'Tender for *** grade bitumen')
+    return db
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('relia', '"relia"*'),
+    ('furnace  oil', '"furnace"* "oil"*'),
+    ('a', '"a"'),
+    ('oil" OR NEAR(x', '"oil"* "OR"* "NEAR"* "x"'),
+    ('***', None),
+    ('-', None),
+    ('', None),
+])
+def test_match_query(text, expected):
+    assert LeadSearch.match_query(text) == expected
+
+
+def test_match_query_keeps_the_first_terms():
+    words = [f'w{i}' for i in range(LeadSearch.MAX_TERMS + 3)]
+    assert LeadSearch.match_query(' '.join(words)).count('*') == LeadSearch.MAX_TERMS
+
+
+def test_highlight_escapes_the_snippet():
+    snippet = f'<b>{LeadSearch._OPEN}Acme{LeadSearch._CLOSE} & co</b>'
+    assert LeadSearch.highlight(snippet) == '&lt;b&gt;<mark>Acme</mark> &amp; co&lt;/b&gt;'
+    assert LeadSearch.highlight(None) is None
+
+
+def test_search_finds_prefixes_across_columns(leads):
+    result = leads.get_leads_paginated(search='relia boil', sort_by='relevance')
+    assert result['pagination']['total'] == 1
+    assert [lead['company_name'] for lead in result['leads']] == ['Reliance Industries']
+    assert '<mark>' in result['leads'][0]['snippet']
+
+
+@pytest.mark.parametrize('search', ['***', '-', '"()"'])
+def test_search_without_words_finds_nothing(leads, search):
+    result = leads.get_leads_paginated(search=search, sort_by='relevance')
+    assert result['pagination']['total'] == 0
+    assert result['leads'] == []
+
+
+@pytest.mark.parametrize('search', [None, '', '   '])
+def test_blank_search_is_no_filter(leads, search):
+    assert leads.get_leads_paginated(search=search)['pagination']['total'] == 3
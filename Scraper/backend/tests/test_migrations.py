@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+from backend.app.models import migrations
+from backend.app.models.database import DatabaseExtended
+
+
+def schema(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' "
+                        "AND name NOT LIKE 'leads_fts_%' ORDER BY type, name").fetchall()
+    columns = {table: [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+               for kind, table in rows if kind == 'table'}
+    conn.close()
+    return rows, columns
+
+
+def unversioned(path, applied):
+    """A database with the first `applied` migrations in place but user_version 0"""
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    for _, _, fn in migrations.MIGRATIONS[:applied]:
+        fn(c)
+    c.execute("INSERT INTO companies (name, normalized_name, created_at) VALUES ('Acme Steel', 'acme steel', '2025-01-01')")
+    c.execute('''INSERT INTO leads (company_id, signal_text, signal_type, source_name, source_url, confidence, scraped_at)
+                 VALUES (1, 'New furnace oil boilers', 'news', 'test', 'https://example.com', 0.8, '2025-01-10')''')
+    conn.commit()
+    conn.close()
+
+
+def test_versions_are_consecutive():
+    assert [version for version, _, _ in migrations.MIGRATIONS] == list(range(1, migrations.LATEST_VERSION + 1))
+
+
+@pytest.mark.parametrize('applied', [1, 3, 8, 11, 13])
+def test_unversioned_database_adopts_the_schema(tmp_path, applied):
+    """Databases created part-way through the pre-versioning changes end up like a fresh one"""
+    fresh = str(tmp_path / 'fresh.db')
+    DatabaseExtended(fresh)
+    path = str(tmp_path / 'old.db')
+    unversioned(path, applied)
+
+    db = DatabaseExtended(path)
+
+    assert schema(path) == schema(fresh)
+    conn = db.get_connection()
+    assert migrations.schema_version(conn) == migrations.LATEST_VERSION
+    assert conn.execute('SELECT static_score FROM leads').fetchone()[0] is not None
+    assert conn.execute("SELECT rowid FROM leads_fts WHERE leads_fts MATCH 'furnace'").fetchall() == [(1,)]
+    conn.close()
+
+
+def test_rerunning_later_migrations_keeps_one_index_row(tmp_path):
+    path = str(tmp_path / 'test.db')
+    unversioned(path, migrations.LATEST_VERSION)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA user_version = 2')
+    conn.commit()
+    conn.close()
+
+    db = DatabaseExtended(path)
+
+    conn = db.get_connection()
+    assert conn.execute('SELECT COUNT(*) FROM leads_fts').fetchone()[0] == 1
+    assert migrations.schema_version(conn) == migrations.LATEST_VERSION
+    conn.close()
@@ -0,0 +1,42 @@
+import random
+import re
+
+import pytest
+
+from backend.app.services.name_normalizer import LEGAL_SUFFIXES, normalize_many, normalize_name
+
+
+def legacy_normalize(name: str) -> str:
+    """EntityResolutionService.normalize_name before name_normalizer: one re.sub per suffix, in order"""
+    normalized = name.lower()
+    for suffix in LEGAL_SUFFIXES:
+        normalized = re.sub(suffix, '', normalized, flags=re.IGNORECASE)
+    normalized = re.sub(r'[^a-z0-9\s]', ' ', normalized)
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+@pytest.mark.parametrize('name, expected', [
+    ("Tata Power Ltd", "tata power"),
+    ("Tata Power Company Limited", "tata power"),
+    ("HPCL", "hpcl"),
+    ("Hindustan Petroleum Corp Ltd", "hindustan petroleum"),
+    ("Acme pvt ltdco", "acme"),
+    ("Nestlé India Ltd", "nestle india"),
+    ("", ""),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_matches_legacy_on_suffix_soup():
+    """Suffix fragments glued together, where removing one exposes the next"""
+    rng = random.Random(7)
+    fragments = ['pvt', 'ltd', 'ltd.', 'co', 'co.', 'corp', 'inc', 'inds', 'ent', 'limited', 'private',
+                 'group', 'llp', 'acme', 'steel', 'l', 'td', 'c', 'o', '&', '-']
+    separators = ['', ' ', '. ', '.', '-']
+    names = [''.join(rng.choice(fragments) + rng.choice(separators) for _ in range(rng.randint(1, 6)))
+             for _ in range(20_000)]
+    names = [name.title() if rng.random() < 0.3 else name for name in names]
+
+    assert [n for n in names if normalize_name(n) != legacy_normalize(n)] == []
+    assert normalize_many(names) == [legacy_normalize(n) for n in names]
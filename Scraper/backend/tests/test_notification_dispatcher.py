@@ -0,0 +1,126 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models import database
+from backend.app.services import notification_dispatcher, notification_service
+from backend.app.services.notification_dispatcher import NotificationDispatcher
+from backend.app.services.notification_service import NotificationService
+
+
+class RecordingNotifier(NotificationService):
+    """Digest-mode notifier that records WhatsApp deliveries instead of sending them"""
+
+    whatsapp_configured = True
+    email_configured = False
+
+    def __init__(self):
+        super().__init__(pool_size=1)
+        self.digest_enabled = True
+        self.digest_window = 900
+        self.digest_max_items = 10
+        self.urgent_confidence = 0.9
+        self.delivered = []
+
+    def deliver(self, channel, recipient, leads):
+        self.delivered.append((recipient, [lead['lead_id'] for lead in leads]))
+        return True
+
+
+class Clock(datetime):
+    """datetime whose now() is set by the test"""
+
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    Clock.current = Clock(2025, 1, 10, 9, 0, 0)
+    for module in (database, notification_dispatcher, notification_service):
+        monkeypatch.setattr(module, 'datetime', Clock)
+    return Clock
+
+
+def queue(db, lead_id, recipient, confidence, created_at):
+    conn = db.get_connection()
+    conn.execute('''INSERT INTO notification_outbox
+                    (lead_id, channel, recipient, payload, idempotency_key, status, next_attempt_at, created_at)
+                    VALUES (?, 'WHATSAPP', ?, ?, ?, 'PENDING', ?, ?)''',
+                 (lead_id, recipient, json.dumps({'lead_id': lead_id, 'confidence': confidence}),
+                  f'lead:{lead_id}:{recipient}', created_at, created_at))
+    conn.commit()
+    conn.close()
+
+
+def test_waiting_digest_rows_do_not_starve_urgent_alerts(db):
+    notifier = RecordingNotifier()
+    dispatcher = NotificationDispatcher(db, notifier, batch_size=5)
+    start = datetime.now() - timedelta(minutes=1)
+    # More waiting digest rows than the peek window (batch_size * 10), all older than the alert
+    for i in range(60):
+        queue(db, i, f'+91{i:010d}', 0.5, (start + timedelta(milliseconds=i)).isoformat())
+    queue(db, 1000, '+919999999999', 0.95, datetime.now().isoformat())
+
+    asyncio.run(dispatcher.drain_once())
+    asyncio.run(dispatcher.drain_once())
+
+    assert notifier.delivered == [('+919999999999', [1000])]
+    conn = db.get_connection()
+    parked = conn.execute("SELECT MIN(next_attempt_at) FROM notification_outbox WHERE lead_id < 1000").fetchone()[0]
+    conn.close()
+    assert parked == (start + timedelta(seconds=900)).isoformat()
+
+
+def test_digest_released_once_window_elapsed(db):
+    notifier = RecordingNotifier()
+    dispatcher = NotificationDispatcher(db, notifier)
+    old = (datetime.now() - timedelta(seconds=1000)).isoformat()
+    queue(db, 1, '+911111111111', 0.5, old)
+    queue(db, 2, '+911111111111', 0.6, old)
+
+    asyncio.run(dispatcher.drain_once())
+
+    assert notifier.delivered == [('+911111111111', [1, 2])]
+
+
+def test_alerts_on_later_ticks_join_the_waiting_digest(db, clock):
+    notifier = RecordingNotifier()
+    dispatcher = NotificationDispatcher(db, notifier)
+    start = clock.current
+    # Five non-urgent leads for one officer, a minute apart, each followed by a tick
+    for i in range(5):
+        clock.current = start + timedelta(seconds=60 * i)
+        queue(db, i, '+911111111111', 0.5, clock.current.isoformat())
+        asyncio.run(dispatcher.drain_once())
+    assert notifier.delivered == []
+
+    clock.current = start + timedelta(seconds=899)
+    asyncio.run(dispatcher.drain_once())
+    assert notifier.delivered == []
+
+    clock.current = start + timedelta(seconds=900)
+    asyncio.run(dispatcher.drain_once())
+    assert notifier.delivered == [('+911111111111', [0, 1, 2, 3, 4])]
+
+
+def test_digest_size_counts_rows_from_earlier_ticks(db, clock):
+    notifier = RecordingNotifier()
+    notifier.digest_max_items = 3
+    dispatcher = NotificationDispatcher(db, notifier)
+    start = clock.current
+    for i in range(4):
+        clock.current = start + timedelta(seconds=60 * i)
+        queue(db, i, '+911111111111', 0.5, clock.current.isoformat())
+        asyncio.run(dispatcher.drain_once())
+
+    # Full at the third lead; the fourth starts a new window
+    assert notifier.delivered == [('+911111111111', [0, 1, 2])]
+    clock.current = start + timedelta(seconds=180 + 900)
+    asyncio.run(dispatcher.drain_once())
+    assert notifier.delivered == [('+911111111111', [0, 1, 2]), ('+911111111111', [3])]
@@ -0,0 +1,81 @@
+import json
+import random
+
+import pytest
+
+from backend.app.services import product_inference
+from backend.app.services.product_inference import ProductInferenceService
+from backend.app.services.product_rules import DEFAULT_PRODUCT_RULES, CompiledProductRules, rules_from_rows
+
+FILLER = ['the', 'plant', 'unit', 'for', 'and', 'systems', 'formal', 'boilers', 'pumps', 'Vizag', 'tender',
+          'vehicles', 'vehicle', 'automotive', 'oils', 'ms', 'fo', 'IT', 'grades', 'x']
+SEPARATORS = [' ', ' ', ' ', ', ', '.', '-', '\n', '  ', '/']
+
+
+def rule_words(rules):
+    """Every rule term, split into words in their original case and run together whole"""
+    words = []
+    for rule in rules.values():
+        for term in rule['keywords'] + rule['contexts'] + rule['negative_keywords'] + list(rule['disqualifiers']):
+            words.append(term)
+            words.extend(term.split())
+    return words
+
+
+def random_texts(count, seed):
+    rng = random.Random(seed)
+    words = rule_words(DEFAULT_PRODUCT_RULES) + FILLER
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 14)):
+            word = rng.choice(words)
+            roll = rng.random()
+            if roll < 0.1:
+                word += rng.choice(['s', 'es'])
+            elif roll < 0.2:
+                word = word.upper()
+            elif roll < 0.3:
+                word = word.title()
+            parts.append(word + rng.choice(SEPARATORS))
+        texts.append(''.join(parts))
+    return texts
+
+
+@pytest.fixture
+def rules():
+    return CompiledProductRules(DEFAULT_PRODUCT_RULES)
+
+
+def test_negative_keyword_inside_a_longer_matched_term(rules):
+    """'vehicle' (FO negative) inside 'vehicles' (an MS context) still discards FO"""
+    text = "Furnace oil for boilers and petrol vehicles"
+    assert [r['code'] for r in ProductInferenceService.infer_products(text, rules)] == ['MS']
+    assert ProductInferenceService.infer_products_batch([text], rules) == [
+        ProductInferenceService.infer_products(text, rules)
+    ]
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_batch_matches_per_text(rules, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(product_inference, 'np', None)
+    elif product_inference.np is None:
+        pytest.skip('NumPy/SciPy not installed')
+
+    texts = random_texts(20_000, seed=5)
+    texts += texts[:100] + ['', None]
+    batch = ProductInferenceService.infer_products_batch(texts, rules)
+    for text, results in zip(texts, batch):
+        assert results == ProductInferenceService.infer_products(text or '', rules), text
+
+
+def test_rules_load_from_product_rows():
+    """Rows as seeded load back to the built-in rules; base_confidence_rules is not part of them"""
+    rows = [{'code': code, 'name': rule['name'], 'category': rule['category'],
+             'base_confidence_rules': json.dumps({'explicitTender': 0.9}),
+             'primary_keywords': json.dumps(rule['keywords']), 'secondary_keywords': json.dumps(rule['contexts']),
+             'negative_keywords': json.dumps(rule['negative_keywords']),
+             'disqualifiers': json.dumps(rule['disqualifiers'])}
+            for code, rule in DEFAULT_PRODUCT_RULES.items()]
+    assert rules_from_rows(rows) == DEFAULT_PRODUCT_RULES
@@ -0,0 +1,83 @@
+import random
+import re
+
+import pytest
+
+from backend.app.services.signal_matcher import SignalMatcher
+
+TERMS = {
+    'fuel': ['oil', 'furnace oil', 'diesel', 'high speed diesel', 'gas', 'fo 180', 'FO', 'MS'],
+    'context': ['boiler', 'vehicle', 'vehicles', 'mid-sized', 'l.d.o', 'café', 'furnace'],
+    'other': ['IT', 'ai', 'bank', 'oil', '-x', 'gas oil'],
+}
+
+
+def reference(term: str, text: str) -> bool:
+    """One regex per term: whole words, plural s/es, whitespace runs; short all-caps terms in capitals"""
+    if SignalMatcher.is_case_sensitive(term):
+        return re.search(rf'(?<!\w){re.escape(term)}(?!\w)', text) is not None
+    key = SignalMatcher.term_key(term)
+    if not re.match(r'\w', key):
+        return False
+    body = r'\s+'.join(re.escape(part) for part in key.split(' '))
+    return re.search(rf'(?<!\w){body}(?:s|es)?(?!\w)', text.lower()) is not None
+
+
+@pytest.fixture
+def matcher():
+    matcher = SignalMatcher()
+    matcher.register_many(TERMS)
+    return matcher
+
+
+@pytest.mark.parametrize('text, category, expected', [
+    ("New boilers and a furnace oil tank", 'fuel', ('oil', 'furnace oil')),
+    ("New boilers and a furnace oil tank", 'context', ('boiler', 'furnace')),
+    ("Upgrading systems for formal reporting", 'fuel', ()),
+    ("MS and FO sales rose", 'fuel', ('FO', 'MS')),
+    ("ms and fo sales rose", 'fuel', ()),
+    ("Furnace\n  Oil supplies", 'fuel', ('oil', 'furnace oil')),
+    ("Gases and FO 180 grades", 'fuel', ('gas', 'fo 180', 'FO')),
+    ("vehicles fleet", 'context', ('vehicle', 'vehicles')),
+    ("A mid-sized unit; mid sized plans", 'context', ('mid-sized',)),
+    ("Café chain", 'context', ('café',)),
+    ("The chairman said", 'other', ()),
+    ("Its IT arm and an ai lab -x", 'other', ('IT', 'ai')),
+])
+def test_scan(matcher, text, category, expected):
+    assert matcher.matches(text, category) == expected
+
+
+def test_matches_reference_regexes(matcher):
+    """Random texts of term fragments, plurals, punctuation and odd whitespace"""
+    rng = random.Random(3)
+    words = ['oil', 'oils', 'boiler', 'boilers', 'furnace', 'Furnace', 'diesel', 'high', 'speed', 'gas', 'gases',
+             'gass', 'fo', 'FO', '180', 'MS', 'Ms', 'systems', 'vehicle', 'vehicles', 'vehiclees', 'mid', 'sized',
+             'l', 'd', 'o', 'café', 'cafés', 'IT', 'it', 'ai', 'said', 'bank', 'banking', 'x', 'the', 'plant']
+    separators = [' ', ' ', ' ', '  ', '\n', ' \t ', '-', '.', ', ', '/', '', '\xa0', '’', '_']
+    texts = [''.join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+             for _ in range(5000)]
+
+    for text in texts:
+        expected = {}
+        for category, terms in TERMS.items():
+            hits = tuple(term.strip() for term in terms if reference(term, text))
+            if hits:
+                expected[category] = hits
+        assert matcher.scan(text) == expected, text
+        assert matcher.any(text, 'fuel', 'other') == ('fuel' in expected or 'other' in expected)
+        assert matcher.first(text, ['context', 'other', 'fuel']) == \
+            next((c for c in ['context', 'other', 'fuel'] if c in expected), None)
+
+
+def test_terms_registered_after_a_scan(matcher):
+    text = "Commissioning two kilns and a genset"
+    assert matcher.scan(text) == {}
+
+    other = SignalMatcher()
+    other.register('context', ['kiln'])
+    assert other.matches(text, 'context') == ('kiln',)
+
+    matcher.register('fuel', ['genset'])
+    assert matcher.scan(text) == {'fuel': ('genset',)}
+    assert other.scan(text) == {'context': ('kiln',)}
@@ -0,0 +1,47 @@
+import json
+import random
+
+from backend.app.services.subscription_index import SubscriptionIndex
+
+
+def user(user_id, products=(), territories=(), min_confidence=0.7):
+    return {'id': user_id, 'name': f'Officer {user_id}', 'email': f'o{user_id}@example.com',
+            'min_confidence': min_confidence, 'products': json.dumps(list(products)),
+            'territories': json.dumps(list(territories))}
+
+
+def brute_force(users, products, territory, confidence):
+    matched = []
+    for row in users:
+        sub = SubscriptionIndex.subscriber_from_row(row)
+        if sub['min_confidence'] > confidence:
+            continue
+        if sub['products'] and not set(sub['products']) & {p.upper() for p in products}:
+            continue
+        if territory and sub['territories'] and territory.lower() not in sub['territories']:
+            continue
+        matched.append(sub['id'])
+    return matched
+
+
+def test_match_agrees_with_brute_force():
+    rng = random.Random(3)
+    products = ['HSD', 'FO', 'LDO', 'BITUMEN']
+    territories = ['mumbai', 'pune', 'delhi', 'chennai']
+    users = [user(i, rng.sample(products, rng.randint(0, 2)), rng.sample(territories, rng.randint(0, 2)),
+                  rng.choice([0.5, 0.7, 0.85])) for i in range(200)]
+    index = SubscriptionIndex(users)
+
+    for _ in range(300):
+        lead_products = rng.sample(products, rng.randint(0, 2))
+        territory = rng.choice(territories + ['Mumbai', None])
+        confidence = rng.random()
+        got = [u['id'] for u in index.match(lead_products, territory, confidence)]
+        assert got == brute_force(users, lead_products, territory, confidence)
+
+
+def test_lead_without_territory_reaches_territory_subscribers_once():
+    index = SubscriptionIndex([user(1, ['FO'], ['mumbai', 'pune']), user(2, [], ['delhi']), user(3, ['HSD'])])
+
+    assert [u['id'] for u in index.match(['fo'], None, 0.8)] == [1, 2]
+    assert [u['id'] for u in index.match(['FO'], 'Pune', 0.8)] == [1]
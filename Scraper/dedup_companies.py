@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Company Dedup Job
+Finds duplicate companies (e.g. "Tata Power Ltd" / "Tata Power Company Limited"),
+merges each cluster into one record and repoints its leads.
+
+Usage: python dedup_companies.py [--dry-run] [--threshold 0.88] [--workers N] [--report PATH]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.models.database import DatabaseExtended as Database
+from backend.app.services.company_dedup import CompanyDeduplicator
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge duplicate companies")
+    parser.add_argument('--dry-run', action='store_true', help="write the report only, change nothing")
+    parser.add_argument('--threshold', type=float, default=None, help="minimum name similarity (default: ENTITY_MATCH_THRESHOLD)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--report', default=None, help="merge report path (default: logs/company_merges_<timestamp>.json)")
+    args = parser.parse_args()
+
+    print("🧹 Starting company dedup...")
+    db = Database()
+    dedup = CompanyDeduplicator(db, threshold=args.threshold, workers=args.workers)
+
+    start = time.perf_counter()
+    plan = dedup.plan()
+    print(f"   Companies: {plan['companies']} | Re-normalized: {len(plan['renormalized'])} | "
+          f"Clusters: {plan['clusters']} | Merges: {len(plan['merges'])} "
+          f"({time.perf_counter() - start:.1f}s, threshold {dedup.threshold}, {dedup.workers} workers)")
+
+    run_id = None
+    if not args.dry_run:
+        run_id = dedup.apply(plan)
+        print(f"✅ Merged {len(plan['merges'])} companies, "
+              f"{sum(m['leads_moved'] for m in plan['merges'])} leads repointed (run {run_id})")
+
+    report_path = args.report or os.path.join(
+        'logs', f"company_merges_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump({
+            'run_id': run_id,
+            'dry_run': args.dry_run,
+            'threshold': dedup.threshold,
+            'companies': plan['companies'],
+            'renormalized': len(plan['renormalized']),
+            'clusters': plan['clusters'],
+            'merges': plan['merges']
+        }, f, indent=2)
+    print(f"📄 Merge report: {report_path}")
+
+    # Largest clusters first, so reviewers see the riskiest merges
+    clusters = {}
+    for m in plan['merges']:
+        clusters.setdefault((m['canonical_id'], m['canonical_name']), []).append(m)
+    for (canonical_id, canonical_name), members in sorted(clusters.items(), key=lambda kv: -len(kv[1]))[:10]:
+        print(f"   #{canonical_id} {canonical_name} ← " + ", ".join(f"{m['merged_name']} ({m['score']})" for m in members[:5]))
+
+if __name__ == "__main__":
+    main()
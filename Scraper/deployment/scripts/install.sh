@@ -100,17 +100,24 @@ sed -e "s|%USER%|$USER|g" \
     -e "s|%INSTALL_DIR%|$INSTALL_DIR|g" \
     deployment/systemd/hpcl-api.service > /tmp/hpcl-api.service
 
+sed -e "s|%USER%|$USER|g" \
+    -e "s|%INSTALL_DIR%|$INSTALL_DIR|g" \
+    deployment/systemd/hpcl-notifier.service > /tmp/hpcl-notifier.service
+
 echo -e "${YELLOW}To install systemd services, run these commands as root:${NC}"
 echo ""
-echo "  sudo mkdir -p /var/log/hpcl-scraper /var/log/hpcl-api"
-echo "  sudo chown $USER:$USER /var/log/hpcl-scraper /var/log/hpcl-api"
+echo "  sudo mkdir -p /var/log/hpcl-scraper /var/log/hpcl-api /var/log/hpcl-notifier"
+echo "  sudo chown $USER:$USER /var/log/hpcl-scraper /var/log/hpcl-api /var/log/hpcl-notifier"
 echo "  sudo cp /tmp/hpcl-scraper.service /etc/systemd/system/"
 echo "  sudo cp /tmp/hpcl-api.service /etc/systemd/system/"
+echo "  sudo cp /tmp/hpcl-notifier.service /etc/systemd/system/"
 echo "  sudo systemctl daemon-reload"
 echo "  sudo systemctl enable hpcl-scraper"
 echo "  sudo systemctl enable hpcl-api"
+echo "  sudo systemctl enable hpcl-notifier"
 echo "  sudo systemctl start hpcl-scraper"
 echo "  sudo systemctl start hpcl-api"
+echo "  sudo systemctl start hpcl-notifier"
 echo ""
 
 echo -e "\n${GREEN}================================================${NC}"
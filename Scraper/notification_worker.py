@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Notification Worker
+Drains the notification outbox and delivers alerts to sales officers.
+Runs as its own process so a slow messaging API never stalls scraping.
+"""
+import asyncio
+import os
+import sys
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.models.database import DatabaseExtended as Database
+from backend.app.services.notification_dispatcher import NotificationDispatcher
+
+def main():
+    print("📨 Starting notification worker...")
+    
+    db = Database()
+    dispatcher = NotificationDispatcher(
+        db,
+        concurrency=int(os.getenv('NOTIFY_CONCURRENCY', '4')),
+        batch_size=int(os.getenv('NOTIFY_BATCH_SIZE', '50')),
+        poll_interval=float(os.getenv('NOTIFY_POLL_SECONDS', '5'))
+    )
+    
+    try:
+        asyncio.run(dispatcher.run_forever())
+    except KeyboardInterrupt:
+        metrics = dispatcher.metrics()
+        print("\n👋 Notification worker stopped")
+        print(f"   Messages: {metrics['worker']['messagesSent']} | Leads notified: {metrics['worker']['sent']} | "
+              f"Dead-lettered: {metrics['worker']['dead']} | Backlog: {metrics['backlog']}")
+
+if __name__ == "__main__":
+    main()
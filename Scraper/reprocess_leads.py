@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Lead Reprocessing Job
+Re-runs product inference and scoring over every stored lead after product
+rules or scoring weights change. Resumes from its checkpoint when interrupted.
+
+Usage: python reprocess_leads.py [--restart] [--workers N] [--chunk-size 500] [--pause 0.05] [--max-rate ROWS_PER_SEC] [--limit N]
+"""
+import argparse
+import os
+import sys
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.models.database import DatabaseExtended as Database
+from backend.app.services.lead_reprocessor import LeadReprocessor
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute products and scores of stored leads")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and start from the first lead")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=None, help=f"leads per chunk and write transaction (default: {LeadReprocessor.CHUNK_SIZE})")
+    parser.add_argument('--pause', type=float, default=0.05, help="seconds to sleep between write transactions")
+    parser.add_argument('--max-rate', type=float, default=0, help="cap on rows/sec (default: no cap)")
+    parser.add_argument('--limit', type=int, default=None, help="stop after about N rows (resume later)")
+    args = parser.parse_args()
+
+    print("🔁 Starting lead reprocessing...")
+    db = Database()
+    reprocessor = LeadReprocessor(db, workers=args.workers, chunk_size=args.chunk_size,
+                                  pause=args.pause, max_rate=args.max_rate)
+    result = reprocessor.run(restart=args.restart, limit=args.limit)
+
+    status = "✅ Reprocessed" if result['finished'] else "⏸️  Stopped after"
+    print(f"{status} {result['rows']} leads in {result['seconds']}s "
+          f"({result['rows_per_sec']:,.0f} rows/sec, {reprocessor.workers} workers, "
+          f"product rules v{result['rules_version']})")
+    if not result['finished']:
+        print(f"   Checkpoint at lead #{result['last_id']}; run again to resume")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ Scheduled scraper that monitors:
 - Government tenders (every 1 hour)
 - News sources (every 6 hours)
 - Business directories (every 24 hours)
+
+and expires stale leads every hour.
 """
 
 import schedule
@@ -19,6 +21,7 @@ from config import SOURCES
 
 # Import utilities
 from backend.app.models.database import DatabaseExtended as Database
+from backend.app.services.lead_lifecycle import LeadLifecycle
 from utils.compliance import ComplianceChecker
 
 # Import scrapers
@@ -28,6 +31,8 @@ from scrapers.directory_scraper import DirectoryScraper
 from scrapers.selenium_scraper import SeleniumScraper
 
 class HPPulseScraper:
+    EXPIRY_INTERVAL_HOURS = 1
+    
     def __init__(self):
         print("\n" + "=" * 70)
         print("🚀 Initializing HP-Pulse Scraper...")
@@ -65,6 +70,7 @@ class HPPulseScraper:
             self.scrape_tenders_selenium()
         except Exception as e:
             print(f"❌ Error in tender scraping: {e}")
+        self.report_resolution_cache('Tenders')
     
     def scrape_tenders_selenium(self):
         """Job: Deep scrape tenders with Selenium"""
@@ -91,6 +97,7 @@ class HPPulseScraper:
             self.news_scraper.scrape_all(sources)
         except Exception as e:
             print(f"❌ Error in news scraping: {e}")
+        self.report_resolution_cache('News')
     
     def scrape_directories(self):
         """Job: Scrape directory sources"""
@@ -100,6 +107,26 @@ class HPPulseScraper:
         except Exception as e:
             print(f"❌ Error in directory scraping: {e}")
     
+    def report_resolution_cache(self, job):
+        """Print the company resolution cache hit rate for the cycle just run"""
+        stats = self.db.get_resolution_cache().take_stats()
+        if stats['lookups']:
+            print(f"🗂️  {job} resolution cache: {stats['hit_rate']:.0%} hit rate "
+                  f"({stats['memory_hits']} memory, {stats['db_hits']} shared, "
+                  f"{stats['misses']} resolved of {stats['lookups']} names)")
+    
+    def expire_leads(self):
+        """Job: Expire leads past their closing date or TTL"""
+        try:
+            result = LeadLifecycle.sweep(self.db)
+            if result['expiry_refreshed']:
+                print(f"⌛ Lead TTLs changed: expiry recomputed for {result['expiry_refreshed']} open leads")
+            if result['expired'] or result['expiry_filled']:
+                print(f"⌛ Expired {result['expired']} leads in {result['batches']} batches "
+                      f"({result['expiry_filled']} expiry dates computed, {result['seconds']}s)")
+        except Exception as e:
+            print(f"❌ Error expiring leads: {e}")
+    
     def print_schedule(self):
         """Print scraping schedule"""
         print("\n" + "=" * 70)
@@ -143,6 +170,10 @@ class HPPulseScraper:
             if source.get('enabled', True):
                 print(f"         • {source['name']}")
         
+        print()
+        print(f"   ⌛ LEAD EXPIRY:")
+        print(f"       Interval: Every {self.EXPIRY_INTERVAL_HOURS} hour(s)")
+        
         print()
         print("=" * 70)
     
@@ -155,6 +186,7 @@ class HPPulseScraper:
         schedule.every(SOURCES['tenders']['interval_hours']).hours.do(self.scrape_tenders)
         schedule.every(SOURCES['news']['interval_hours']).hours.do(self.scrape_news)
         schedule.every(SOURCES['directories']['interval_hours']).hours.do(self.scrape_directories)
+        schedule.every(self.EXPIRY_INTERVAL_HOURS).hours.do(self.expire_leads)
         
         # Run immediately on start
         print("\n🔄 Running initial scrape cycle...")
@@ -163,6 +195,7 @@ class HPPulseScraper:
         self.scrape_tenders()
         self.scrape_news()
         self.scrape_directories()
+        self.expire_leads()
         
         # Show summary
         stats = self.db.get_stats()
@@ -6,6 +6,7 @@ Scrapes business directories for company listings
 from bs4 import BeautifulSoup
 from datetime import datetime
 import re
+from backend.app.services.location_extractor import location_extractor
 
 class DirectoryScraper:
     def __init__(self, db, compliance_checker):
@@ -69,25 +70,14 @@ class DirectoryScraper:
                 
                 seen_companies.add(company_name)
                 
-                # Extract location if available
-                location = None
-                location_patterns = [
-                    re.compile(r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'),  # City, State
-                    re.compile(r'(Mumbai|Delhi|Bangalore|Chennai|Kolkata|Hyderabad|Pune|Ahmedabad|Vadodara|Surat)')
-                ]
-                
-                text = comp.get_text()
-                for pattern in location_patterns:
-                    match = pattern.search(text)
-                    if match:
-                        location = match.group(1)
-                        break
+                # Location from the listing text (offline gazetteer)
+                place = location_extractor().extract(comp.get_text(' '))
                 
                 # Insert company
                 company_id = self.db.insert_company(
                     name=company_name,
                     industry='Chemical/Manufacturing',
-                    location=location
+                    location=place['location'] if place else None
                 )
                 
                 # Insert lead (low confidence - just a directory listing)
@@ -97,7 +87,8 @@ class DirectoryScraper:
                     signal_type='directory',
                     source_name=source['name'],
                     source_url=source['url'],
-                    confidence=0.3
+                    confidence=0.3,
+                    location=place or {}
                 )
                 
                 items_found += 1
@@ -174,11 +165,13 @@ class DirectoryScraper:
                     continue
                 
                 seen_companies.add(company_name)
+                place = location_extractor().extract(comp.get_text(' '))
                 
                 # Insert company
                 company_id = self.db.insert_company(
                     name=company_name,
-                    industry='Petroleum/Chemicals'
+                    industry='Petroleum/Chemicals',
+                    location=place['location'] if place else None
                 )
                 
                 # Insert lead
@@ -188,7 +181,8 @@ class DirectoryScraper:
                     signal_type='directory',
                     source_name=source['name'],
                     source_url=source['url'],
-                    confidence=0.3
+                    confidence=0.3,
+                    location=place or {}
                 )
                 
                 items_found += 1
@@ -10,6 +10,8 @@ import re
 from datetime import datetime
 import time
 
+from utils.tender_parser import TenderParser
+
 class EnhancedTenderScraper:
     def __init__(self, db, compliance_checker):
         self.db = db
@@ -136,7 +138,11 @@ class EnhancedTenderScraper:
                                         signal_type='tender',
                                         source_name='CPP Portal - Enhanced Scraper',
                                         source_url=org_tender_url,
-                                        confidence=0.90
+                                        confidence=0.90,
+                                        tender=TenderParser.normalize(
+                                            reference=tender_ref, organization=org['name'],
+                                            closing=closing_date, published=published_date
+                                        )
                                     )
                                     
                                     tenders_found += 1
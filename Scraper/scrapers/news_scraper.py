@@ -13,112 +13,97 @@ from utils.company_extractor import CompanyExtractor
 from backend.app.services.entity_resolution import EntityResolutionService
 from backend.app.services.product_inference import ProductInferenceService
 from backend.app.services.scoring_engine import ScoringEngine
-from backend.app.services.notification_service import NotificationService
+from backend.app.services.location_extractor import location_extractor
+from backend.app.services.signal_matcher import signals
+
+signals.register_many({'fuel': FUEL_KEYWORDS, 'operational': OPERATIONAL_KEYWORDS})
 
 class NewsScraper:
     def __init__(self, db, compliance_checker):
         self.db = db
         self.checker = compliance_checker
-        self.notifier = NotificationService()
         print("✅ News scraper initialized")
     
     def is_relevant(self, text):
-        """Check if text mentions relevant keywords"""
-        text_lower = text.lower()
-        
-        # Check for fuel keywords
-        fuel_match = any(kw.lower() in text_lower for kw in FUEL_KEYWORDS)
-        
-        # Check for operational keywords
-        ops_match = any(kw.lower() in text_lower for kw in OPERATIONAL_KEYWORDS)
-        
-        return fuel_match or ops_match
+        """Check if text mentions fuel or operational keywords"""
+        return signals.any(text, 'fuel', 'operational')
     
     def extract_company_name(self, title, summary):
         """Try to extract company name from news"""
-        text = f"{title} {summary}"
-        
-        # Common patterns for Indian company names
-        patterns = [
-            r'([A-Z][a-zA-Z\s&]+(?:Ltd|Limited|Corporation|Corp|Inc|Industries|Chemicals|Petroleum|Energy|Power|Textiles))',
-            r'([A-Z][a-zA-Z]+\s+[A-Z][a-zA-Z]+)\s+(?:announced|plans|to|expansion|commissioning)',
-            r'(Tata|Reliance|Adani|Birla|Vedanta|JSW|Essar|Ambuja|UltraTech)\s+[A-Z][a-zA-Z]+',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                company = match.group(1).strip()
-                # Clean up
-                company = re.sub(r'\s+', ' ', company)
-                return company
-        
-        return "Unknown Company"
-
+        return CompanyExtractor.extract_from_headline(title, summary)
+    
     def process_lead(self, company_name, signal_text, source_name, source_url, signal_type='news', industry=None):
         """Process and save lead with intelligence services"""
-        # 1. Resolve Company
-        company_id = EntityResolutionService.resolve_company(
-            self.db,
-            name=company_name,
-            industry=industry or 'Corporate'
-        )
+        # 1. Resolve Company (if no name was extracted, use the first known company mentioned)
+        company_id = None
+        if company_name == "Unknown Company":
+            mentions = self.db.get_gazetteer().find(signal_text)
+            if mentions:
+                company_id = mentions[0]['company_id']
+                company_name = mentions[0]['canonical_name']
+        
+        if company_id is None:
+            company_id = EntityResolutionService.resolve_company(
+                self.db,
+                name=company_name,
+                industry=industry or 'Corporate'
+            )
         
         # 2. Infer Products
-        products = ProductInferenceService.infer_products(signal_text)
+        products = ProductInferenceService.infer_products(signal_text, self.db.get_product_rules())
         product_codes = [p['code'] for p in products] if products else []
         
-        # 3. Calculate Score
+        # 3. Locate and route the signal, then score it
+        location = location_extractor().extract(signal_text)
+        route = self.db.route_location(location)
         scraped_at = datetime.now().isoformat()
         score_data = ScoringEngine.calculate_score(
             signal_type=signal_type,
             scraped_at=scraped_at,
             signal_text=signal_text,
-            location=None
+            location=location['location'] if location else None,
+            route=route
         )
         
-        # 4. Insert Lead
-        lead_id = self.db.insert_lead(
+        # 4. Queue alerts for high-confidence leads (delivered by the notification worker)
+        recipients = []
+        if score_data['final_score'] >= 0.7:
+            try:
+                users = self.db.get_notification_users({
+                    'products': product_codes,
+                    'territory': route['territory'] if route else None,
+                    'confidence': score_data['final_score']
+                })
+                recipients = [
+                    {'channel': 'WHATSAPP', 'address': user['phone']}
+                    for user in users if user.get('phone')
+                ] + [
+                    {'channel': 'EMAIL', 'address': user['email']}
+                    for user in users if user.get('email')
+                ]
+            except AttributeError:
+                 print("   ⚠️  Database notification method missing")
+            except Exception as e:
+                 print(f"   ⚠️  Notification lookup failed: {e}")
+        
+        # 5. Insert lead, scoring breakdown and outbox rows in one transaction
+        lead_id = self.db.insert_scored_lead(
             company_id=company_id,
             signal_text=signal_text,
             signal_type=signal_type,
             source_name=source_name,
             source_url=source_url,
-            products=product_codes,
-            confidence=score_data['final_score']
+            products=products,
+            score_data=score_data,
+            alert={
+                'company_name': company_name,
+                'confidence': f"{score_data['final_score']:.2f}",
+                'signal_type': signal_type
+            },
+            recipients=recipients,
+            location=location or {},
+            route=route or {}
         )
-        
-        # 5. Update scoring
-        try:
-            conn = self.db.get_connection()
-            c = conn.cursor()
-            c.execute("UPDATE leads SET scoring = ? WHERE id = ?", 
-                     (json.dumps(score_data), lead_id))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"   ⚠️ Could not save scoring breakdown: {e}")
-            
-        # 6. Send Notifications (High Confidence Only)
-        if score_data['final_score'] >= 0.7:
-             # Get users to notify
-            try:
-                users = self.db.get_notification_users({'territory': 'All'})
-                
-                for user in users:
-                    if user.get('phone'):
-                        self.notifier.send_whatsapp_alert(
-                            lead={
-                                'company_name': company_name,
-                                'confidence': f"{score_data['final_score']:.2f}",
-                                'signal_type': signal_type
-                            },
-                            user_phone=user['phone']
-                        )
-            except AttributeError:
-                 print("   ⚠️  Database notification method missing")
-            except Exception as e:
-                 print(f"   ⚠️  Notification failed: {e}")
             
         return lead_id, products
     
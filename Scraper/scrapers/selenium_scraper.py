@@ -15,6 +15,8 @@ import time
 import re
 from datetime import datetime
 
+from utils.tender_parser import TenderParser
+
 
 class SeleniumScraper:
     """Selenium-based scraper for dynamic content"""
@@ -147,7 +149,11 @@ class SeleniumScraper:
                                         signal_type='tender',
                                         source_name=source['name'] + ' (Selenium)',
                                         source_url=self.driver.current_url,
-                                        confidence=0.90
+                                        confidence=0.90,
+                                        tender=TenderParser.normalize(
+                                            reference=ref_no, organization=org['name'],
+                                            closing=closing_date, opening=opening_date, published=pub_date
+                                        )
                                     )
                                     
                                     tenders_found += 1
@@ -209,41 +215,10 @@ class SeleniumScraper:
         lines = text.split('\n')
         details['title'] = lines[0][:100] if lines else text[:100]
         
-        # Try to extract organization name
-        org_patterns = [
-            r'(?:by|from)\s+([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Corporation|Department|Ministry))',
-            r'([A-Z][A-Za-z\s]+(?:Department|Ministry|Corporation))'
-        ]
-        
-        for pattern in org_patterns:
-            match = re.search(pattern, text)
-            if match:
-                details['organization'] = match.group(1).strip()
-                break
-        
-        # Try to extract value
-        value_patterns = [
-            r'(?:Rs\.?|INR|₹)\s*([\d,\.]+)\s*(?:Cr|Crore|Lakh|Lakhs)?',
-            r'([\d,]+)\s*(?:Crore|Lakh)',
-        ]
-        
-        for pattern in value_patterns:
-            match = re.search(pattern, text)
-            if match:
-                details['value'] = match.group(0)
-                break
-        
-        # Try to extract deadline
-        deadline_patterns = [
-            r'(?:deadline|due|closing|last date)[:\s]*([\d\-/]+)',
-            r'(\d{2}[-/]\d{2}[-/]\d{4})'
-        ]
-        
-        for pattern in deadline_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                details['deadline'] = match.group(1)
-                break
+        # Typed fields (INR value, ISO dates, reference, organisation)
+        fields = TenderParser.parse(text)
+        details.update(fields)
+        details['deadline'] = fields['closing_at']
         
         details['description'] = ' '.join(lines[1:3]) if len(lines) > 1 else text[:200]
         
@@ -11,19 +11,20 @@ from config import TENDER_KEYWORDS
 from backend.app.services.entity_resolution import EntityResolutionService
 from backend.app.services.product_inference import ProductInferenceService
 from backend.app.services.scoring_engine import ScoringEngine
-from backend.app.services.notification_service import NotificationService
+from backend.app.services.location_extractor import location_extractor
+from backend.app.services.signal_matcher import signals
+
+signals.register('tender', TENDER_KEYWORDS)
 
 class TenderScraper:
     def __init__(self, db, compliance_checker):
         self.db = db
         self.checker = compliance_checker
-        self.notifier = NotificationService()
         print("✅ Tender scraper initialized")
     
     def is_relevant(self, text):
         """Check if tender is relevant"""
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in TENDER_KEYWORDS)
+        return signals.any(text, 'tender')
     
     def process_lead(self, company_name, signal_text, source_name, source_url, signal_type='tender'):
         """Process and save lead with intelligence services"""
@@ -35,83 +36,62 @@ class TenderScraper:
         )
         
         # 2. Infer Products
-        products = ProductInferenceService.infer_products(signal_text)
+        products = ProductInferenceService.infer_products(signal_text, self.db.get_product_rules())
         product_codes = [p['code'] for p in products] if products else []
         
-        # 3. Calculate Score
+        # 3. Locate and route the signal, then score it
+        location = location_extractor().extract(signal_text)
+        route = self.db.route_location(location)
         scraped_at = datetime.now().isoformat()
         score_data = ScoringEngine.calculate_score(
             signal_type=signal_type,
             scraped_at=scraped_at,
             signal_text=signal_text,
-            location=None # TODO: Extract location
+            location=location['location'] if location else None,
+            route=route
         )
         
-        # 4. Insert Lead
-        # Store scoring breakdown in the scoring column (as JSON) using a custom update or by formatting the insert 
-        # The base insert_lead might not support the scoring breakdown column directly if it wasn't updated, 
-        # so we might need to handle it. 
-        # Checking database.py: insert_lead takes (company_id, signal_text, signal_type, source_name, source_url, products, confidence)
-        # It DOES NOT take scoring breakdown. We need to update database.py or doing a separate update.
-        # However, the extended User requested features implies we should do it right.
-        # For now, let's use the confidence from the ScoringEngine as the main confidence.
+        # 4. Queue alerts for high-confidence leads (delivered by the notification worker)
+        recipients = []
+        if score_data['final_score'] >= 0.7:
+            try:
+                users = self.db.get_notification_users({
+                    'products': product_codes,
+                    'territory': route['territory'] if route else None,
+                    'confidence': score_data['final_score']
+                })
+                recipients = [
+                    {'channel': 'WHATSAPP', 'address': user['phone']}
+                    for user in users if user.get('phone')
+                ] + [
+                    {'channel': 'EMAIL', 'address': user['email']}
+                    for user in users if user.get('email')
+                ]
+            except AttributeError:
+                 # In case self.db is still the base class for some reason
+                 print("   ⚠️  Database notification method missing")
+            except Exception as e:
+                 print(f"   ⚠️  Notification lookup failed: {e}")
         
-        lead_id = self.db.insert_lead(
+        # 5. Insert lead, scoring breakdown and outbox rows in one transaction
+        lead_id = self.db.insert_scored_lead(
             company_id=company_id,
             signal_text=signal_text,
             signal_type=signal_type,
             source_name=source_name,
             source_url=source_url,
-            products=product_codes,
-            confidence=score_data['final_score']
+            products=products,
+            score_data=score_data,
+            alert={
+                'company_name': company_name,
+                'confidence': f"{score_data['final_score']:.2f}",
+                'signal_type': signal_type
+            },
+            recipients=recipients,
+            location=location or {},
+            route=route or {}
         )
         
-        # 5. Update with scoring breakdown (if supported by DB helper, or we hack it for now)
-        # The DatabaseExtended class added a 'scoring' column. We should try to update it.
-        try:
-            conn = self.db.get_connection()
-            c = conn.cursor()
-            c.execute("UPDATE leads SET scoring = ? WHERE id = ?", 
-                     (json.dumps(score_data), lead_id))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"   ⚠️ Could not save scoring breakdown: {e}")
-            
-        # 6. Send Notifications (High Confidence Only)
-        if score_data['final_score'] >= 0.7:
-            # Get users to notify
-            try:
-                users = self.db.get_notification_users({'territory': 'All'}) # Placeholder context
-                
-                # If no users found (e.g. no DB users yet), try to send to admin if configured
-                # For hackathon demo, we might want to force send to a specific number
-                # but NotificationService handles empty lists gracefully.
-                
-                notified_count = 0
-                for user in users:
-                    if user.get('phone'):
-                        self.notifier.send_whatsapp_alert(
-                            lead={
-                                'company_name': company_name,
-                                'confidence': f"{score_data['final_score']:.2f}",
-                                'signal_type': signal_type
-                            },
-                            user_phone=user['phone']
-                        )
-                        notified_count += 1
-                        
-                if notified_count == 0 and self.notifier.wa_phone_id:
-                     # Demo Fallback: Send to a default number if defined in env (Optional)
-                     # Since we don't have a specific env var for "ADMIN_PHONE", we skip.
-                     pass
-                     
-            except AttributeError:
-                 # In case self.db is still the base class for some reason
-                 print("   ⚠️  Database notification method missing")
-            except Exception as e:
-                 print(f"   ⚠️  Notification failed: {e}")
-
         return lead_id, products
 
     def scrape_cpp_portal(self, source):
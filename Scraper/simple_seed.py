@@ -122,6 +122,7 @@ for i in range(100):
              (company_id, signal_text, signal_type, source,
               f"https://example.com/{i}", products_json, 
               round(confidence, 2), timestamp, status))
+    c.execute('INSERT INTO lead_products (lead_id, product_code) VALUES (?, ?)', (c.lastrowid, product))
     created += 1
     
     if created % 25 == 0:
@@ -4,6 +4,8 @@ Extracts company names from news articles and tender documents
 """
 
 import re
+from backend.app.services.gazetteer import EntityGazetteer
+from backend.app.services.signal_matcher import signals
 
 
 class CompanyExtractor:
@@ -32,31 +34,59 @@ class CompanyExtractor:
         'Gillette', 'Quant', 'ICRA'
     ]
     
+    # Industry keywords, checked in order
+    INDUSTRY_KEYWORDS = {
+        'Oil & Gas': ['oil', 'gas', 'petroleum', 'refinery', 'fuel', 'diesel', 'petrol', 'lng', 'lpg'],
+        'Chemicals': ['chemical', 'petrochemical', 'pharma', 'pharmaceutical', 'drug'],
+        'Manufacturing': ['manufacturing', 'factory', 'plant', 'production'],
+        'Technology': ['software', 'tech', 'technology', 'IT', 'digital', 'ai', 'automation'],
+        'FMCG': ['fmcg', 'consumer goods', 'packaged'],
+        'Finance': ['bank', 'finance', 'investment', 'fund', 'mutual fund'],
+        'Infrastructure': ['infrastructure', 'construction', 'highway', 'road'],
+        'Textiles': ['textile', 'fabric', 'garment', 'apparel'],
+        'Agriculture': ['agriculture', 'agri', 'farming', 'crop']
+    }
+    
+    # Longest text the regex patterns look at; names appear early in titles/summaries
+    MAX_TEXT_LENGTH = 20000
+    
+    _gazetteer = None
+    
+    @classmethod
+    def gazetteer(cls):
+        """PSU and major-company names compiled into one automaton"""
+        if cls._gazetteer is None:
+            cls._gazetteer = EntityGazetteer(
+                {'alias': name, 'company_id': None, 'canonical_name': name}
+                for name in cls.PSU_KEYWORDS + cls.MAJOR_COMPANIES
+            )
+        return cls._gazetteer
+    
     @classmethod
     def extract_companies(cls, text):
         """Extract company names from text"""
+        if not text:
+            return []
+        text = text[:cls.MAX_TEXT_LENGTH]
         companies = []
         
-        # Check for PSUs first
-        for psu in cls.PSU_KEYWORDS:
-            if psu.lower() in text.lower():
-                companies.append(psu)
+        # Known PSUs and major companies, found in one pass (PSUs first)
+        mentions = cls.gazetteer().find(text)
+        for mention in mentions:
+            if mention['canonical_name'] not in _MAJOR_NAMES:
+                companies.append(mention['canonical_name'])
         
-        # Check for major companies
-        for company in cls.MAJOR_COMPANIES:
-            if company.lower() in text.lower():
-                # Try to get full name with suffix
-                pattern = rf'\b({re.escape(company)})\s+({"|".join(cls.COMPANY_SUFFIXES)})\b'
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    companies.append(match.group(0))
-                else:
-                    companies.append(company)
+        majors = [m['canonical_name'] for m in mentions if m['canonical_name'] in _MAJOR_NAMES]
+        if majors:
+            # Full name with suffix ("Reliance Industries"), first occurrence per company
+            full_names = {}
+            for match in _MAJOR_WITH_SUFFIX.finditer(text):
+                full_names.setdefault(match.group(1).lower(), match.group(0))
+            for company in majors:
+                companies.append(full_names.get(company.lower(), company))
         
         # Pattern for "Company Name Ltd/Limited/etc"
-        suffix_pattern = r'\b([A-Z][A-Za-z&\s]+(?:' + '|'.join(cls.COMPANY_SUFFIXES) + r'))\b'
-        matches = re.findall(suffix_pattern, text)
-        for match in matches:
+        for match in _SUFFIX_NAME.findall(text):
             # Filter out very short or very long names
             if 3 < len(match.split()) < 6 and len(match) < 50:
                 companies.append(match.strip())
@@ -81,13 +111,9 @@ class CompanyExtractor:
         if not companies:
             # Try to extract from common patterns
             # "Company announces", "Company reported", etc.
-            patterns = [
-                r'([A-Z][A-Za-z\s&]+?)\s+(?:announces|reported|launched|signed|awarded)',
-                r'(?:by|from)\s+([A-Z][A-Za-z\s&]+?)\s+(?:Ltd|Limited|Corporation)',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, text)
+            text = (text or '')[:cls.MAX_TEXT_LENGTH]
+            for pattern in _PRIMARY_PATTERNS:
+                match = pattern.search(text)
                 if match:
                     return match.group(1).strip()
             
@@ -96,25 +122,66 @@ class CompanyExtractor:
         return companies[0]
     
     @classmethod
-    def get_industry_from_text(cls, text):
-        """Determine industry from text content"""
-        text_lower = text.lower()
+    def extract_from_headline(cls, title, summary=''):
+        """Company named in a news title/summary, or 'Unknown Company'"""
+        text = f"{title} {summary}"[:cls.MAX_TEXT_LENGTH]
         
-        # Industry keywords
-        industries = {
-            'Oil & Gas': ['oil', 'gas', 'petroleum', 'refinery', 'fuel', 'diesel', 'petrol', 'lng', 'lpg'],
-            'Chemicals': ['chemical', 'pharma', 'pharmaceutical', 'drug'],
-            'Manufacturing': ['manufacturing', 'factory', 'plant', 'production'],
-            'Technology': ['software', 'tech', 'IT', 'digital', 'ai', 'automation'],
-            'FMCG': ['fmcg', 'consumer goods', 'packaged'],
-            'Finance': ['bank', 'finance', 'investment', 'fund', 'mutual fund'],
-            'Infrastructure': ['infrastructure', 'construction', 'highway', 'road'],
-            'Textiles': ['textile', 'fabric', 'garment', 'apparel'],
-            'Agriculture': ['agriculture', 'agri', 'farming', 'crop']
-        }
+        for pattern in _HEADLINE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return ' '.join(match.group(1).split())
         
-        for industry, keywords in industries.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return industry
+        return "Unknown Company"
+    
+    @classmethod
+    def extract_many(cls, texts, primary=False):
+        """
+        Extract from a batch of texts; identical texts are processed once.
+        Returns one result per text: a list of companies, or the primary
+        company (or None) when primary=True.
+        """
+        extract = cls.extract_primary_company if primary else cls.extract_companies
+        done = {}
+        results = []
+        for text in texts:
+            if text not in done:
+                done[text] = extract(text)
+            results.append(done[text])
+        return results
+    
+    @classmethod
+    def get_industry_from_text(cls, text):
+        """Determine industry from text content"""
+        industry = signals.first(text, [f'industry:{name}' for name in cls.INDUSTRY_KEYWORDS])
+        if industry:
+            return industry.split(':', 1)[1]
         
         return 'General Business'
+
+
+signals.register_many({f'industry:{name}': keywords for name, keywords in CompanyExtractor.INDUSTRY_KEYWORDS.items()})
+
+
+# Patterns compiled once at import. Every repeat that can backtrack is
+# bounded, so a long run of capitals or one very long word costs linear time.
+_SUFFIXES = '|'.join(CompanyExtractor.COMPANY_SUFFIXES)
+_MAJOR_NAMES = frozenset(CompanyExtractor.MAJOR_COMPANIES)
+
+_MAJOR_WITH_SUFFIX = re.compile(
+    rf'\b({"|".join(re.escape(name) for name in CompanyExtractor.MAJOR_COMPANIES)})\s+({_SUFFIXES})\b',
+    re.IGNORECASE
+)
+
+# Matches longer than 50 characters are discarded anyway
+_SUFFIX_NAME = re.compile(rf'\b([A-Z][A-Za-z&\s]{{0,48}}(?:{_SUFFIXES}))\b')
+
+_PRIMARY_PATTERNS = [
+    re.compile(r'\b([A-Z][A-Za-z\s&]{0,80}?)\s+(?:announces|reported|launched|signed|awarded)'),
+    re.compile(r'(?:by|from)\s+([A-Z][A-Za-z\s&]{0,80}?)\s+(?:Ltd|Limited|Corporation)'),
+]
+
+_HEADLINE_PATTERNS = [
+    re.compile(r'\b([A-Z][a-zA-Z\s&]{0,80}(?:Ltd|Limited|Corporation|Corp|Inc|Industries|Chemicals|Petroleum|Energy|Power|Textiles))'),
+    re.compile(r'([A-Z][a-zA-Z]{1,40}\s+[A-Z][a-zA-Z]{1,40})\s+(?:announced|plans|to|expansion|commissioning)'),
+    re.compile(r'(Tata|Reliance|Adani|Birla|Vedanta|JSW|Essar|Ambuja|UltraTech)\s+[A-Z][a-zA-Z]+'),
+]
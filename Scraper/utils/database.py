@@ -6,20 +6,32 @@ import sqlite3
 from datetime import datetime
 import json
 
+from .db_pool import ConnectionPool
+
 class Database:
     def __init__(self, db_path='hp_pulse.db'):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, configure=self.configure_connection)
         self.init_db()
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get a pooled database connection; close() returns it to the pool"""
+        return self.pool.acquire()
+    
+    def configure_connection(self, conn):
+        """Set up a newly opened connection (SQL functions etc.)"""
     
     def init_db(self):
         """Initialize database schema"""
         conn = self.get_connection()
-        c = conn.cursor()
-        
+        self.create_schema(conn.cursor())
+        conn.commit()
+        conn.close()
+        print("✅ Database initialized")
+    
+    @staticmethod
+    def create_schema(c):
+        """Create the base tables and indexes if missing"""
         # Companies table
         c.execute('''CREATE TABLE IF NOT EXISTS companies
                      (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -67,34 +79,36 @@ class Database:
         c.execute('CREATE INDEX IF NOT EXISTS idx_leads_scraped_at ON leads(scraped_at)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_leads_company_id ON leads(company_id)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_companies_normalized ON companies(normalized_name)')
-        
-        conn.commit()
-        conn.close()
-        print("✅ Database initialized")
     
-    def insert_company(self, name, industry=None, location=None, website=None):
+    def insert_company(self, name, industry=None, location=None, website=None, normalized_name=None):
         """Insert or get company"""
         conn = self.get_connection()
-        c = conn.cursor()
-        
-        normalized = name.lower().strip()
-        
-        # Check if exists
-        c.execute("SELECT id FROM companies WHERE normalized_name = ?", (normalized,))
-        existing = c.fetchone()
-        
-        if existing:
-            company_id = existing[0]
-        else:
-            c.execute('''INSERT INTO companies 
-                         (name, normalized_name, industry, location, website, created_at)
-                         VALUES (?, ?, ?, ?, ?, ?)''',
-                      (name, normalized, industry, location, website, 
-                       datetime.now().isoformat()))
-            company_id = c.lastrowid
-        
-        conn.commit()
-        conn.close()
+        try:
+            c = conn.cursor()
+            
+            normalized = normalized_name or name.lower().strip()
+            
+            # Check if exists
+            c.execute("SELECT id FROM companies WHERE normalized_name = ?", (normalized,))
+            existing = c.fetchone()
+            
+            if existing:
+                company_id = existing[0]
+            else:
+                # Names are unique: the name may be stored under another normalized form
+                c.execute('''INSERT OR IGNORE INTO companies 
+                             (name, normalized_name, industry, location, website, created_at)
+                             VALUES (?, ?, ?, ?, ?, ?)''',
+                          (name, normalized, industry, location, website, 
+                           datetime.now().isoformat()))
+                if c.rowcount:
+                    company_id = c.lastrowid
+                else:
+                    company_id = c.execute("SELECT id FROM companies WHERE name = ?", (name,)).fetchone()[0]
+            
+            conn.commit()
+        finally:
+            conn.close()
         return company_id
     
     def insert_lead(self, company_id, signal_text, signal_type, source_name, 
@@ -0,0 +1,167 @@
+"""
+Tender field parser
+Turns tender listings and notices into typed fields: reference number,
+organisation, value in INR and ISO dates
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class TenderParser:
+    """Parse tender fields once, at ingest, into normalized values"""
+
+    FIELDS = ('reference', 'organization', 'value_inr', 'closing_at', 'opening_at', 'published_at')
+
+    # "Label: value" lines, as written by the tender scrapers and most portals
+    LABELS = {
+        'reference': ['tender reference', 'reference no', 'reference number', 'ref no', 'tender id', 'tender no',
+                      'reference'],
+        'organization': ['organization', 'organisation', 'department', 'buyer'],
+        'value': ['tender value', 'estimated value', 'estimated cost', 'value of work', 'contract value', 'value'],
+        'closing': ['bid submission end date', 'bid end date', 'closing date', 'last date', 'due date', 'deadline'],
+        'opening': ['bid opening date', 'technical bid opening', 'opening date'],
+        'published': ['e-published date', 'published date', 'publish date', 'published'],
+    }
+
+    UNITS = {
+        'crore': 1e7, 'crores': 1e7, 'cr': 1e7,
+        'lakh': 1e5, 'lakhs': 1e5, 'lac': 1e5, 'lacs': 1e5,
+        'million': 1e6, 'mn': 1e6, 'billion': 1e9, 'bn': 1e9,
+        'thousand': 1e3,
+    }
+
+    # Listing placeholders that mean "no value"
+    MISSING = {'', 'n/a', 'na', '-', 'nil', 'to be disclosed', 'not disclosed', 'tbd'}
+
+    DATE_FORMATS = ['%d-%b-%Y', '%d-%B-%Y', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d',
+                    '%d %b %Y', '%d %B %Y', '%b %d %Y', '%B %d %Y']
+    TIME_FORMATS = ['%I:%M %p', '%I:%M%p', '%H:%M:%S', '%H:%M']
+
+    _LABEL_RE = re.compile(
+        r'^\s*(' + '|'.join(re.escape(label) for labels in LABELS.values() for label in labels) + r')\s*[:\-]\s*(.+?)\s*$',
+        re.IGNORECASE | re.MULTILINE
+    )
+    _LABEL_FIELD = {label: field for field, labels in LABELS.items() for label in labels}
+
+    _AMOUNT_RE = re.compile(
+        r'(?P<currency>rs\.?|inr|₹)?\s{0,3}(?P<number>\d[\d,]{0,20}(?:\.\d{1,4})?)\s{0,3}'
+        r'(?P<unit>crores?|cr\b\.?|lakhs?|lacs?|million|mn\b|billion|bn\b|thousand)?',
+        re.IGNORECASE
+    )
+    _DEPOSIT_RE = re.compile(r'(?:emd|earnest money|tender fee|document fee|bid security)\W{0,5}$', re.IGNORECASE)
+    _DATE_RE = re.compile(
+        r'\b(\d{1,2}[-/.](?:\d{1,2}|[A-Za-z]{3,9})[-/.]\d{4}|\d{4}-\d{2}-\d{2}|\d{1,2}\s+[A-Za-z]{3,9},?\s+\d{4}'
+        r'|[A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})'
+        r'(?:[\sT,]{1,3}(\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?))?'
+    )
+    _CLOSING_RE = re.compile(r'\b(?:deadline|due date|closing|last date|bid submission)', re.IGNORECASE)
+    _ORGANIZATION_RES = [
+        re.compile(r'(?:by|from)\s+([A-Z][A-Za-z&]*(?:[ \t]+[A-Za-z&]+){0,8}?[ \t]+(?:Ltd|Limited|Corporation|Department|Ministry))\b'),
+        re.compile(r'\b([A-Z][A-Za-z]*(?:[ \t]+[A-Za-z]+){0,6}?[ \t]+(?:Department|Ministry|Corporation))\b'),
+    ]
+
+    @classmethod
+    def _missing(cls, value: Optional[str]) -> bool:
+        return value is None or value.strip().lower() in cls.MISSING
+
+    @classmethod
+    def parse_amount(cls, text: str, require_marker: bool = True) -> Optional[float]:
+        """
+        First amount in INR: "Rs. 2.5 Cr" -> 25000000.0, "₹ 45,00,000" -> 4500000.0.
+        With require_marker, bare numbers (years, quantities) are skipped:
+        an amount needs a currency symbol or a lakh/crore unit.
+        EMD / tender fee amounts are never taken as the tender value.
+        """
+        if cls._missing(text):
+            return None
+        for match in cls._AMOUNT_RE.finditer(text):
+            currency, unit = match.group('currency'), match.group('unit')
+            if require_marker and not (currency or unit):
+                continue
+            if cls._DEPOSIT_RE.search(text, max(0, match.start() - 20), match.start()):
+                continue
+            try:
+                amount = float(match.group('number').replace(',', ''))
+            except ValueError:
+                continue
+            if unit:
+                amount *= cls.UNITS[unit.lower().rstrip('.')]
+            return amount
+        return None
+
+    @classmethod
+    def parse_date(cls, text: str) -> Optional[str]:
+        """
+        First date in the text as ISO 8601: "26-Feb-2026 03:00 PM" ->
+        "2026-02-26T15:00:00", "26/02/2026" -> "2026-02-26" (day first, as on
+        Indian portals)
+        """
+        if cls._missing(text):
+            return None
+        for match in cls._DATE_RE.finditer(text):
+            date_text = re.sub(r',', '', match.group(1))
+            date_text = re.sub(r'\s+', ' ', date_text)
+            for fmt in cls.DATE_FORMATS:
+                try:
+                    date = datetime.strptime(date_text, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                continue
+
+            time_text = match.group(2)
+            if not time_text:
+                return date.date().isoformat()
+            for fmt in cls.TIME_FORMATS:
+                try:
+                    time = datetime.strptime(time_text.upper().replace('  ', ' '), fmt).time()
+                    return datetime.combine(date.date(), time).isoformat()
+                except ValueError:
+                    continue
+            return date.date().isoformat()
+        return None
+
+    @classmethod
+    def normalize(cls, reference: str = None, organization: str = None, value: str = None,
+                  closing: str = None, opening: str = None, published: str = None) -> Dict[str, Optional[object]]:
+        """Typed fields from raw listing cells (any may be missing or 'N/A')"""
+        return {
+            'reference': None if cls._missing(reference) else reference.strip()[:200],
+            'organization': None if cls._missing(organization) else organization.strip()[:200],
+            'value_inr': cls.parse_amount(value, require_marker=False) if value else None,
+            'closing_at': cls.parse_date(closing) if closing else None,
+            'opening_at': cls.parse_date(opening) if opening else None,
+            'published_at': cls.parse_date(published) if published else None,
+        }
+
+    @classmethod
+    def parse(cls, text: str) -> Dict[str, Optional[object]]:
+        """
+        Typed fields from a tender notice. Labelled lines ("Closing Date: ...")
+        win; otherwise the first currency amount and the date after a
+        deadline cue are used.
+        """
+        raw = {}
+        for match in cls._LABEL_RE.finditer(text or ''):
+            field = cls._LABEL_FIELD[match.group(1).lower()]
+            raw.setdefault(field, match.group(2))
+        fields = cls.normalize(**raw)
+
+        if not text:
+            return fields
+        if fields['value_inr'] is None:
+            fields['value_inr'] = cls.parse_amount(text)
+        if fields['closing_at'] is None:
+            cue = cls._CLOSING_RE.search(text)
+            if cue:
+                fields['closing_at'] = cls.parse_date(text[cue.end():cue.end() + 60])
+        if fields['organization'] is None:
+            for pattern in cls._ORGANIZATION_RES:
+                match = pattern.search(text[:2000])
+                if match:
+                    fields['organization'] = match.group(1).strip()
+                    break
+        return fields